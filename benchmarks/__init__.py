@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 15:54:21
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 15:54:21
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Benchmarks of the analysis, on synthetic datas
+"""
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 16:10:42
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 16:10:42
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Benchmark script
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from tempfile import TemporaryDirectory
+
+from rich.logging import RichHandler
+
+from .bench import compare
+from .bench import environment
+from .bench import run
+from .bench import TESTS
+
+parser = argparse.ArgumentParser(
+                    prog='python -m benchmarks',
+                    description='Time each stage of the analysis on synthetic datas',
+                    epilog='')
+
+parser.add_argument('--log', default=["warning"], nargs=1, required=False, type=str,
+                    choices=['debug', 'info', 'warning', 'error', 'critical'])
+parser.add_argument('--scales', default=[1, 10, 100], nargs='+', required=False, type=int,
+                    help='the scales, the number of runs per country')
+parser.add_argument('--websites', default=[50], nargs=1, required=False, type=int)
+parser.add_argument('--attempts', default=[1], nargs=1, required=False, type=int,
+                    help='the number of attempts per website')
+parser.add_argument('--tests', default=[10], nargs=1, required=False, type=int,
+                    help='the number of speed and bulk tests')
+parser.add_argument('--test-types', default=TESTS, nargs='+', required=False, type=str,
+                    choices=TESTS)
+parser.add_argument('--jobs', default=[1], nargs=1, required=False, type=int,
+                    help='number of process rendering the plots')
+parser.add_argument('--no-plot', action='store_true', help='do not time the plots')
+parser.add_argument('--folder', default=None, nargs=1, required=False, type=str,
+                    help='keep the datas, the databases and the plots in this folder')
+parser.add_argument('--output', default=["benchmark.json"], nargs=1, required=False, type=str)
+parser.add_argument('--compare', default=None, nargs=1, required=False, type=str,
+                    help='a previous output, exit with 1 if a stage became slower')
+parser.add_argument('--tolerance', default=[.2], nargs=1, required=False, type=float,
+                    help='the relative slowdown tolerated by the comparison')
+
+args = parser.parse_args()
+
+logging.basicConfig(format='%(message)s', level=getattr(logging, args.log[0].upper()),
+                    handlers=[RichHandler()])
+
+benchmark = {"environment": environment(),
+             "parameters": {"websites": args.websites[0], "attempts": args.attempts[0],
+                            "tests": args.tests[0], "jobs": args.jobs[0]},
+             "scales": {}}
+
+with TemporaryDirectory() as tmp:
+    folder = args.folder[0] if args.folder else tmp
+    for scale in args.scales:
+        benchmark["scales"][str(scale)] = run(os.path.join(folder, f"scale_{scale}"), scale,
+                                              args.websites[0], args.attempts[0],
+                                              args.tests[0], args.test_types, args.jobs[0],
+                                              not args.no_plot)
+        # Written after each scale, the biggest ones can take a while
+        with open(args.output[0], "w", encoding="utf-8") as file:
+            json.dump(benchmark, file, indent=2)
+
+if args.compare:
+    with open(args.compare[0], "r", encoding="utf-8") as file:
+        if compare(json.load(file), benchmark, args.tolerance[0]):
+            sys.exit(1)
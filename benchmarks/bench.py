@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 16:03:17
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 16:03:17
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Module timing each stage of the analysis on synthetic datas
+"""
+import os
+import platform
+import subprocess
+from io import StringIO
+from logging import info
+from logging import warning
+from time import perf_counter
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from src.config import CONFIG
+from src.datas import render_plots
+from src.results import DEPENDINGS
+from src.results import Results
+
+from .generate import generate
+
+
+TESTS = ["t-test", "mood", "all"]
+
+
+# pylint: disable=R0913,R0914
+def run(folder: str, scale: int = 1, websites: int = 50, attempts: int = 1, tests: int = 10,
+        test_types: Optional[List[str]] = None, jobs: int = 1, plot: bool = True
+       ) -> Dict[str, Any]:
+    """
+    Generate the datas of a scale in the folder, then time each stage on them.
+    Every stage works on the output of the previous one, so they are timed separately.
+
+    :param      folder:      The folder, the datas, the database and the plots are created in it
+    :type       folder:      str
+    :param      scale:       The scale, the number of runs per country
+    :type       scale:       int
+    :param      websites:    The number of websites
+    :type       websites:    int
+    :param      attempts:    The number of attempts per website
+    :type       attempts:    int
+    :param      tests:       The number of speed and bulk tests
+    :type       tests:       int
+    :param      test_types:  The types of statistical test, all of them if None
+    :type       test_types:  str list
+    :param      jobs:        The number of process rendering the plots
+    :type       jobs:        int
+    :param      plot:        If we time the plots
+    :type       plot:        bool
+
+    :returns:   The size of the datas and the timings in seconds
+    :rtype:     dict
+    """
+    if test_types is None:
+        test_types = TESTS
+    # The stages are run from the folder, for the plots
+    CONFIG.locate(os.path.abspath(CONFIG.path()))
+    os.makedirs(folder, exist_ok=True)
+    cwd = os.getcwd()
+    os.chdir(folder)
+    try:
+        info(f"Generating the datas at scale {scale}")
+        start = perf_counter()
+        files, size = generate("datas", runs=scale, websites=websites, attempts=attempts,
+                               tests=tests)
+        res: Dict[str, Any] = {"files": files, "size": size,
+                               "generate": perf_counter() - start}
+        timings: Dict[str, float] = {}
+        details: Dict[str, float] = {}
+
+        if os.path.exists("bench.db"):
+            os.remove("bench.db")
+        info("Ingesting")
+        start = perf_counter()
+        results = Results(folder="datas", database="bench")
+        timings["ingest"] = perf_counter() - start
+
+        info("Getting the metrics")
+        datas = {}
+        for name, depending in DEPENDINGS.items():
+            for metric in CONFIG["metrics"]:
+                start = perf_counter()
+                datas[(name, metric)] = results.get_metric(metric, depending)
+                details[f"get_metric: {metric} depending on {name}"] = perf_counter() - start
+        timings["get_metric"] = sum(details.values())
+
+        analysed = {}
+        for test_type in test_types:
+            info(f"Analysing with {test_type}")
+            start = perf_counter()
+            for key, (data, _) in datas.items():
+                analysed[key] = data.analyse(test_type)
+            timings[f"analyse: {test_type}"] = perf_counter() - start
+
+        if plot:
+            info("Plotting")
+            start = perf_counter()
+            render_plots((job for (name, metric), (data, conditions) in datas.items()
+                          for job in data.plot_jobs(metric, DEPENDINGS[name], conditions,
+                                                    force=True)),
+                         jobs)
+            timings["plot"] = perf_counter() - start
+
+        info("Rendering the LaTeX tables")
+        start = perf_counter()
+        for data in analysed.values():
+            data.to_latex(StringIO())
+        timings["latex"] = perf_counter() - start
+
+        res["timings"] = timings
+        res["details"] = details
+        return res
+    finally:
+        os.chdir(cwd)
+
+
+def environment() -> Dict[str, str]:
+    """
+    Get the description of the environment of the benchmark
+
+    :returns:   The version of python, the platform and the commit
+    :rtype:     dict str * str
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {"python": platform.python_version(),
+            "platform": platform.platform(),
+            "commit": commit}
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], tolerance: float = .2) -> List[str]:
+    """
+    Compare the timings of two benchmarks
+
+    :param      old:        The old benchmark
+    :type       old:        dict
+    :param      new:        The new benchmark
+    :type       new:        dict
+    :param      tolerance:  The relative slowdown tolerated
+    :type       tolerance:  float
+
+    :returns:   The regressions
+    :rtype:     str list
+    """
+    regressions = []
+    for scale, res in new["scales"].items():
+        if scale not in old["scales"]:
+            continue
+        for stage, time in res["timings"].items():
+            before = old["scales"][scale]["timings"].get(stage)
+            if before and time > before * (1 + tolerance):
+                regressions.append(f"{stage} at scale {scale}: {before:.3f}s -> {time:.3f}s "
+                                   + f"({time / before - 1:+.0%})")
+    for regression in regressions:
+        warning(f"Regression of {regression}")
+    return regressions
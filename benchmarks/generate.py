@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 15:55:04
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 15:55:04
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Module generating synthetic experiments, in the format of the real ones
+"""
+import os
+import time
+from random import Random
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import yaml
+
+
+BANDWIDTHS = [1000, 2000, 5000, 10000, 20000, 50000, 100000]
+RTTS = [0, 10, 20, 50, 100, 200, 500]
+LOSSES = [0, 1, 2, 5]
+BASE = (100000, 100000, 0, 0)
+# technology, quality -> Mbps, RTT (ms), loss (%)
+NETWORKS: Dict[Tuple[str, str], Tuple[float, int, float]] = {
+    ("3g", "bad"): (1, 300, 2),
+    ("3g", "medium"): (4, 150, 1),
+    ("3g", "good"): (8, 80, 0),
+    ("4g", "bad"): (10, 100, 1),
+    ("4g", "medium"): (30, 50, 0),
+    ("4g", "good"): (80, 30, 0),
+    ("geosat", "universal"): (20, 600, 1),
+    ("leosat", "universal"): (100, 40, 0)}
+COUNTRIES = ["it", "de", "fr"]
+# The overhead of each proxy
+PROXIES = {"_native": 1., "_squid": 1.1, "_masquerade": 1.25}
+TAG = "tag:yaml.org,2002:python/object:"
+# Thu Jul 27 14:00:00 2023
+START = 1690466400
+
+
+class _Object:
+    """
+    This class describes a python object as dumped by yaml.
+    """
+    __slots__ = ("tag", "mapping")
+
+    def __init__(self, tag: str, mapping: Dict[str, Any]):
+        self.tag = tag
+        self.mapping = mapping
+
+
+# pylint: disable=R0901     # Too many ancestors
+class Dumper(getattr(yaml, "CSafeDumper", yaml.SafeDumper)):
+    """
+    This class describes a dumper writing the objects with their python tag.
+    """
+
+
+Dumper.add_representer(_Object, lambda dumper, obj: dumper.represent_mapping(TAG + obj.tag,
+                                                                             obj.mapping))
+
+
+def conditions(networks: bool = True) -> List[str]:
+    """
+    Get the conditions of a run, as in the name of the files
+
+    :param      networks:  If we also emulate the networks
+    :type       networks:  bool
+
+    :returns:   The conditions
+    :rtype:     str list
+    """
+    res = [" ".join(str(value) for value in BASE)]
+    res += [f"{bandwidth} {bandwidth} 0 0" for bandwidth in BANDWIDTHS if bandwidth != BASE[0]]
+    res += [f"{BASE[0]} {BASE[1]} {rtt} 0" for rtt in RTTS if rtt != 0]
+    res += [f"{BASE[0]} {BASE[1]} 0 {loss}" for loss in LOSSES if loss != 0]
+    if networks:
+        res += [f"{technology} {quality} universal universal"
+                for technology, quality in NETWORKS]
+    return res
+
+
+def _network(condition: str) -> Tuple[float, int, float]:
+    data = condition.split(" ")
+    try:
+        return int(data[1]) / 1000, int(data[2]), int(data[3])
+    except ValueError:
+        return NETWORKS[(data[0], data[1])]
+
+
+# pylint: disable=R0913,R0914
+def experiment(condition: str, random: Random, websites: int = 50, attempts: int = 1,
+               tests: int = 10, failure: float = .05) -> Dict[str, _Object]:
+    """
+    Generate the results of an experiment
+
+    :param      condition:  The condition
+    :type       condition:  str
+    :param      random:     The random generator
+    :type       random:     Random
+    :param      websites:   The number of websites
+    :type       websites:   int
+    :param      attempts:   The number of attempts per website
+    :type       attempts:   int
+    :param      tests:      The number of speed and bulk tests
+    :type       tests:      int
+    :param      failure:    The probability of a test to fail
+    :type       failure:    float
+
+    :returns:   The experiment, as dumped in the yaml files
+    :rtype:     dict str * _Object
+    """
+    mbps, rtt, loss = _network(condition)
+    browsertime = {}
+    bulk = {}
+    speed = {}
+    for proxy, overhead in PROXIES.items():
+        reports = {}
+        for website in range(websites):
+            if random.random() < failure:
+                page_load_time, speed_index = [], []
+            else:
+                size = 1 + website % 7
+                page_load_time = [int(overhead * (size * 8000 / mbps + 10 * rtt + 50 * loss)
+                                      * random.lognormvariate(0, .3) + 200)
+                                  for _ in range(attempts)]
+                speed_index = [int(value * random.uniform(.5, 1.1)) for value in page_load_time]
+            reports[f"www.website{website:03d}.com"] = _Object(
+                "browsertime.Report",
+                {"_page_load_time": page_load_time, "_speed_index": speed_index})
+        browsertime[proxy] = reports
+        bulk[proxy] = [0 if random.random() < failure
+                       else int(mbps * 1e6 / overhead * random.uniform(.8, 1) / (1 + loss / 10))
+                       for _ in range(tests)]
+        speed[proxy] = [{"city": "",
+                         "download_mbps": f"{mbps / overhead * random.uniform(.8, 1):.2f}",
+                         "organization": "",
+                         "ping_ms": str(int(rtt * overhead + random.uniform(5, 50))),
+                         "server_ip": "",
+                         "sponsor": "",
+                         "upload_mbps": f"{mbps / overhead * random.uniform(.8, 1):.2f}"}
+                        for _ in range(tests) if random.random() >= failure]
+    return {"browsertime": _Object("browsertime.BrowserTime", browsertime),
+            "bulkTest": _Object("bulktest.BulkTest", bulk),
+            "speedtest": _Object("speedtest.SpeedTest", speed)}
+
+
+# pylint: disable=R0913
+def generate(folder: str, countries: Iterable[str] = tuple(COUNTRIES), runs: int = 1,
+             experiment_conditions: Optional[List[str]] = None, websites: int = 50,
+             attempts: int = 1, tests: int = 10, seed: int = 0) -> Tuple[int, int]:
+    """
+    Generate a folder of datas, datas/<country>/<run>/<condition> <date>.yml
+
+    :param      folder:                 The folder
+    :type       folder:                 str
+    :param      countries:              The countries
+    :type       countries:              str iterable
+    :param      runs:                   The number of runs per country
+    :type       runs:                   int
+    :param      experiment_conditions:  The conditions of each run, all of them if None
+    :type       experiment_conditions:  str list
+    :param      websites:               The number of websites
+    :type       websites:               int
+    :param      attempts:               The number of attempts per website
+    :type       attempts:               int
+    :param      tests:                  The number of speed and bulk tests
+    :type       tests:                  int
+    :param      seed:                   The seed
+    :type       seed:                   int
+
+    :returns:   The number of files and their total size
+    :rtype:     int * int
+    """
+    if experiment_conditions is None:
+        experiment_conditions = conditions()
+    random = Random(seed)
+    files = 0
+    size = 0
+    date = START
+    for country in countries:
+        for run in range(1, runs + 1):
+            path = os.path.join(folder, country, str(run))
+            os.makedirs(path, exist_ok=True)
+            for condition in experiment_conditions:
+                date += 1200
+                name = os.path.join(path, f"{condition} {time.asctime(time.gmtime(date))}.yml")
+                with open(name, "w", encoding="utf-8") as file:
+                    yaml.dump(experiment(condition, random, websites, attempts, tests), file,
+                              Dumper=Dumper, default_flow_style=False)
+                files += 1
+                size += os.path.getsize(name)
+    return files, size
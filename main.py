@@ -20,22 +20,127 @@
 Main script
 """
 import argparse
+import atexit
 import logging
+import sys
 
 from rich.logging import RichHandler
 
+from src import profiling
 from src import Results
+from src.binary import convert
+from src.config import CONFIG
+from src.query_log import DEFAULT_THRESHOLD
+from src.results import DEPENDINGS
+from src.storage import STORAGES
 
 parser = argparse.ArgumentParser(
                     prog='Results compilation',
                     description='Compile the results',
-                    epilog='')
+                    epilog='Without any command, the full report is made')
 
 parser.add_argument('--log', default=["warning"], nargs=1, required=False, type=str,
                     choices=['debug', 'info', 'warning', 'error', 'critical'])
 parser.add_argument('--logfile', default=None, nargs=1, required=False, type=int)
+parser.add_argument('--sketch', default=None, nargs=1, required=False, type=int,
+                    help='use approximate quantile sketches of the given accuracy')
+parser.add_argument('--low-memory', action='store_true',
+                    help='stream the values from the database into compact arrays')
+parser.add_argument('--memory-budget', default=None, nargs=1, required=False, type=int,
+                    metavar='MB', help='the memory the analysis should hold in, the values '
+                                       + 'of a metric that would go over it are streamed '
+                                       + 'as with --low-memory')
+parser.add_argument('--db', default=["tmp"], nargs=1, required=False, type=str,
+                    help='the database')
+parser.add_argument('--packed', action='store_true',
+                    help='store the values of an experiment, a proxy and a website in one row, '
+                         + 'as packed arrays, only for a new database')
+parser.add_argument('--in-memory', action='store_true',
+                    help='load the database in memory and write it back at the end, '
+                         + 'instead of writing it at each experiment')
+parser.add_argument('--checkpoint', default=None, nargs=1, required=False, type=int,
+                    metavar='N', help='with --in-memory, also write the database '
+                                      + 'every N experiments')
+parser.add_argument('--storage', default=None, nargs=1, required=False, type=str,
+                    choices=list(STORAGES), help='where the results are stored, by default '
+                                                 + 'the storage of the configuration, else sqlite')
+parser.add_argument('--from-export', default=None, nargs=1, required=False, type=str,
+                    metavar='FOLDER', help='read the results from an export instead of the '
+                                           + 'database, nothing is ingested')
+parser.add_argument('--data', default=["datas"], nargs=1, required=False, type=str,
+                    help='the folder where the datas are stored')
+parser.add_argument('--profile', default=None, nargs=1, required=False, type=str,
+                    help='time the stages and run cProfile, the results are written in '
+                         + 'PROFILE.json and PROFILE.pstats')
+parser.add_argument('--slow-query', default=None, nargs='?', const=DEFAULT_THRESHOLD,
+                    required=False, type=float, metavar='MS',
+                    help='log the queries slower than MS milliseconds (by default '
+                         + f'{DEFAULT_THRESHOLD}) with their query plan, '
+                         + 'and the queries taking the most time at exit')
+parser.add_argument('--config', default=None, nargs=1, required=False, type=str,
+                    help='the configuration file, by default $MASQUERADE_CONFIG or config.yml')
+
+filters = argparse.ArgumentParser(add_help=False)
+filters.add_argument('--metric', default=None, nargs='+', required=False, type=str,
+                     help='only these metrics')
+filters.add_argument('--depending', default=None, nargs='+', required=False, type=str,
+                     choices=list(DEPENDINGS), help='only these dependings')
+filters.add_argument('--country', default=None, nargs='+', required=False, type=str,
+                     help='only the experiments of these countries')
+filters.add_argument('--website', default=None, nargs='+', required=False, type=str,
+                     help='only the results of these websites')
+
+plotting = argparse.ArgumentParser(add_help=False)
+plotting.add_argument('--jobs', default=[1], nargs=1, required=False, type=int,
+                      help='number of process rendering the plots')
+plotting.add_argument('--force', action='store_true',
+                      help='render the plots even if they are up to date')
+
+analysing = argparse.ArgumentParser(add_help=False)
+analysing.add_argument('--test', default=["all"], nargs=1, required=False, type=str,
+                       choices=['all', 't-test', 'mood'])
+
+commands = parser.add_subparsers(dest='command')
+commands.add_parser('ingest', parents=[filters],
+                    help='add the new runs of the datas to the database')
+plot_parser = commands.add_parser('plot', parents=[filters, plotting],
+                                  help='plot the metrics, without ingesting the datas')
+plot_parser.add_argument('--country-dependent', action='store_true')
+plot_parser.add_argument('--website-dependent', action='store_true')
+plot_parser.add_argument('--full', action='store_true',
+                         help='every plot, country dependent or not')
+analyse_parser = commands.add_parser('analyse', parents=[filters, analysing],
+                                     help='analyse the metrics, without ingesting the datas')
+analyse_parser.add_argument('--country-dependent', action='store_true')
+analyse_parser.add_argument('--detailed', action='store_true',
+                            help='print the error instead of the arrow')
+analyse_parser.add_argument('--output', default=None, nargs=1, required=False, type=str,
+                            help='the file of the LaTeX tables, the standard output by default')
+report_parser = commands.add_parser('report', parents=[filters, plotting, analysing],
+                                    help='ingest the datas, plot and analyse everything')
+report_parser.add_argument('--output', default=["full_analyse.tex"], nargs=1,
+                           required=False, type=str, help='the file of the LaTeX tables')
+convert_parser = commands.add_parser('convert',
+                                     help='write the binary version of the yaml files of the '
+                                          + 'datas, ingested instead of them')
+convert_parser.add_argument('--remove', action='store_true',
+                            help='remove the yaml files once converted')
+export_parser = commands.add_parser('export',
+                                    help='write the values of the database in columnar files, '
+                                         + 'without ingesting the datas')
+export_parser.add_argument('--output', default=["export"], nargs=1, required=False, type=str,
+                           help='the folder of the export')
 
 args = parser.parse_args()
+if args.command is None:
+    # The default command, with its default options, the global ones are kept
+    args = report_parser.parse_args([], namespace=args)
+    args.command = 'report'
+if args.config:
+    CONFIG.locate(args.config[0])
+metrics = getattr(args, 'metric', None)
+for unknown in set(metrics or []) - (set(CONFIG['metrics']) if metrics else set()):
+    parser.error(f"Unknown metric: {unknown}, choose from {', '.join(CONFIG['metrics'])}")
 
 numeric_level = getattr(logging, args.log[0].upper(), None)
 if not isinstance(numeric_level, int):
@@ -50,20 +155,71 @@ if args.logfile:
 
 logging.basicConfig(**options)
 
-results = Results()
-
-results.plot()
-results.plot(country_dependent=True)
-# results.plot(full=True)
-
-
-with open("full_analyse.tex", "w", encoding='utf-8') as file:
-    for key, value in results.print_analyse().items():
-        file.write(key)
-        file.write(value)
-    for key, value in results.print_analyse(metrics=['plt', 'si'], detailed=True).items():
-        file.write(key)
-        file.write(value)
+if args.profile:
+    profiling.enable(profile=True)
+    atexit.register(profiling.dump, args.profile[0])
+
+if args.command == 'convert':
+    with profiling.span("convert"):
+        convert(args.data[0], remove=args.remove)
+    sys.exit()
+
+settings = {'sketch': args.sketch[0] if args.sketch else None,
+            'countries': getattr(args, 'country', None),
+            'websites': getattr(args, 'website', None),
+            'slow_query': args.slow_query, 'low_memory': args.low_memory,
+            'memory_budget': args.memory_budget[0] if args.memory_budget else None}
+if args.from_export:
+    if args.command in ['ingest', 'export']:
+        parser.error(f"Cannot {args.command} with --from-export")
+    results = Results.from_export(args.from_export[0], **settings)
+else:
+    results = Results(folder=args.data[0], database=args.db[0],
+                      ingest=args.command in ['ingest', 'report'], packed=args.packed,
+                      storage=args.storage[0] if args.storage else None,
+                      in_memory=args.in_memory,
+                      checkpoint=args.checkpoint[0] if args.checkpoint else None, **settings)
+if args.slow_query is not None:
+    atexit.register(results.report_queries, sys.stderr)
+
+match args.command:
+    case 'plot':
+        with profiling.span("plot"):
+            results.plot(full=args.full, country_dependent=args.country_dependent,
+                         website_dependent=args.website_dependent,
+                         jobs=args.jobs[0], force=args.force,
+                         metrics=args.metric, dependings=args.depending)
+    case 'analyse':
+        file = (open(args.output[0], "w", encoding='utf-8')  # pylint: disable=R1732
+                if args.output else sys.stdout)
+        try:
+            with profiling.span("analyse"):
+                results.write_analyse(file, country_dependent=args.country_dependent,
+                                      detailed=args.detailed, test_type=args.test[0],
+                                      metrics=args.metric, dependings=args.depending)
+        finally:
+            if file is not sys.stdout:
+                file.close()
+    case 'export':
+        with profiling.span("export"):
+            results.export(args.output[0])
+    case 'report':
+        with profiling.span("plot"):
+            results.plot(jobs=args.jobs[0], force=args.force,
+                         metrics=args.metric, dependings=args.depending)
+            results.plot(country_dependent=True, jobs=args.jobs[0], force=args.force,
+                         metrics=args.metric, dependings=args.depending)
+            # results.plot(full=True, jobs=args.jobs[0], force=args.force)
+
+        with profiling.span("analyse"), open(args.output[0], "w", encoding='utf-8') as file:
+            results.write_analyse(file, test_type=args.test[0],
+                                  metrics=args.metric, dependings=args.depending)
+            # The detailed tables are only for the PLT and the SI
+            detailed = [metric for metric in ['plt', 'si']
+                        if args.metric is None or metric in args.metric]
+            if detailed:
+                results.write_analyse(file, test_type=args.test[0], metrics=detailed,
+                                      dependings=args.depending, detailed=True)
 
 # with open("country_dep_analyse.tex", "w", encoding='utf-8') as file:
 #     for key, value in results.print_analyse(country_dependent=True).items():
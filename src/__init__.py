@@ -19,4 +19,16 @@
 """
 Modules for analysing results
 """
-from .results import Results
+from importlib import import_module
+
+
+# The submodules are only imported when needed, importing the package is then immediate
+_EXPORTS = {"Results": "results"}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 16:48:05
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 16:48:05
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Module for the binary format of the experiments
+
+An experiment is written as a header, the magic and the version,
+then each of its tests: its name, its type and the packed values of each proxy.
+Everything is little-endian, an array is its typecode, its length and its values.
+Only the measured values are kept, the details of the speed tests (city, server...) are dropped.
+"""
+import itertools
+import os
+import struct
+import sys
+from array import array
+from logging import debug
+from logging import info
+from logging import warning
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+import yaml
+
+from .loader import Loader
+from .types import BrowserTime
+from .types import BulkTest
+from .types import Report
+from .types import Result
+from .types import SpeedTest
+
+
+MAGIC = b"MQRB"
+VERSION = 1
+EXTENSION = ".bin"
+FIELDS = ("native", "masquerade", "squid")
+
+_HEADER = struct.Struct("<4sH")
+_LENGTH = struct.Struct("<I")
+_SWAP = sys.byteorder == "big"
+
+
+def _write_string(out: List[bytes], string: str):
+    encoded = string.encode("utf-8")
+    out.append(_LENGTH.pack(len(encoded)))
+    out.append(encoded)
+
+
+def _write_array(out: List[bytes], values: array):
+    if _SWAP:
+        values = array(values.typecode, values)
+        values.byteswap()
+    out.append(values.typecode.encode("ascii"))
+    out.append(_LENGTH.pack(len(values)))
+    out.append(values.tobytes())
+
+
+class _Reader:
+    """
+    This class describes a reader of the buffer of a binary file.
+    """
+    __slots__ = ("_buffer", "_offset")
+
+    def __init__(self, buffer: bytes, offset: int = 0):
+        self._buffer = memoryview(buffer)
+        self._offset = offset
+
+    def length(self) -> int:
+        """
+        Read a length
+
+        :returns:   The length
+        :rtype:     int
+        """
+        (length,) = _LENGTH.unpack_from(self._buffer, self._offset)
+        self._offset += _LENGTH.size
+        return length
+
+    def string(self) -> str:
+        """
+        Read a string
+
+        :returns:   The string
+        :rtype:     str
+        """
+        length = self.length()
+        res = str(self._buffer[self._offset:self._offset + length], "utf-8")
+        self._offset += length
+        return res
+
+    def array(self) -> array:
+        """
+        Read an array
+
+        :returns:   The array
+        :rtype:     array
+        """
+        typecode = chr(self._buffer[self._offset])
+        self._offset += 1
+        length = self.length()
+        res = array(typecode)
+        end = self._offset + length * res.itemsize
+        res.frombytes(self._buffer[self._offset:end])
+        self._offset = end
+        if _SWAP:
+            res.byteswap()
+        return res
+
+
+def _values(values: List, typecode: str) -> array:
+    return array(typecode, (0 if value == "NULL" else value for value in values))
+
+
+def _dump_bulktest(out: List[bytes], result: Result):
+    for field in FIELDS:
+        _write_array(out, array("q", (int(run.get_content()) for run in result.get_field(field))))
+
+
+def _load_bulktest(reader: _Reader) -> Result:
+    fields = {f"_{field}": reader.array().tolist() for field in FIELDS}
+    return BulkTest(**fields)
+
+
+def _dump_speedtest(out: List[bytes], result: Result):
+    assert isinstance(result, SpeedTest)
+    for field in FIELDS:
+        runs = result.get_field(field)
+        _write_array(out, _values([run.get_metric("ping") for run in runs], "q"))
+        _write_array(out, _values([run.get_metric("download") for run in runs], "d"))
+        _write_array(out, _values([run.get_metric("upload") for run in runs], "d"))
+
+
+def _load_speedtest(reader: _Reader) -> Result:
+    fields = {}
+    for field in FIELDS:
+        pings, downloads, uploads = reader.array(), reader.array(), reader.array()
+        fields[f"_{field}"] = [{"ping_ms": ping, "download_mbps": download,
+                                "upload_mbps": upload}
+                               for ping, download, upload in zip(pings, downloads, uploads)]
+    return SpeedTest(**fields)
+
+
+def _dump_browsertime(out: List[bytes], result: Result):
+    for field in FIELDS:
+        reports = result.get_field(field)
+        assert isinstance(reports, dict)
+        out.append(_LENGTH.pack(len(reports)))
+        # The number of page load times and the end of the values of each website
+        splits = array("q")
+        end = 0
+        for website, report in reports.items():
+            _write_string(out, website)
+            page_load_time = len(report.get_page_load_time())
+            end += page_load_time + len(report.get_speed_index())
+            splits.extend((page_load_time, end))
+        _write_array(out, splits)
+        typecode = "d" if any(report.get_page_load_time().typecode == "d"
+                              for report in reports.values()) else "q"
+        _write_array(out, array(typecode, itertools.chain.from_iterable(
+            itertools.chain(report.get_page_load_time(), report.get_speed_index())
+            for report in reports.values())))
+
+
+def _load_browsertime(reader: _Reader) -> Result:
+    fields = {}
+    for field in FIELDS:
+        websites = [reader.string() for _ in range(reader.length())]
+        splits = reader.array()
+        values = reader.array()
+        reports = {}
+        start = 0
+        for i, website in enumerate(websites):
+            end = splits[2 * i + 1]
+            reports[website] = Report.from_array(values[start:end], splits[2 * i])
+            start = end
+        fields[f"_{field}"] = reports
+    return BrowserTime(**fields)
+
+
+# The name of each type in the files -> its type, its writer and its reader
+_TYPES: Dict[str, Tuple[type, Callable[[List[bytes], Result], None],
+                        Callable[[_Reader], Result]]] = {
+    "BrowserTime": (BrowserTime, _dump_browsertime, _load_browsertime),
+    "BulkTest": (BulkTest, _dump_bulktest, _load_bulktest),
+    "SpeedTest": (SpeedTest, _dump_speedtest, _load_speedtest)}
+
+
+def dumps(experiment: Dict[str, Result]) -> bytes:
+    """
+    Pack the tests of an experiment
+
+    :param      experiment:  The tests by their name
+    :type       experiment:  dict str * Result
+
+    :returns:   The binary content
+    :rtype:     bytes
+
+    :raises     ValueError:  If a test has no binary format
+    """
+    out = [_HEADER.pack(MAGIC, VERSION), _LENGTH.pack(len(experiment))]
+    for name, result in experiment.items():
+        for kind, (cls, dump, _) in _TYPES.items():
+            if isinstance(result, cls):
+                _write_string(out, name)
+                _write_string(out, kind)
+                dump(out, result)
+                break
+        else:
+            raise ValueError(f"No binary format for the test {name} of type {type(result)}")
+    return b"".join(out)
+
+
+def loads(buffer: bytes) -> Dict[str, Result]:
+    """
+    Unpack the tests of an experiment
+
+    :param      buffer:  The binary content
+    :type       buffer:  bytes
+
+    :returns:   The tests by their name
+    :rtype:     dict str * Result
+
+    :raises     ValueError:  If it is not a binary experiment, or of an unknown version
+    """
+    if len(buffer) < _HEADER.size:
+        raise ValueError("Not a binary experiment")
+    magic, version = _HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("Not a binary experiment")
+    if version != VERSION:
+        raise ValueError(f"Unknown version {version} of the binary format, "
+                         + f"version {VERSION} is supported")
+    reader = _Reader(buffer, _HEADER.size)
+    res = {}
+    for _ in range(reader.length()):
+        name = reader.string()
+        kind = reader.string()
+        if kind not in _TYPES:
+            raise ValueError(f"Unknown type {kind} of the test {name}")
+        res[name] = _TYPES[kind][2](reader)
+    return res
+
+
+def load(filename: str) -> Dict[str, Result]:
+    """
+    Load a binary experiment
+
+    :param      filename:  The filename
+    :type       filename:  str
+
+    :returns:   The tests by their name
+    :rtype:     dict str * Result
+    """
+    with open(filename, "rb") as file:
+        return loads(file.read())
+
+
+def dump(experiment: Dict[str, Result], filename: str):
+    """
+    Write a binary experiment
+
+    :param      experiment:  The tests by their name
+    :type       experiment:  dict str * Result
+    :param      filename:    The filename
+    :type       filename:    str
+    """
+    with open(filename, "wb") as file:
+        file.write(dumps(experiment))
+
+
+def converted(filename: str) -> str:
+    """
+    Get the name of the binary version of a yaml file
+
+    :param      filename:  The name of the yaml file
+    :type       filename:  str
+
+    :returns:   The name of the binary file
+    :rtype:     str
+    """
+    return filename[:filename.rindex(".yml")] + EXTENSION
+
+
+def convert(folder: str = "datas", remove: bool = False) -> int:
+    """
+    Write the binary version of the yaml files of a datas folder, next to them.
+    The files already converted and not modified since are skipped,
+    the compressed files are converted but the archives are not.
+
+    :param      folder:  The folder, datas/<country>/<run>/<experiment>.yml
+    :type       folder:  str
+    :param      remove:  If we remove the yaml files once converted
+    :type       remove:  bool
+
+    :returns:   The number of files converted
+    :rtype:     int
+    """
+    from .experiments import decompress     # pylint: disable=C0415
+    res = 0
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if ".yml" not in name:
+                continue
+            path = os.path.join(root, name)
+            target = os.path.join(root, converted(name))
+            if (os.path.exists(target)
+                and os.path.getmtime(target) >= os.path.getmtime(path)):
+                debug(f"Ignoring {path}, already converted")
+            else:
+                with open(path, "rb") as file:
+                    experiment = yaml.load(decompress(file, name), Loader=Loader)
+                try:
+                    content = dumps(experiment)
+                except (ValueError, TypeError) as err:
+                    warning(f"Cannot convert {path}: {err}")
+                    continue
+                with open(target, "wb") as file:
+                    file.write(content)
+                res += 1
+            if remove:
+                os.remove(path)
+    info(f"{res} files converted in {folder}")
+    return res
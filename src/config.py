@@ -20,10 +20,70 @@
 """
 Module containing the config file
 """
+from collections.abc import Mapping
+from os import environ
+from typing import Any
+from typing import Dict
 from typing import Final
+from typing import Iterator
+from typing import Optional
 
 import yaml
 
 
-with open("config.yml", "r", encoding="utf-8") as file:
-    CONFIG: Final = yaml.safe_load(file)
+ENVIRONMENT_VARIABLE = "MASQUERADE_CONFIG"
+DEFAULT_PATH = "config.yml"
+
+
+class Config(Mapping):
+    """
+    This class describes the configuration, read from its file the first time it is used.
+
+    The file is the one given to locate, else the one of the environment variable
+    MASQUERADE_CONFIG, else config.yml in the current directory.
+    """
+    _path: Optional[str]
+    _data: Optional[Dict[str, Any]]
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self._data = None
+
+    def locate(self, path: Optional[str]):
+        """
+        Use another configuration file, it is read the next time the configuration is used
+
+        :param      path:  The path of the file, None to use the default one
+        :type       path:  str
+        """
+        self._path = path
+        self._data = None
+
+    def path(self) -> str:
+        """
+        Gets the path of the configuration file.
+
+        :returns:   The path
+        :rtype:     str
+        """
+        if self._path is not None:
+            return self._path
+        return environ.get(ENVIRONMENT_VARIABLE, DEFAULT_PATH)
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is None:
+            with open(self.path(), "r", encoding="utf-8") as file:
+                self._data = yaml.safe_load(file)
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._load()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+
+CONFIG: Final = Config()
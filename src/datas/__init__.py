@@ -19,9 +19,25 @@
 """
 Module for the Data classes
 """
-from .analyse_data import AnalysedData
-from .analyse_data import AnalysedDataCountryDependent
-from .analyse_data import AnalysedDataWebsiteDependent
-from .data import Data
-from .data import DataCountryDependent
-from .data import DataWebsiteDependent
+from importlib import import_module
+
+
+# The submodules are only imported when needed, they import pandas, scipy and matplotlib
+_EXPORTS = {"AnalysedData": "analyse_data",
+            "AnalysedDataCountryDependent": "analyse_data",
+            "AnalysedDataWebsiteDependent": "analyse_data",
+            "Comparisons": "analyse_data",
+            "Data": "data",
+            "DataCountryDependent": "data",
+            "DataWebsiteDependent": "data",
+            "PlotJob": "plot",
+            "render_plots": "plot",
+            "QuantileSketch": "sketch"}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -21,20 +21,109 @@ Module for the AnalysedData class
 """
 import re
 from collections.abc import Mapping
+from io import StringIO
+from itertools import combinations
 from logging import warning
+from typing import Dict
 from typing import Hashable
+from typing import Iterable
 from typing import List
 from typing import Optional
+from typing import TextIO
 from typing import Tuple
 
+from numpy import array
+from numpy import full
 from numpy import isnan
-from pandas import Series
+from numpy import ndarray
+from numpy import zeros
 from typing_extensions import Self
 
+from ..config import CONFIG
 from .base_data import BaseData
 from .base_data import BaseDataCountryDependent
 from .base_data import BaseDataDependent
 from .base_data import BaseDataWebsiteDependent
+from .latex import write_latex
+
+
+class Comparisons:
+    """
+    This class describes the comparisons between an ordered list of scenarios.
+
+    Each ordered pair of scenarios is encoded as an integer, mapped to the slot of
+    the analysed data holding the comparison, and to whether it is in the order of the
+    slot or needs its error to be inverted.
+    """
+    _scenarios: List[str]
+    _index: Dict[str, int]
+    slots: ndarray
+    direct: ndarray
+
+    def __init__(self, scenarios: List[str]):
+        self._scenarios = list(scenarios)
+        self._index = {scenario: i for i, scenario in enumerate(self._scenarios)}
+        count = len(self._scenarios)
+        self.slots = full(count * count, -1)
+        self.direct = zeros(count * count, dtype=bool)
+        for slot, (first, second) in enumerate(combinations(range(count), 2)):
+            self.slots[first * count + second] = slot
+            self.direct[first * count + second] = True
+            self.slots[second * count + first] = slot
+
+    def __len__(self) -> int:
+        return len(self._scenarios) * (len(self._scenarios) - 1) // 2
+
+    def code(self, first: Hashable, second: Hashable) -> Optional[int]:
+        """
+        Get the code of the comparison of two scenarios
+
+        :param      first:   The first scenario
+        :type       first:   Hashable
+        :param      second:  The second scenario
+        :type       second:  Hashable
+
+        :returns:   The code, None if one of the scenario is unknown
+        :rtype:     int
+        """
+        if first not in self._index or second not in self._index:
+            return None
+        return self._index[first] * len(self._scenarios) + self._index[second]
+
+    def name(self, code: int) -> str:
+        """
+        Get the name of a comparison
+
+        :param      code:  The code
+        :type       code:  int
+
+        :returns:   The name
+        :rtype:     str
+        """
+        first, second = divmod(code, len(self._scenarios))
+        return f"{self._scenarios[first]} against {self._scenarios[second]}"
+
+    @classmethod
+    def find(cls, labels: Iterable[Hashable]) -> Optional[Self]:
+        """
+        Find the configured scenarios containing every label
+
+        :param      labels:  The labels
+        :type       labels:  Hashable iterable
+
+        :returns:   The comparisons of these scenarios, None if there is none
+        :rtype:     Comparisons
+        """
+        labels = set(labels)
+        for scenarios in CONFIG["scenarios"]:
+            if labels <= set(scenarios):
+                if tuple(scenarios) not in _COMPARISONS:
+                    _COMPARISONS[tuple(scenarios)] = cls(scenarios)
+                return _COMPARISONS[tuple(scenarios)]
+        return None
+
+
+_COMPARISONS: Dict[Tuple[str, ...], Comparisons] = {}
 
 
 class AnalysedData(BaseData):
@@ -42,86 +131,78 @@ class AnalysedData(BaseData):
     This class describes an analysed data.
     """
     def __init__(self, data: Optional[BaseData] = None, default: Optional[List] = None,
-                 interpreted: bool = False, **kwargs):
+                 interpreted: bool = False, comparisons: Optional[Comparisons] = None,
+                 **kwargs):
         if data is None:
             data = BaseData()
         if default is None:
-            default = [None, None, None]
-        def interpret(line: Series) -> Series:
-            res: List[Optional[Tuple]] = default.copy()
-            for i, value in enumerate(line):
-                if value:
-                    test, err = value
-                    if not isnan(err):
-                        match line.index[i]:
-                            case "native against squid" | "it against de":
-                                res[0] = (test, err)
-                            case "squid against native" | "de against it":
-                                res[0] = (test, - (err / (err + 1)))
-                            case "native against masquerade" | "it against fr":
-                                res[1] = (test, err)
-                            case "masquerade against native" | "fr against it":
-                                res[1] = (test, - (err / (err + 1)))
-                            case "squid against masquerade" | "de against fr":
-                                res[2] = (test, err)
-                            case "masquerade against squid" | "fr against de":
-                                res[2] = (test, - (err / (err + 1)))
-                            case None:
-                                pass
-                            case name:
-                                warning(f"Unexpected column name: {name}")
-                    else:
-                        warning(f"Found nan in column: {line.index[i]}")
-            return Series([res])
+            default = [None] * (len(comparisons) if comparisons is not None else 3)
         if interpreted:
-            super().__init__(data.apply(interpret, axis="columns"), default, **kwargs)
+            assert comparisons is not None
+            super().__init__(self.interpret(data, comparisons, default), default, **kwargs)
         else:
             super().__init__(data, default, **kwargs)
 
+    @staticmethod
+    def interpret(data: BaseData, comparisons: Comparisons, default: List) -> BaseData:
+        """
+        Put each comparison in its slot, in the order of the scenarios
+
+        :param      data:         The comparisons indexed by their codes
+        :type       data:         BaseData
+        :param      comparisons:  The comparisons
+        :type       comparisons:  Comparisons
+        :param      default:      The default value of a cell
+        :type       default:      list
+
+        :returns:   The interpreted data
+        :rtype:     BaseData
+        """
+        columns = [i for i, code in enumerate(data.columns) if code is not None and code >= 0]
+        codes = array([data.columns[i] for i in columns], dtype=int)
+        slots = comparisons.slots[codes] if columns else array([], dtype=int)
+        direct = comparisons.direct[codes] if columns else array([], dtype=bool)
+        res = []
+        for line in data.itertuples(index=False, name=None):
+            cell: List[Optional[Tuple]] = default.copy()
+            for k, i in enumerate(columns):
+                value = line[i]
+                if value:
+                    test, err = value
+                    if isnan(err):
+                        warning(f"Found nan in column: {comparisons.name(codes[k])}")
+                    elif direct[k]:
+                        cell[slots[k]] = (test, err)
+                    else:
+                        cell[slots[k]] = (test, - (err / (err + 1)))
+            res.append([cell])
+        interpreted = BaseData(res, index=data.index)
+        interpreted.set_name(data.get_name())
+        return interpreted
+
     def __str__(self, unit: Optional[str] = None, detailed: bool = False) -> str:
-        def replace(cell):
-            # pylint: disable=C0103
-            up = "$\\nearrow$"
-            down = "$\\searrow$"
-            res = ""
-            for value in cell:
-                match value:
-                    case None:
-                        res += " & "
-                    case (test, err):
-                        if detailed:
-                            content = f"${err*100:.2f}%$" if err != 0 else " "
-                        else:
-                            content = up if err > 0 else (down if err < 0 else "=")
-                        if test:
-                            res += f"\\cellcolor{{green}}{content} & "
-                        else:
-                            # if err < 0.05 and err > -0.05:
-                            #     content = "="
-                            # else:
-                            res += f"\\cellcolor{{red}}{content} & "
-                    case _:
-                        raise ValueError(f"Unexpected: {value}")
-            res = res[:-3]
-            return res
-        styler = self.applymap(replace).style
-        newline = "\\\\"
-        styler.format_index(
-            lambda name: f"\\multicolumn{{3}}{{c}}{{\\makecell{{{name.replace(' ', newline)}}}}}",
-            axis="columns")
+        string = StringIO()
+        self.to_latex(string, unit, detailed)
+        return string.getvalue()
+
+    def to_latex(self, file: TextIO, unit: Optional[str] = None, detailed: bool = False):
+        """
+        Write the analysed data as a LaTeX tabular
+
+        :param      file:      The file
+        :type       file:      TextIO
+        :param      unit:      The unit of the index, by default taken from the name
+        :type       unit:      str
+        :param      detailed:  Indicates if we print the error instead of the arrow
+        :type       detailed:  bool
+        """
         if unit is None:
             name = self.get_name()
             if name:
                 unit_tmp = re.search(r"\(.+\)", name)
                 if unit_tmp:
                     unit = unit_tmp.group(0)[1:-1]
-
-        if unit is not None:
-            styler.format_index(lambda index: f"{index} ({unit})", axis='index')
-        res = styler.to_latex(hrules=True)
-        if isinstance(res, str):
-            return res.replace('%', '\\%')
-        return ""
+        write_latex(self, file, unit, detailed, len(self._default_value))
 
     # pylint: disable=W0221         # issue with importing the right thing for the last arg
     def insert(self, loc: int, column: Hashable, value: Self, **kwargs):
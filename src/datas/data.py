@@ -20,7 +20,6 @@
 Module for the Data class
 """
 from logging import debug
-from logging import exception
 from logging import info
 from logging import warning
 from os import mkdir
@@ -31,28 +30,78 @@ from typing import Optional
 from typing import Tuple
 from typing import Union
 
-import fastplot
+from numpy import add
+from numpy import arange
+from numpy import array
+from numpy import asarray
+from numpy import concatenate
+from numpy import cumsum
+from numpy import floor
 from numpy import isnan
+from numpy import lexsort
+from numpy import maximum
+from numpy import minimum
+from numpy import repeat
+from numpy import where
 from numpy.typing import ArrayLike
+from pandas import DataFrame
 from pandas import Series
-from scipy.ndimage import median
-from scipy.stats import mood
-from scipy.stats import ttest_ind
 
 from ..config import CONFIG
+from ..profiling import count
 from .analyse_data import AnalysedData
 from .analyse_data import AnalysedDataCountryDependent
 from .analyse_data import AnalysedDataDependent
 from .analyse_data import AnalysedDataWebsiteDependent
+from .analyse_data import Comparisons
 from .base_data import BaseData
 from .base_data import BaseDataCountryDependent
 from .base_data import BaseDataDependent
 from .base_data import BaseDataWebsiteDependent
+from .plot import fingerprint
+from .plot import is_up_to_date
+from .plot import PlotJob
+from .plot import render_plots
+from .plot import WHIS
+from .sketch import QuantileSketch
 
 
 SCALES = ['linear']#,'log']
 EXTENSIONS = ['pdf']#, 'png']
-FONT_SIZE = 16
+
+
+def _median(obj) -> float:
+    if isinstance(obj, QuantileSketch):
+        return obj.median()
+    # scipy is only imported when analysing
+    from scipy.ndimage import median     # pylint: disable=C0415
+    return median(obj)
+
+
+def _sample(obj) -> List:
+    if isinstance(obj, QuantileSketch):
+        return obj.sample()
+    return obj
+
+
+def _ttest(obj1, obj2) -> float:
+    # pylint: disable=C0415
+    from scipy.stats import ttest_ind
+    from scipy.stats import ttest_ind_from_stats
+    if isinstance(obj1, QuantileSketch) and isinstance(obj2, QuantileSketch):
+        # The moments are exact in a sketch, so is the test
+        res = ttest_ind_from_stats(obj1.mean(), obj1.std(), len(obj1),
+                                   obj2.mean(), obj2.std(), len(obj2), equal_var=False)
+        # pylint: disable=C0301
+        return res.pvalue                                                               # pyright: ignore[reportGeneralTypeIssues]
+    # pylint: disable=C0301
+    return ttest_ind(_sample(obj1), _sample(obj2), equal_var=False).pvalue              # pyright: ignore[reportGeneralTypeIssues]
+
+
+def _mood(obj1, obj2) -> float:
+    from scipy.stats import mood         # pylint: disable=C0415
+    # pylint: disable=C0301
+    return mood(_sample(obj1), _sample(obj2)).pvalue                                    # pyright: ignore[reportGeneralTypeIssues]
 
 
 class Data(BaseData):
@@ -76,11 +125,11 @@ class Data(BaseData):
                 try:
                     if not obj1 or not obj2:
                         return None
-                    return (fct(obj1, obj2), (median(obj2) - median(obj1)) / median(obj1))
+                    return (fct(obj1, obj2), (_median(obj2) - _median(obj1)) / _median(obj1))
                 except BaseException as err: # pylint: disable=W0718
                     info(f"While comparing the datas: {obj1} vs {obj2}, "
                          + f"the following occured:\n{err}")
-                    tmp = -(median(obj1)-median(obj2))/median(obj1)
+                    tmp = -(_median(obj1)-_median(obj2))/_median(obj1)
                     if isnan(tmp):
                         return None
                     return (False, tmp)
@@ -89,30 +138,38 @@ class Data(BaseData):
                     return Series([None], [None])
                 res = []
                 index = []
-                for i in range(len(line)):
-                    for j in range(i+1, len(line)):
-                        res.append(comp_value(line.iloc[i], line.iloc[j]))
-                        index.append(f"{line.index[i]} against {line.index[j]}")
-                return Series(res, index)
+                for i, j, code in pairs:
+                    res.append(comp_value(line.iloc[i], line.iloc[j]))
+                    index.append(code)
+                return Series(res, index, dtype=object)
             return temp
         def fct() -> Callable[[ArrayLike, ArrayLike], bool]:
             match test_type.lower():
                 case "t-test":
-                    # pylint: disable=C0301
-                    return lambda a, b : abs(ttest_ind(a, b, equal_var=False).pvalue) <= 0.05   # pyright: ignore[reportGeneralTypeIssues]
+                    return lambda a, b : abs(_ttest(a, b)) <= 0.05
                 case "mood":
-                    # pylint: disable=C0301
-                    return lambda a, b : abs(mood(a, b).pvalue) <= 0.05                         # pyright: ignore[reportGeneralTypeIssues]
+                    return lambda a, b : abs(_mood(a, b)) <= 0.05
                 case "all":
-                    # pylint: disable=C0301
-                    return lambda a, b : (abs(ttest_ind(a, b, equal_var=False).pvalue) <= 0.05  # pyright: ignore[reportGeneralTypeIssues]
-                                          or abs(mood(a, b).pvalue) <= 0.05)                    # pyright: ignore[reportGeneralTypeIssues]
+                    return lambda a, b : (abs(_ttest(a, b)) <= 0.05
+                                          or abs(_mood(a, b)) <= 0.05)
                 case _:
                     raise ValueError(f"Unexpected test type: {test_type}")
-        return AnalysedData(self.apply(aux(fct()), axis="columns"), interpreted=True)
-
+        comparisons = Comparisons.find(self.columns)
+        if comparisons is None:
+            warning(f"No configured scenarios contains: {list(self.columns)}, "
+                    "comparing them in their order")
+            comparisons = Comparisons(list(self.columns))
+        pairs = []
+        for i, first in enumerate(self.columns):
+            for j in range(i+1, len(self.columns)):
+                pairs.append((i, j, comparisons.code(first, self.columns[j])))
+        return AnalysedData(self.apply(aux(fct()), axis="columns"),
+                            interpreted=True, comparisons=comparisons)
+
+    # pylint: disable=R0913
     def plot(self, metric: str, depending: Union[List[str],str],
-             conditions: str, aux: str = ""):
+             conditions: str, aux: str = "", jobs: int = 1, force: bool = False
+            ) -> List[Tuple[PlotJob, BaseException]]:
         """
         Plot the data using fastplot
 
@@ -124,6 +181,36 @@ class Data(BaseData):
         :type       conditions:  str
         :param      aux:         The auxiliary
         :type       aux:         str
+        :param      jobs:        The number of process rendering the plots
+        :type       jobs:        int
+        :param      force:       If we render the plots even if they are up to date
+        :type       force:       bool
+
+        :returns:   The jobs that failed with their error
+        :rtype:     (PlotJob * BaseException) list
+
+        :raises     ValueError:  wrong value for depending
+        """
+        return render_plots(self.plot_jobs(metric, depending, conditions, aux, force), jobs)
+
+    def plot_jobs(self, metric: str, depending: Union[List[str],str],
+                  conditions: str, aux: str = "", force: bool = False) -> List[PlotJob]:
+        """
+        Create the jobs needed to plot the data
+
+        :param      metric:      The metric
+        :type       metric:      str
+        :param      depending:   The depending
+        :type       depending:   str list | str
+        :param      conditions:  The conditions
+        :type       conditions:  str
+        :param      aux:         The auxiliary
+        :type       aux:         str
+        :param      force:       If we create the jobs even for the plots up to date
+        :type       force:       bool
+
+        :returns:   The plot jobs
+        :rtype:     PlotJob list
 
         :raises     ValueError:  wrong value for depending
         """
@@ -144,8 +231,9 @@ class Data(BaseData):
         name = f"{folder}/{ylabel} depending on {xlabel} with {conditions}{aux}"
         if self.empty:
             warning(f"Issue while creating {name}, absence of datas")
-            return
+            return []
         self.fillna(inplace=True)
+        data = self.box_stats()
 
         info(f"{name} has on average {self.mean_length()} datapoints per box "
              + f"with a min of {self.min_length()} and max of {self.max_length()}.")
@@ -158,21 +246,80 @@ class Data(BaseData):
             mkdir(folder)
         except FileExistsError:
             pass
-        for scale in SCALES:
-            for extension in EXTENSIONS:
-                tmp_name = f"{name}({scale}).{extension}"
-                try:
-                    fastplot.plot(data=self, path=tmp_name.replace(' ', '_'), mode="boxplot_multi",
-                                  xlabel=xlabel, ylabel=ylabel, yscale=scale,
-                                  legend=True, legend_ncol=3, figsize=(8, 4),
-                                  rcParams={'font.size': FONT_SIZE})
-                                  # style='latex',
-                                  # rcParams={'text.latex.preamble': r'\usepackage{libertine}'})
-                    debug(f"Saved plot: {tmp_name}")
-                except ValueError:
-                    exception(f"Issue while creating {tmp_name}, check what it was:\n{self}")
-                except TypeError:
-                    exception(f"Issue while creating {tmp_name}, check what it was:\n{self}")
+        job = PlotJob(data, name, xlabel, ylabel, tuple(SCALES), tuple(EXTENSIONS),
+                      fingerprint(data, xlabel, ylabel))
+        if not force and is_up_to_date(job):
+            debug(f"Skipping plot: {name}, already up to date")
+            count("plots up to date")
+            return []
+        return [job]
+
+    def box_stats(self, whis: Tuple[float, float] = WHIS) -> DataFrame:
+        """
+        Compute the boxplot statistics of every cell, the same way matplotlib does.
+        The lists are put in one sorted ragged buffer to compute everything at once.
+
+        :param      whis:  The percentiles of the whiskers
+        :type       whis:  float * float
+
+        :returns:   The statistics of each cell (None if the cell is empty)
+        :rtype:     DataFrame
+        """
+        stats = DataFrame(None, index=self.index, columns=self.columns, dtype=object)
+        cells = []
+        for i in range(self.shape[0]):
+            for j in range(self.shape[1]):
+                cell = self.iat[i, j]
+                if isinstance(cell, QuantileSketch):
+                    if len(cell):
+                        low, q1, med, q3, high = (cell.quantile(p / 100)
+                                                  for p in (whis[0], 25, 50, 75, whis[1]))
+                        # Only the extremes are known, they bound the axis as the fliers do
+                        stats.iat[i, j] = {"med": med, "q1": q1, "q3": q3,
+                                           "whislo": low, "whishi": high,
+                                           "fliers": [value for value in (cell.quantile(0),
+                                                                          cell.quantile(1))
+                                                      if value < low or value > high]}
+                elif len(cell):
+                    cells.append((i, j, cell))
+        if not cells:
+            return stats
+
+        lengths = array([len(cell) for _, _, cell in cells])
+        starts = concatenate(([0], cumsum(lengths)[:-1]))
+        ids = repeat(arange(len(cells)), lengths)
+        buffer = concatenate([asarray(cell, dtype=float) for _, _, cell in cells])
+        buffer = buffer[lexsort((buffer, ids))]
+
+        def percentile(p: float):
+            pos = (lengths - 1) * p / 100
+            low = floor(pos).astype(int)
+            high = minimum(low + 1, lengths - 1)
+            return (buffer[starts + low]
+                    + (buffer[starts + high] - buffer[starts + low]) * (pos - low))
+
+        loval, q1, med, q3, hival = (percentile(p) for p in (whis[0], 25, 50, 75, whis[1]))
+        # The whiskers are the most extreme datas inside the percentiles
+        below = add.reduceat((buffer <= hival[ids]).astype(int), starts)
+        above = add.reduceat((buffer < loval[ids]).astype(int), starts)
+        whishi = buffer[starts + maximum(below - 1, 0)]
+        whislo = buffer[minimum(starts + above, starts + lengths - 1)]
+        whishi = where((below == 0) | (whishi < q3), q3, whishi)
+        whislo = where((above == lengths) | (whislo > q1), q1, whislo)
+        # Only the extremes of the fliers are kept, they bound the axis as all of them do
+        before = add.reduceat((buffer < whislo[ids]).astype(int), starts)
+        until = add.reduceat((buffer <= whishi[ids]).astype(int), starts)
+
+        for k, (i, j, _) in enumerate(cells):
+            fliers = []
+            if before[k] > 0:
+                fliers.append(float(buffer[starts[k]]))
+            if until[k] < lengths[k]:
+                fliers.append(float(buffer[starts[k] + lengths[k] - 1]))
+            stats.iat[i, j] = {"med": float(med[k]), "q1": float(q1[k]), "q3": float(q3[k]),
+                               "whislo": float(whislo[k]), "whishi": float(whishi[k]),
+                               "fliers": fliers}
+        return stats
 
     def mean_length(self) -> float:
         """
@@ -227,14 +374,16 @@ class DataDependent(Data, BaseDataDependent):
         return self._analysed_type(
             {key: data.analyse(test_type) for key, data in self.items()})
 
-    def plot(self, metric: str, depending: Union[List[str],str],
-             conditions: str, aux: str = ""):
+    def plot_jobs(self, metric: str, depending: Union[List[str],str],
+                  conditions: str, aux: str = "", force: bool = False) -> List[PlotJob]:
+        res = []
         for key, data in self.items():
             if aux:
                 aux_tmp = f"{aux} {key}"
             else:
                 aux_tmp = key
-            data.plot(metric, depending, conditions, aux_tmp)
+            res.extend(data.plot_jobs(metric, depending, conditions, aux_tmp, force))
+        return res
 
 class DataCountryDependent(BaseDataCountryDependent, DataDependent):
     """
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 17:21:37
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 17:21:37
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Module for rendering the analysed datas as LaTeX tables
+"""
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import TextIO
+
+from jinja2 import Environment
+from pandas import DataFrame
+
+
+UP = "$\\nearrow$"
+DOWN = "$\\searrow$"
+NEWLINE = "\\\\"
+
+# The delimiters are changed to not collide with the braces of LaTeX
+ENVIRONMENT = Environment(block_start_string="\\BLOCK{", block_end_string="}",
+                          variable_start_string="\\VAR{", variable_end_string="}",
+                          comment_start_string="\\#{", comment_end_string="}",
+                          keep_trailing_newline=True, autoescape=False)
+
+TEMPLATE = ENVIRONMENT.from_string(r"""\begin{tabular}{\VAR{column_format}}
+\toprule
+\VAR{header} \\
+\midrule
+\BLOCK{for row in rows}\VAR{row} \\
+\BLOCK{endfor}\bottomrule
+\end{tabular}
+""")
+
+
+def format_cell(cell: Iterable, detailed: bool = False) -> str:
+    """
+    Format a cell of (test, err) tuples, one LaTeX column per comparison
+
+    :param      cell:      The cell
+    :type       cell:      (bool * float) option iterable
+    :param      detailed:  Indicates if we print the error instead of the arrow
+    :type       detailed:  bool
+
+    :returns:   The LaTeX content
+    :rtype:     str
+
+    :raises     ValueError:  if the cell contains something unexpected
+    """
+    res = []
+    for value in cell:
+        match value:
+            case None:
+                res.append("")
+            case (test, err):
+                if detailed:
+                    content = f"${err*100:.2f}\\%$" if err != 0 else " "
+                else:
+                    content = UP if err > 0 else (DOWN if err < 0 else "=")
+                res.append(f"\\cellcolor{{{'green' if test else 'red'}}}{content}")
+            case _:
+                raise ValueError(f"Unexpected: {value}")
+    return " & ".join(res)
+
+
+def _escape(text) -> str:
+    return str(text).replace('%', '\\%')
+
+
+def _rows(data: DataFrame, unit: Optional[str], detailed: bool) -> Iterator[str]:
+    for index, line in zip(data.index, data.itertuples(index=False, name=None)):
+        label = f"{index} ({unit})" if unit is not None else f"{index}"
+        yield " & ".join([_escape(label)] + [format_cell(cell, detailed) for cell in line])
+
+
+def write_latex(data: DataFrame, file: TextIO,
+                unit: Optional[str] = None, detailed: bool = False, width: int = 3):
+    """
+    Write the analysed data as a LaTeX tabular, row by row
+
+    :param      data:      The analysed data
+    :type       data:      DataFrame
+    :param      file:      The file
+    :type       file:      TextIO
+    :param      unit:      The unit of the index
+    :type       unit:      str
+    :param      detailed:  Indicates if we print the error instead of the arrow
+    :type       detailed:  bool
+    :param      width:     The number of comparisons in a cell
+    :type       width:     int
+    """
+    name = data.columns.name
+    columns = [f"\\multicolumn{{{width}}}{{c}}{{\\makecell{{{str(column).replace(' ', NEWLINE)}}}}}"
+               for column in data.columns]
+    header = " & ".join(_escape(cell) for cell in [name if name is not None else ""] + columns)
+    for chunk in TEMPLATE.generate(column_format="l" * (1 + len(data.columns)),
+                                   header=header, rows=_rows(data, unit, detailed)):
+        file.write(chunk)
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 16:02:41
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 16:02:41
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Module for rendering the plots
+"""
+import json
+from colorsys import hls_to_rgb
+from colorsys import rgb_to_hls
+from concurrent.futures import as_completed
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from hashlib import sha256
+from logging import debug
+from logging import error
+from os.path import basename
+from os.path import dirname
+from os.path import exists
+from os.path import join
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from pandas import DataFrame
+
+from ..profiling import count
+from ..profiling import span
+
+
+FONT_SIZE = 16
+MANIFEST = ".manifest.json"
+WHIS = (5, 95)
+SATURATION = .75
+
+PLOT_OPTIONS: Dict[str, Any] = {"mode": "callback",
+                                "legend": True,
+                                "legend_ncol": 3,
+                                "figsize": (8, 4),
+                                "dpi": 300,
+                                "rcParams": {'font.size': FONT_SIZE}}
+                                # "style": 'latex',
+                                # "rcParams": {'text.latex.preamble': r'\usepackage{libertine}'}
+
+
+class PlotJob(NamedTuple):
+    """
+    This class describes a picklable plot to render in every scale and format.
+    The data contains the boxplot statistics of each cell.
+    """
+    data: DataFrame
+    name: str
+    xlabel: Optional[str]
+    ylabel: str
+    scales: Tuple[str, ...] = ("linear",)
+    extensions: Tuple[str, ...] = ("pdf",)
+    digest: str = ""
+
+    def paths(self) -> List[Tuple[str, str]]:
+        """
+        Gets the files created by the job.
+
+        :returns:   The scales and paths of the files
+        :rtype:     (str * str) list
+        """
+        return [(scale, f"{self.name}({scale}).{extension}".replace(' ', '_'))
+                for scale in self.scales for extension in self.extensions]
+
+
+def fingerprint(data: DataFrame, *args) -> str:
+    """
+    Compute the fingerprint of a plot from its datas and its options
+
+    :param      data:  The data
+    :type       data:  DataFrame
+    :param      args:  The labels and any other option of the plot
+    :type       args:  list
+
+    :returns:   The fingerprint
+    :rtype:     str
+    """
+    digest = sha256()
+    digest.update(repr((args, PLOT_OPTIONS)).encode())
+    digest.update(repr((list(data.index), list(data.columns))).encode())
+    for _, line in data.iterrows():
+        for cell in line:
+            digest.update(repr(cell).encode())
+    return digest.hexdigest()
+
+
+def _load_manifest(folder: str) -> Dict[str, str]:
+    try:
+        with open(join(folder, MANIFEST), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _record(job: PlotJob, manifests: Dict[str, Dict[str, str]]):
+    if not job.digest:
+        return
+    for _, path in job.paths():
+        folder = dirname(path)
+        if folder not in manifests:
+            manifests[folder] = _load_manifest(folder)
+        manifests[folder][basename(path)] = job.digest
+    for folder in {dirname(path) for _, path in job.paths()}:
+        with open(join(folder, MANIFEST), "w", encoding="utf-8") as file:
+            json.dump(manifests[folder], file, indent=2, sort_keys=True)
+
+
+def is_up_to_date(job: PlotJob) -> bool:
+    """
+    Determines if every file of the plot was already rendered from the same datas and options.
+
+    :param      job:  The job
+    :type       job:  PlotJob
+
+    :returns:   True if the plot is up to date, False otherwise.
+    :rtype:     bool
+    """
+    return all(exists(path) and _load_manifest(dirname(path)).get(basename(path)) == job.digest
+               for _, path in job.paths())
+
+
+def _draw_boxes(data: DataFrame, plt):
+    """
+    Draw the boxes from their precomputed statistics,
+    the same way seaborn's boxplot does for the mode boxplot_multi of fastplot.
+
+    :param      data:  The boxplot statistics
+    :type       data:  DataFrame
+    :param      plt:   The pyplot module
+    :type       plt:   module
+    """
+    # pylint: disable=C0415
+    import matplotlib
+    from matplotlib.colors import to_rgb
+    axes = plt.gca()
+    colors = []
+    for color in matplotlib.rcParamsDefault["axes.prop_cycle"].by_key()["color"]:
+        hue, lum, sat = rgb_to_hls(*to_rgb(color))
+        colors.append(hls_to_rgb(hue, lum, sat * SATURATION))
+    colors = colors[:len(data.columns)]
+    lum = min(rgb_to_hls(*color)[1] for color in colors) * .6
+    linecolor = (lum, lum, lum)
+    width = .8 / len(data.columns)
+    for k, column in enumerate(data.columns):
+        positions = []
+        stats = []
+        for i, cell in enumerate(data[column]):
+            if isinstance(cell, dict):
+                positions.append(i + width * k + width / 2 - .4)
+                stats.append(cell)
+        if not stats:
+            continue
+        artists = axes.bxp(stats, positions=positions, widths=width, capwidths=width / 2,
+                           patch_artist=True, manage_ticks=False,
+                           # Hidden, but they still bound the axis
+                           flierprops={"markersize": 0},
+                           boxprops={"facecolor": colors[k], "edgecolor": linecolor},
+                           medianprops={"color": linecolor, "solid_capstyle": "butt"},
+                           whiskerprops={"color": linecolor, "solid_capstyle": "butt"},
+                           capprops={"color": linecolor})
+        artists["boxes"][0].set_label(column)
+    axes.set_xticks(range(len(data.index)))
+    axes.set_xticklabels(data.index)
+    axes.set_xlim(-.5, len(data.index) - .5)
+
+
+def _init_worker():
+    import matplotlib                    # pylint: disable=C0415
+    matplotlib.use("Agg")
+
+
+def render(job: PlotJob):
+    """
+    Render a plot using fastplot.
+    The figure is built once then saved for every scale and format.
+
+    :param      job:  The job
+    :type       job:  PlotJob
+    """
+    import fastplot                      # pylint: disable=C0415
+    plt = fastplot.plot(data=None, path=None, xlabel=job.xlabel, ylabel=job.ylabel,
+                        yscale=job.scales[0], callback=partial(_draw_boxes, job.data),
+                        **PLOT_OPTIONS)
+    assert plt is not None
+    try:
+        current = job.scales[0]
+        for scale, path in job.paths():
+            if scale != current:
+                plt.yscale(scale)
+                plt.tight_layout()
+                current = scale
+            plt.savefig(path, dpi=PLOT_OPTIONS["dpi"])
+            debug(f"Saved plot: {path}")
+    finally:
+        plt.close()
+
+
+def render_plots(plot_jobs: Iterable[PlotJob], jobs: int = 1
+                ) -> List[Tuple[PlotJob, BaseException]]:
+    """
+    Render the plots, in parallel if more than one job is asked.
+    The errors are collected and reported once every plot is done.
+
+    :param      plot_jobs:  The plot jobs
+    :type       plot_jobs:  PlotJob iterable
+    :param      jobs:       The number of process rendering the plots
+    :type       jobs:       int
+
+    :returns:   The jobs that failed with their error
+    :rtype:     (PlotJob * BaseException) list
+    """
+    errors = []
+    manifests = {}
+    if jobs <= 1:
+        for job in plot_jobs:
+            try:
+                with span("render"):
+                    render(job)
+                _record(job, manifests)
+                count("plots rendered")
+            except Exception as err: # pylint: disable=W0718
+                errors.append((job, err))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+            futures = {executor.submit(render, job): job for job in plot_jobs}
+            for future in as_completed(futures):
+                err = future.exception()
+                if err is None:
+                    _record(futures[future], manifests)
+                    count("plots rendered")
+                else:
+                    errors.append((futures[future], err))
+    for job, err in errors:
+        error(f"Issue while creating {job.name}: {err!r}, check what it was:\n{job.data}")
+    if errors:
+        error(f"{len(errors)} plot(s) failed")
+    return errors
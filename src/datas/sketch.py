@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 15:12:08
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 15:12:08
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Module for the approximate quantile sketch
+"""
+from __future__ import annotations
+
+from math import ceil
+from math import sqrt
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+
+DEFAULT_ACCURACY = 200
+
+
+class QuantileSketch:
+    """
+    This class describes a mergeable KLL quantile sketch.
+
+    The sketch keeps at most O(k log(n/k)) values, the rank error of the quantiles
+    is roughly 1.7/k. The count, the mean and the variance are kept exactly.
+    """
+    _k: int
+    _compactors: List[List[float]]
+    _count: int
+    _mean: float
+    _m2: float
+    _coin: bool
+
+    def __init__(self, k: int = DEFAULT_ACCURACY, values: Optional[Iterable[float]] = None):
+        if k < 2:
+            raise ValueError(f"Accuracy of a sketch must be at least 2, got {k}")
+        self._k = k
+        self._compactors = [[]]
+        self._count = 0
+        self._mean = 0.
+        self._m2 = 0.
+        self._coin = False
+        if values is not None:
+            self.extend(values)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self) -> str:
+        return f"QuantileSketch(k={self._k}, n={self._count})"
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._compactors) - level - 1
+        return max(2, int(ceil(self._k * (2 / 3) ** depth)))
+
+    def _size(self) -> int:
+        return sum(len(compactor) for compactor in self._compactors)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self._compactors)))
+
+    def _compress(self):
+        while self._size() >= self._max_size():
+            for level, compactor in enumerate(self._compactors):
+                if len(compactor) >= self._capacity(level):
+                    if level + 1 == len(self._compactors):
+                        self._compactors.append([])
+                    compactor.sort()
+                    # Alternate the kept half to avoid a systematic bias
+                    self._coin = not self._coin
+                    self._compactors[level + 1].extend(compactor[int(self._coin)::2])
+                    del compactor[:]
+                    break
+
+    def update(self, value: float):
+        """
+        Add a value to the sketch
+
+        :param      value:  The value
+        :type       value:  float
+        """
+        value = float(value)
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+        self._compactors[0].append(value)
+        if len(self._compactors[0]) >= self._capacity(0):
+            self._compress()
+
+    def extend(self, values: Iterable[float]):
+        """
+        Add several values to the sketch
+
+        :param      values:  The values
+        :type       values:  float iterable
+        """
+        for value in values:
+            self.update(value)
+
+    def merge(self, other: QuantileSketch) -> QuantileSketch:
+        """
+        Merge another sketch into this one
+
+        :param      other:  The other sketch
+        :type       other:  QuantileSketch
+
+        :returns:   the sketch itself
+        :rtype:     QuantileSketch
+        """
+        if other._count == 0:
+            return self
+        total = self._count + other._count
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta * delta * self._count * other._count / total
+        self._mean += delta * other._count / total
+        self._count = total
+        while len(self._compactors) < len(other._compactors):
+            self._compactors.append([])
+        for level, compactor in enumerate(other._compactors):
+            self._compactors[level].extend(compactor)
+        self._compress()
+        return self
+
+    def _weighted(self) -> List[Tuple[float, int]]:
+        items = [(value, 1 << level)
+                 for level, compactor in enumerate(self._compactors)
+                 for value in compactor]
+        items.sort()
+        return items
+
+    def quantile(self, q: float) -> float:
+        """
+        Get an approximation of the quantile q
+
+        :param      q:    The quantile, between 0 and 1
+        :type       q:    float
+
+        :returns:   The value of the quantile
+        :rtype:     float
+
+        :raises     ValueError:  if the sketch is empty
+        """
+        if self._count == 0:
+            raise ValueError("Quantile of an empty sketch")
+        if len(self._compactors) == 1:
+            # Nothing was compacted yet, we can be exact
+            values = sorted(self._compactors[0])
+            pos = q * (len(values) - 1)
+            low = int(pos)
+            high = min(low + 1, len(values) - 1)
+            return values[low] + (values[high] - values[low]) * (pos - low)
+        items = self._weighted()
+        total = sum(weight for _, weight in items)
+        rank = q * total
+        cumulative = 0
+        for value, weight in items:
+            cumulative += weight
+            if cumulative >= rank:
+                return value
+        return items[-1][0]
+
+    def median(self) -> float:
+        """
+        Get an approximation of the median
+
+        :returns:   The median
+        :rtype:     float
+        """
+        return self.quantile(.5)
+
+    def mean(self) -> float:
+        """
+        Gets the exact mean.
+
+        :returns:   The mean
+        :rtype:     float
+        """
+        return self._mean
+
+    def std(self) -> float:
+        """
+        Gets the exact sample standard deviation.
+
+        :returns:   The standard deviation
+        :rtype:     float
+        """
+        if self._count < 2:
+            return 0.
+        return sqrt(self._m2 / (self._count - 1))
+
+    def sample(self, size: Optional[int] = None) -> List[float]:
+        """
+        Get a representative sample of the distribution, evenly spaced in rank
+
+        :param      size:  The size of the sample, by default the accuracy of the sketch
+        :type       size:  int
+
+        :returns:   The sample
+        :rtype:     float list
+        """
+        if self._count == 0:
+            return []
+        if size is None:
+            size = min(self._count, self._k)
+        if len(self._compactors) == 1 and size >= self._count:
+            return sorted(self._compactors[0])
+        items = self._weighted()
+        total = sum(weight for _, weight in items)
+        res = []
+        index = 0
+        cumulative = items[0][1]
+        for i in range(size):
+            rank = (i + .5) / size * total
+            while cumulative < rank and index < len(items) - 1:
+                index += 1
+                cumulative += items[index][1]
+            res.append(items[index][0])
+        return res
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 17:02:31
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 17:02:31
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Module listing the experiments of a datas folder
+
+A run is either a folder, datas/<country>/<run>/,
+or an archive, datas/<country>/<run>.tar[.gz|.xz].
+An experiment is a yaml file or its binary version, possibly compressed with gzip or xz.
+Everything is decompressed as it is read, nothing is extracted on the disk.
+"""
+import gzip
+import lzma
+import os
+import re
+import tarfile
+from logging import debug
+from typing import BinaryIO
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+
+from .binary import EXTENSION
+
+
+_DECOMPRESSIONS: Dict[str, Callable[[BinaryIO], BinaryIO]] = {
+    ".gz": lambda file: gzip.GzipFile(fileobj=file, mode="rb"),
+    ".xz": lambda file: lzma.LZMAFile(file, mode="rb")}
+_ARCHIVE = re.compile(r"(\d+)\.tar(?:\.gz|\.xz)?")
+
+
+def kind(name: str) -> Optional[Tuple[str, bool]]:
+    """
+    Get what a file of a run is
+
+    :param      name:  The name of the file
+    :type       name:  str
+
+    :returns:   The name of the experiment, without the extensions, and if it is binary,
+                None if it is not an experiment
+    :rtype:     (str * bool) option
+    """
+    base, compression = os.path.splitext(name)
+    if compression not in _DECOMPRESSIONS:
+        base = name
+    if base.endswith(EXTENSION):
+        return base[:-len(EXTENSION)], True
+    if ".yml" in base:
+        return base[:base.rindex(".yml")], False
+    return None
+
+
+def decompress(file: BinaryIO, name: str) -> BinaryIO:
+    """
+    Decompress a file as it is read, according to its extension
+
+    :param      file:  The file
+    :type       file:  BinaryIO
+    :param      name:  The name of the file
+    :type       name:  str
+
+    :returns:   The decompressed file, the file itself if it is not compressed
+    :rtype:     BinaryIO
+    """
+    compression = os.path.splitext(name)[1]
+    if compression in _DECOMPRESSIONS:
+        return _DECOMPRESSIONS[compression](file)
+    return file
+
+
+def runs(country: str) -> Iterator[Tuple[int, str, float]]:
+    """
+    List the runs of a country, folders or archives
+
+    :param      country:  The folder of the country
+    :type       country:  str
+
+    :returns:   The number, the path and the date of modification of each run
+    :rtype:     (int * str * float) iterator
+    """
+    for run in os.scandir(country):
+        if run.is_dir():
+            yield int(run.name), run.path, run.stat().st_mtime
+        elif (match := _ARCHIVE.fullmatch(run.name)):
+            yield int(match.group(1)), run.path, run.stat().st_mtime
+        else:
+            debug(f"Ignoring file {run.name}, not a run")
+
+
+def _files(run: str) -> Iterator[Tuple[str, BinaryIO]]:
+    if os.path.isdir(run):
+        entries = [entry for entry in os.scandir(run) if not entry.is_dir()]
+        # The date of the newest yaml version of each experiment
+        dates: Dict[str, float] = {}
+        for entry in entries:
+            experiment = kind(entry.name)
+            if experiment is not None and not experiment[1]:
+                dates[experiment[0]] = max(dates.get(experiment[0], 0.), entry.stat().st_mtime)
+
+        def order(entry: os.DirEntry) -> int:
+            experiment = kind(entry.name)
+            if experiment is None or not experiment[1]:
+                return 1
+            # The binary versions first, they are faster to read than the yaml ones,
+            # unless a yaml version was modified since, as in binary.convert
+            return 0 if entry.stat().st_mtime >= dates.get(experiment[0], 0.) else 2
+
+        for entry in sorted(entries, key=order):
+            with open(entry.path, "rb") as file:
+                yield entry.name, file
+    else:
+        # Read as a stream, the members are decompressed in the order of the archive
+        with tarfile.open(run, "r|*") as archive:
+            for member in archive:
+                file = archive.extractfile(member) if member.isfile() else None
+                if file is not None:
+                    yield os.path.basename(member.name), file
+
+
+def experiment_files(run: str) -> Iterator[Tuple[str, bool, BinaryIO]]:
+    """
+    List the experiments of a run, a folder or an archive.
+    The file of an experiment is only valid until the next one is asked.
+    When an experiment is in several files, its binary version is used in a folder
+    unless a yaml version is newer, the first one in an archive.
+
+    :param      run:  The path of the run
+    :type       run:  str
+
+    :returns:   The name of the file, if it is binary and the decompressed file
+                of each experiment
+    :rtype:     (str * bool * BinaryIO) iterator
+    """
+    seen = set()
+    for name, file in _files(run):
+        experiment = kind(name)
+        if experiment is None:
+            debug(f"Ignoring file {name}, not an experiment")
+        elif experiment[0] in seen:
+            debug(f"Ignoring file {name}, the experiment is already read from another file")
+        else:
+            seen.add(experiment[0])
+            with decompress(file, name) as stream:
+                yield name, experiment[1], stream
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 17:24:50
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 17:24:50
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Module for the columnar export of the results
+
+An export is a folder with a NumPy file per column of a long table, one line per value:
+the experiment, its run, its country and its condition, the proxy, the website,
+the metric and the value, and schema.json describing them.
+The text columns hold the index of their value in the categories of the schema,
+-1 if there is none, the missing fields of the conditions are NaN.
+The lines are sorted by metric, proxy and website, in the order of the database otherwise,
+so the values of a metric, a proxy and a website are a slice of the files.
+"""
+import json
+import os
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Tuple
+
+from numpy import flatnonzero
+from numpy import isin
+from numpy import load
+from numpy import ndarray
+from numpy import save
+
+
+VERSION = 1
+SCHEMA = "schema.json"
+
+
+def write(path: str, columns: Dict[str, ndarray], categories: Dict[str, List[str]],
+          schema: Dict[str, Any]):
+    """
+    Write an export
+
+    :param      path:        The folder of the export, created if needed
+    :type       path:        str
+    :param      columns:     The columns, of the same length
+    :type       columns:     dict str * ndarray
+    :param      categories:  The values of the text columns
+    :type       categories:  dict str * (str list)
+    :param      schema:      The rest of the schema, the metrics, the conditions...
+    :type       schema:      dict
+    """
+    os.makedirs(path, exist_ok=True)
+    for name, column in columns.items():
+        save(os.path.join(path, f"{name}.npy"), column)
+    with open(os.path.join(path, SCHEMA), "w", encoding="utf-8") as file:
+        json.dump({"version": VERSION,
+                   "columns": {name: {"dtype": column.dtype.str,
+                                      **({"categories": categories[name]}
+                                         if name in categories else {})}
+                               for name, column in columns.items()},
+                   **schema}, file, indent=1)
+
+
+class Export:
+    """
+    This class describes an export, its files are memory-mapped.
+    """
+    __slots__ = ("_columns", "_schema", "_groups")
+
+    def __init__(self, path: str):
+        """
+        Open an export
+
+        :param      path:  The folder of the export
+        :type       path:  str
+
+        :raises     ValueError:  If the export is of an unknown version
+        """
+        with open(os.path.join(path, SCHEMA), "r", encoding="utf-8") as file:
+            self._schema: Dict[str, Any] = json.load(file)
+        if self._schema.get("version") != VERSION:
+            raise ValueError(f"Unknown version {self._schema.get('version')} of the export, "
+                             + f"version {VERSION} is supported")
+        self._columns: Dict[str, ndarray] = {
+            name: load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in self._schema["columns"]}
+        # metric -> (proxy, website) -> the slice of their lines
+        self._groups: Dict[str, Dict[Tuple[int, int], Tuple[int, int]]] = {}
+
+    def schema(self) -> Dict[str, Any]:
+        """
+        Gets the schema.
+
+        :returns:   The schema
+        :rtype:     dict
+        """
+        return self._schema
+
+    def categories(self, column: str) -> List[str]:
+        """
+        Gets the values of a text column.
+
+        :param      column:  The column
+        :type       column:  str
+
+        :returns:   The values, by their index
+        :rtype:     str list
+        """
+        return self._schema["columns"][column]["categories"]
+
+    def _group(self, metric: str) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        if metric not in self._groups:
+            start, end = self._schema["metrics"][metric]["lines"]
+            proxy = self._columns["proxy"][start:end]
+            website = self._columns["website"][start:end]
+            bounds = [0, *(flatnonzero((proxy[1:] != proxy[:-1])
+                                       | (website[1:] != website[:-1])) + 1).tolist(),
+                      end - start]
+            self._groups[metric] = {(int(proxy[first]), int(website[first])):
+                                        (start + first, start + last)
+                                    for first, last in zip(bounds, bounds[1:]) if first < last}
+        return self._groups[metric]
+
+    def values(self, metric: str, ids: Sequence[int], proxy: int, website: int = -1
+              ) -> ndarray:
+        """
+        Gets the values of a metric, a proxy and a website in some experiments,
+        in the order of the database
+
+        :param      metric:   The metric
+        :type       metric:   str
+        :param      ids:      The experiments
+        :type       ids:      int sequence
+        :param      proxy:    The index of the proxy
+        :type       proxy:    int
+        :param      website:  The index of the website, -1 for the tests without website
+        :type       website:  int
+
+        :returns:   The values, a view of the file if every value is kept,
+                    the integers are exact in its float64
+        :rtype:     ndarray
+        """
+        start, end = self._group(metric).get((proxy, website), (0, 0))
+        values = self._columns["value"][start:end]
+        kept = isin(self._columns["experiment"][start:end], ids)
+        if not kept.all():
+            values = values[kept]
+        return values
+
+    def lines(self, metric: str) -> Tuple[ndarray, ndarray, ndarray, ndarray]:
+        """
+        Gets the lines of a metric
+
+        :param      metric:  The metric
+        :type       metric:  str
+
+        :returns:   The experiment, the index of the proxy, the index of the website
+                    and the value of each line
+        :rtype:     ndarray * ndarray * ndarray * ndarray
+        """
+        start, end = self._schema["metrics"][metric]["lines"]
+        return tuple(self._columns[name][start:end]
+                     for name in ["experiment", "proxy", "website", "value"])
+
+    def count(self, metric: str, ids: Sequence[int], website: int = -1) -> Dict[int, int]:
+        """
+        Count the values of a metric and a website in some experiments, for each proxy
+
+        :param      metric:   The metric
+        :type       metric:   str
+        :param      ids:      The experiments
+        :type       ids:      int sequence
+        :param      website:  The index of the website, -1 for the tests without website
+        :type       website:  int
+
+        :returns:   The number of values by the index of the proxy
+        :rtype:     dict int * int
+        """
+        return {proxy: int(isin(self._columns["experiment"][start:end], ids).sum())
+                for (proxy, site), (start, end) in self._group(metric).items()
+                if site == website}
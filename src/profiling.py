@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 15:40:12
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 15:40:12
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Module for timing the stages of the analysis
+
+When the profiling is disabled, a span is a shared object doing nothing
+and a counter returns immediately, so the instrumentation costs a function call.
+"""
+import json
+from cProfile import Profile
+from logging import info
+from os import sysconf
+from resource import getrusage
+from resource import RUSAGE_SELF
+from time import perf_counter
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+
+_enabled = False
+_profile: Optional[Profile] = None
+_start = 0.
+# name -> [count, total time, maximum time, peak memory]
+_spans: Dict[str, List[float]] = {}
+_counters: Dict[str, int] = {}
+
+
+class _Span:
+    """
+    This class describes a timed span, the time is added to the span of the same name.
+    """
+    __slots__ = ("_name", "_start")
+
+    def __init__(self, name: str):
+        self._name = name
+        self._start = 0.
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        duration = perf_counter() - self._start
+        if self._name not in _spans:
+            _spans[self._name] = [0, 0., 0., 0]
+        stats = _spans[self._name]
+        stats[0] += 1
+        stats[1] += duration
+        stats[2] = max(stats[2], duration)
+        stats[3] = max(stats[3], peak_rss())
+
+
+class _NoSpan:
+    """
+    This class describes a span doing nothing, used when the profiling is disabled.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def enable(profile: bool = False):
+    """
+    Start recording the spans and the counters
+
+    :param      profile:  If we also run cProfile
+    :type       profile:  bool
+    """
+    global _enabled, _profile, _start       # pylint: disable=W0603
+    _enabled = True
+    _start = perf_counter()
+    if profile and _profile is None:
+        _profile = Profile()
+        _profile.enable()
+
+
+def enabled() -> bool:
+    """
+    Determines if the profiling is enabled.
+
+    :returns:   True if enabled, False otherwise.
+    :rtype:     bool
+    """
+    return _enabled
+
+
+def peak_rss() -> int:
+    """
+    Gets the peak resident memory of the process so far.
+
+    :returns:   The peak memory in bytes
+    :rtype:     int
+    """
+    # ru_maxrss is in kilobytes on Linux
+    return getrusage(RUSAGE_SELF).ru_maxrss * 1024
+
+
+def rss() -> int:
+    """
+    Gets the resident memory of the process, the peak one where /proc is missing.
+
+    :returns:   The memory in bytes
+    :rtype:     int
+    """
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as file:
+            return int(file.read().split()[1]) * sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return peak_rss()
+
+
+def span(name: str):
+    """
+    Time a block of code, to be used as a context manager
+
+    :param      name:  The name of the span
+    :type       name:  str
+
+    :returns:   The span
+    :rtype:     context manager
+    """
+    if not _enabled:
+        return _NO_SPAN
+    return _Span(name)
+
+
+def count(name: str, value: int = 1):
+    """
+    Increment a counter
+
+    :param      name:   The name of the counter
+    :type       name:   str
+    :param      value:  The increment
+    :type       value:  int
+    """
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def summary() -> Dict[str, Any]:
+    """
+    Get the timings and the counters recorded so far
+
+    :returns:   The summary
+    :rtype:     dict
+    """
+    return {"wall": perf_counter() - _start if _enabled else 0.,
+            "peak_rss": peak_rss(),
+            "spans": {name: {"count": int(stats[0]),
+                             "total": stats[1],
+                             "mean": stats[1] / stats[0],
+                             "max": stats[2],
+                             "peak_rss": int(stats[3])}
+                      for name, stats in sorted(_spans.items(),
+                                                key=lambda item: -item[1][1])},
+            "counters": dict(sorted(_counters.items()))}
+
+
+def dump(prefix: str):
+    """
+    Write the JSON summary in <prefix>.json and the cProfile statistics in <prefix>.pstats
+
+    :param      prefix:  The prefix of the files
+    :type       prefix:  str
+    """
+    if _profile is not None:
+        _profile.disable()
+        _profile.dump_stats(f"{prefix}.pstats")
+        info(f"Profile written in {prefix}.pstats")
+    with open(f"{prefix}.json", "w", encoding="utf-8") as file:
+        json.dump(summary(), file, indent=2)
+    info(f"Timings written in {prefix}.json")
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 15:49:30
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 15:49:30
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Module for the log of the SQL queries
+"""
+import re
+from logging import warning
+from sqlite3 import Connection
+from sqlite3 import DatabaseError
+from typing import Dict
+from typing import List
+from typing import TextIO
+
+
+DEFAULT_THRESHOLD = 100     # ms
+
+_STRING = re.compile(r"\"[^\"]*\"|'[^']*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?(?![\w.])", re.IGNORECASE)
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*,?\s*\)")
+
+
+def normalize(request: str) -> str:
+    """
+    Get the shape of a query, its literals replaced by ?
+
+    :param      request:  The request
+    :type       request:  str
+
+    :returns:   The shape
+    :rtype:     str
+    """
+    shape = _NUMBER.sub("?", _STRING.sub("?", request))
+    shape = _LIST.sub("(?)", shape)
+    return " ".join(shape.split())
+
+
+def explain(connection: Connection, request: str) -> str:
+    """
+    Get the query plan of a request
+
+    :param      connection:  The connection
+    :type       connection:  Connection
+    :param      request:     The request
+    :type       request:     str
+
+    :returns:   The query plan, one step per line
+    :rtype:     str
+    """
+    try:
+        rows = connection.execute(f"EXPLAIN QUERY PLAN {request}").fetchall()
+    except DatabaseError as err:
+        return f"no query plan: {err}"
+    depth = {0: 0}
+    lines = []
+    for node, parent, _, detail in rows:
+        depth[node] = depth.get(parent, 0) + 1
+        lines.append("  " * depth[node] + detail)
+    return "\n".join(lines)
+
+
+class QueryLog:
+    """
+    This class describes the log of the queries, aggregated by shape.
+    The queries slower than the threshold are logged with their query plan.
+    """
+    _threshold: float
+    # shape -> [count, total time, maximum time]
+    _shapes: Dict[str, List[float]]
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self._threshold = threshold / 1000
+        self._shapes = {}
+
+    def record(self, connection: Connection, request: str, duration: float):
+        """
+        Record the execution of a request
+
+        :param      connection:  The connection, used to get the query plan of a slow request
+        :type       connection:  Connection
+        :param      request:     The request
+        :type       request:     str
+        :param      duration:    The duration in seconds
+        :type       duration:    float
+        """
+        shape = normalize(request)
+        if shape not in self._shapes:
+            self._shapes[shape] = [0, 0., 0.]
+        stats = self._shapes[shape]
+        stats[0] += 1
+        stats[1] += duration
+        stats[2] = max(stats[2], duration)
+        if duration >= self._threshold:
+            warning(f"Slow query ({duration * 1000:.1f} ms): {' '.join(request.split())}\n"
+                    + explain(connection, request))
+
+    def summary(self, top: int = 10) -> str:
+        """
+        Get the table of the query shapes taking the most time
+
+        :param      top:  The number of shapes
+        :type       top:  int
+
+        :returns:   The table
+        :rtype:     str
+        """
+        total = sum(stats[1] for stats in self._shapes.values())
+        lines = [f"{len(self._shapes)} query shapes, "
+                 + f"{sum(int(stats[0]) for stats in self._shapes.values())} queries, "
+                 + f"{total * 1000:.1f} ms",
+                 f"{'total ms':>10} {'%':>6} {'count':>7} {'mean ms':>9} {'max ms':>9}  shape"]
+        for shape, (number, time, maxi) in sorted(self._shapes.items(),
+                                                  key=lambda item: -item[1][1])[:top]:
+            lines.append(f"{time * 1000:10.1f} {100 * time / total if total else 0:6.1f} "
+                         + f"{int(number):7d} {time * 1000 / number:9.2f} {maxi * 1000:9.2f}  "
+                         + shape)
+        return "\n".join(lines)
+
+    def report(self, file: TextIO, top: int = 10):
+        """
+        Write the summary in a file
+
+        :param      file:  The file
+        :type       file:  TextIO
+        :param      top:   The number of shapes
+        :type       top:   int
+        """
+        file.write(self.summary(top) + "\n")
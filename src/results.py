@@ -19,244 +19,431 @@
 """
 Module for the results class
 """
+from __future__ import annotations
+
+import gc
+from array import array
 from logging import debug
 from logging import info
+from logging import warning
 from os import scandir
-from posix import DirEntry
-from sqlite3 import connect
-from sqlite3 import Connection
-from sqlite3 import Cursor
-from sqlite3 import OperationalError
+from typing import BinaryIO
 from typing import Dict
 from typing import Iterable
+from typing import Callable
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import TextIO
 from typing import Tuple
+from typing import TYPE_CHECKING
 from typing import Union
 
 import yaml
-
+from numpy import asarray
+from numpy import concatenate
+from numpy import full
+from numpy import lexsort
+from numpy import nan
+from numpy import ndarray
+from numpy import repeat
+
+from . import binary
+from . import export
 from .config import CONFIG
-from .datas import AnalysedData
-from .datas import AnalysedDataCountryDependent
-from .datas import Data
-from .datas import DataCountryDependent
-from .datas import DataWebsiteDependent
+from .experiments import experiment_files
+from .experiments import runs
+from .datas.sketch import QuantileSketch
 from .loader import Loader
+from .profiling import count
+from .profiling import peak_rss
+from .profiling import rss
+from .profiling import span
+from .storage import ExportStorage
+from .storage import FIELDS
+from .storage import LOOKUPS
+from .storage import open_storage
+from .storage import Storage
 from .types import Connectivity
 from .types import Result
 from .types import Run
 
+if TYPE_CHECKING:
+    from .datas import AnalysedData
+    from .datas import Data
+    from .datas import DataWebsiteDependent
+    from .datas import PlotJob
+
+
+# The variables the metrics can depend on, by their name on the command line
+DEPENDINGS: Dict[str, Union[str, List[str]]] = {"rtt": "rtt",
+                                                "loss": "loss",
+                                                "bandwidth": ["upload", "download"],
+                                                "network": ["technology", "quality"]}
+
+# The memory taken by a value read at once, in the array read and in its cell,
+# and the rows fetched by sqlite3 before
+VALUE_SIZE = 32
+
+
 class Results:
     """
     This class describes the results of several experiments.
     """
-    _connection: Connection
-    _cursor: Cursor
+    _storage: Storage
+    _sketch: Optional[int]
+    _countries: Optional[List[str]]
+    _websites: Optional[List[str]]
+    _low_memory: bool
+    _memory_budget: Optional[int]
+
+    # pylint: disable=R0913
+    def __init__(self, folder: str = "datas", database: str = "tmp",
+                 sketch: Optional[int] = None, ingest: bool = True,
+                 countries: Optional[List[str]] = None, websites: Optional[List[str]] = None,
+                 slow_query: Optional[float] = None, low_memory: bool = False,
+                 memory_budget: Optional[int] = None, packed: bool = False,
+                 storage: Optional[str | Storage] = None, in_memory: bool = False,
+                 checkpoint: Optional[int] = None):
+        self._sketch = sketch
+        self._countries = countries
+        self._websites = websites
+        self._low_memory = low_memory
+        self._memory_budget = memory_budget * 2**20 if memory_budget is not None else None
+
+        if isinstance(storage, Storage):
+            self._storage = storage
+        else:
+            self._storage = open_storage(storage, database=database, packed=packed,
+                                         slow_query=slow_query, in_memory=in_memory,
+                                         checkpoint=checkpoint)
+
+        # A storage forgetting the results has to ingest them every time
+        if ingest or not self._storage.PERSISTENT:
+            self.ingest(folder)
+            self.check_memory("ingest")
+        else:
+            # A database migrated in memory
+            self._storage.save()
+        info("Finished Creating the database")
 
-    def __init__(self, folder: str = "datas", database: str = "tmp"):
-        if database[-3:] != ".db":
-            database += ".db"
+    @classmethod
+    def from_export(cls, path: str, **kwargs) -> Results:
+        """
+        Open an export written by export, without any database.
+        The files are memory-mapped, nothing is ingested.
 
-        info("Creating the database")
-        self._connection = connect(database)
-        self._cursor = self._connection.cursor()
+        :param      path:    The folder of the export
+        :type       path:    str
+        :param      kwargs:  The keywords arguments of the constructor,
+                             except the storage and the ingestion
+        :type       kwargs:  dictionary
 
-        try:
-            self._cursor.execute("""CREATE TABLE conditions(
-                                    id INTEGER PRIMARY KEY NOT NULL,
-                                    upload INTEGER,
-                                    download INTEGER,
-                                    rtt INTEGER,
-                                    loss INTEGER,
-                                    technology TEXT,
-                                    quality TEXT,
-                                    operator TEXT,
-                                    country TEXT
-                                )""")
-        except OperationalError:
-            debug("Table conditions already exists.")
+        :returns:   The results
+        :rtype:     Results
+        """
+        info(f"Opening the export {path}")
+        with span("load export"):
+            return cls(storage=ExportStorage(path), ingest=False, **kwargs)
 
-        try:
-            self._cursor.execute("""CREATE TABLE experiments(
-                                    id INTEGER PRIMARY KEY NOT NULL,
-                                    country char(2) NOT NULL,
-                                    run INTEGER NOT NULL,
-                                    condition INTEGER NOT NULL,
-                                    date REAL NOT NULL,
-                                    FOREIGN KEY(condition) REFERENCES conditions(id)
-                                )""")
-        except OperationalError:
-            debug("Table experiments already exists.")
-
-        for table, conf in CONFIG["tables"].items():
-            columns = [f"{name} {typ}" for name, typ in conf["columns"].items()]
-            if conf["website_dependent"]:
-                columns.append("website TEXT NOT NULL")
-            request = f"""CREATE TABLE {table}(
-                          experimentid INTEGER,
-                          proxy TEXT NOT NULL,
-                          {",".join(columns)},
-                          FOREIGN KEY(experimentid) REFERENCES experiments(id))"""
-            try:
-                self._cursor.execute(request)
-            except OperationalError:
-                debug(f"Table {table} already exists.")
-
-        for country in scandir(folder):
-            if country.is_dir():
-                for run in scandir(country.path):
-                    if run.is_dir():
-                        self._add_run(run, country.name)
-        info("Finished Creating the database")
+    # pylint: disable=R0914
+    def export(self, path: str):
+        """
+        Write the values of every metric in a columnar export, see src/export.py
 
-    def _add_run(self, run: DirEntry, country: str):
-        debug(f"Adding run {int(run.name)} of {country} in the database")
-        dates = self._select(f"""SELECT date FROM experiments
-                                 WHERE country=\"{country}\"
-                                    AND run={int(run.name)}""")
-        new_date = run.stat().st_mtime
+        :param      path:  The folder of the export
+        :type       path:  str
+        """
+        info(f"Exporting the results in {path}")
+        with span("export"):
+            # The index of each id in the categories, the last one stays -1 for the missing ids
+            categories = {}
+            indexes = {}
+            for column, lookup in LOOKUPS.items():
+                names = self._storage.names(lookup)
+                ids = sorted(names)
+                categories[column] = [names[identifier] for identifier in ids]
+                indexes[column] = full(max(ids, default=0) + 2, -1, dtype="<i4")
+                indexes[column][ids] = range(len(ids))
+
+            lines = {"experiment": [], "proxy": [], "website": [], "value": []}
+            metrics = {}
+            start = 0
+            for metric, conf in CONFIG["metrics"].items():
+                table, column = conf["table"], conf["column"]
+                experiment, proxy, website, values = self._storage.lines(table, column)
+                # Stable, the values of a proxy and a website stay in the order of the rows
+                order = lexsort((website, proxy))
+                lines["experiment"].append(experiment[order])
+                lines["proxy"].append(indexes["proxy"][proxy[order]])
+                lines["website"].append(indexes["website"][website[order]])
+                lines["value"].append(values[order])
+                metrics[metric] = {
+                    "type": CONFIG["tables"][table]["columns"][column],
+                    "lines": [start, start + len(values)],
+                    "proxies": self._proxies(metric),
+                    "websites": ([self._storage.name("websites", website)
+                                  for website in self._storage.websites(table)]
+                                 if CONFIG["tables"][table]["website_dependent"] else [])}
+                start += len(values)
+            columns = {name: concatenate(values or [[]]).astype("<f8" if name == "value"
+                                                                else "<i4")
+                       for name, values in lines.items()}
+            categories["metric"] = list(metrics)
+            columns["metric"] = repeat(asarray(range(len(metrics)), dtype="<i4"),
+                                       [end - first for first, end in
+                                        (metric["lines"] for metric in metrics.values())])
+
+            # The country, the run and the fields of the condition of each line,
+            # through arrays indexed by the ids, the last cell is for the missing ones
+            experiments = self._storage.experiment_rows()
+            conditions = self._storage.conditions()
+            by_experiment = {name: full(max((experiment[0] for experiment in experiments),
+                                            default=0) + 2, -1, dtype="<i4")
+                             for name in ["country", "run", "condition"]}
+            for identifier, country, run, condition, _ in experiments:
+                by_experiment["country"][identifier] = indexes["country"][country]
+                by_experiment["run"][identifier] = run
+                by_experiment["condition"][identifier] = condition
+            columns["country"] = by_experiment["country"][columns["experiment"]]
+            columns["run"] = by_experiment["run"][columns["experiment"]]
+            condition = by_experiment["condition"][columns["experiment"]]
+            size = max((condition["id"] for condition in conditions), default=0) + 2
+            for field in FIELDS:
+                name = "condition_country" if field == "country" else field
+                if field in ["upload", "download", "rtt", "loss"]:
+                    by_condition = full(size, nan, dtype="<f8")
+                    for line in conditions:
+                        if line[field] is not None:
+                            by_condition[line["id"]] = line[field]
+                else:
+                    categories[name] = sorted({line[field] for line in conditions
+                                               if line[field] is not None})
+                    by_condition = full(size, -1, dtype="<i4")
+                    for line in conditions:
+                        if line[field] is not None:
+                            by_condition[line["id"]] = categories[name].index(line[field])
+                columns[name] = by_condition[condition]
+
+            export.write(path, columns, categories, {
+                "metrics": metrics,
+                "conditions": {"columns": ["id", *FIELDS],
+                               "rows": [[line["id"], *(line[field] for field in FIELDS)]
+                                        for line in conditions]},
+                "experiments": {"columns": ["id", "country", "run", "condition", "date"],
+                                "rows": [[experiment[0],
+                                          int(indexes["country"][experiment[1]]),
+                                          *experiment[2:]]
+                                         for experiment in experiments]}})
+        info(f"{len(columns['value'])} values exported in {path}")
+
+    def check_memory(self, stage: str):
+        """
+        Report the peak memory after a stage.
+        If it is over the budget, the garbage is collected and a warning is logged.
+
+        :param      stage:  The stage
+        :type       stage:  str
+        """
+        peak = peak_rss()
+        info(f"Peak memory after {stage}: {peak / 2**20:.0f} MB")
+        if self._memory_budget is not None and peak > self._memory_budget:
+            gc.collect()
+            warning(f"Peak memory after {stage} ({peak / 2**20:.0f} MB) "
+                    + f"is over the budget of {self._memory_budget / 2**20:.0f} MB")
+
+    def _over_budget(self, experiments: Dict[int, List[int]], metric: str) -> bool:
+        """
+        Determines if the values of a metric, read at once, would go over the memory budget.
+        The values are counted, not read.
+
+        :param      experiments:  The experiments
+        :type       experiments:  dict int * int list
+        :param      metric:       The metric
+        :type       metric:       str
+
+        :returns:   True if there is a budget and it would be exceeded, False otherwise.
+        :rtype:     bool
+        """
+        if self._memory_budget is None:
+            return False
+        websites = ([None]
+                    if not CONFIG["tables"][CONFIG["metrics"][metric]["table"]]["website_dependent"]
+                    else list(self._get_websites(metric).values()))
+        values = sum(sum(self._count(metric, ids, website).values())
+                     for ids in experiments.values() for website in websites)
+        estimate = values * VALUE_SIZE
+        if rss() + estimate <= self._memory_budget:
+            return False
+        info(f"Streaming {metric}: its {values} values would take about "
+             + f"{estimate / 2**20:.0f} MB, over the budget of "
+             + f"{self._memory_budget / 2**20:.0f} MB")
+        return True
+
+    def report_queries(self, file: TextIO, top: int = 10):
+        """
+        Write the query shapes taking the most time,
+        only if the queries are logged.
+
+        :param      file:  The file
+        :type       file:  TextIO
+        :param      top:   The number of shapes
+        :type       top:   int
+        """
+        self._storage.report_queries(file, top)
+
+    def ingest(self, folder: str = "datas"):
+        """
+        Add the runs of the folder to the database,
+        the runs already in the database and not modified since are ignored.
+        Only the selected countries are added.
+        At the end, the storage is saved if it is in memory.
+
+        :param      folder:  The folder
+        :type       folder:  str
+        """
+        info(f"Adding the datas of {folder}")
+        with span("ingest"):
+            for country in scandir(folder):
+                if (country.is_dir()
+                    and (self._countries is None or country.name in self._countries)):
+                    for run, path, date in runs(country.path):
+                        self._add_run(run, path, date, country.name)
+            self._storage.save()
+
+    def _add_run(self, run: int, path: str, new_date: float, country: str):
+        debug(f"Adding run {run} of {country} in the database")
+        country_id = self._storage.identifier("countries", country)
+        dates = self._storage.run_dates(country_id, run)
         modified = not dates
         for date in dates:
             if date < new_date:
                 modified = True
 
         if modified:
-            for table in CONFIG["tables"]:
-                self._cursor.execute(f"""DELETE FROM {table}
-                                         WHERE experimentid IN (SELECT id FROM experiments
-                                                                WHERE country=\"{country}\"
-                                                                    AND run={int(run.name)})""")
-            self._cursor.execute(f"""DELETE FROM experiments
-                                     WHERE country=\"{country}\" AND run={int(run.name)}""")
-            for experiment in scandir(run.path):
-                if ".yml" in experiment.name:
-                    debug(f"Adding experiment {experiment.name}")
-                    self._add_experiment(experiment, country, int(run.name), new_date)
-                else:
-                    debug(f"Ignoring file {experiment.name}, not a yaml file")
+            self._storage.delete_run(country_id, run)
+            for name, is_binary, file in experiment_files(path):
+                debug(f"Adding experiment {name}")
+                self._add_experiment(name, is_binary, file, country, run, new_date)
         else:
-            debug(f"Ignoring run {int(run.name)} of {country}, already in the database")
-
-    def _add_experiment(self, experiment: DirEntry, country: str, run: int, date: float):
-        condition = self._add_conditon(experiment.name)
-        experiment_id = self._select(f"""INSERT INTO experiments (country, run, condition, date)
-                                                 VALUES (\"{country}\", {run}, {condition}, {date})
-                                                 RETURNING id""")
-        assert len(experiment_id) == 1
-        assert isinstance(experiment_id[0], int)
-
-        with open(experiment.path, 'r', encoding='utf-8') as file:
-            data = yaml.load(file.read(), Loader=Loader)
+            debug(f"Ignoring run {run} of {country}, already in the database")
+
+    # pylint: disable=R0913
+    def _add_experiment(self, name: str, is_binary: bool, file: BinaryIO, country: str,
+                        run: int, date: float):
+        condition = self._add_conditon(name)
+        experiment_id = self._storage.add_experiment(self._storage.identifier("countries",
+                                                                              country),
+                                                     run, condition, date)
+
+        if is_binary:
+            with span("ingest: load binary"):
+                data = binary.loads(file.read())
+            count("binary files loaded")
+        else:
+            # The file is parsed as it is read, it is never entirely in memory
+            with span("ingest: parse yaml"):
+                data = yaml.load(file, Loader=Loader)
+            count("yaml files parsed")
 
-        for table in CONFIG["tables"]:
-            try:
-                self._insert(data[table], table, experiment_id[0])
-            except KeyError:
-                info(f"Experiment {country}/{run}/{experiment} does not contains test {table}")
+        with span("ingest: insert"):
+            for table in CONFIG["tables"]:
+                try:
+                    self._insert(data[table], table, experiment_id)
+                except KeyError:
+                    info(f"Experiment {country}/{run}/{name} does not contains test {table}")
 
-        self._connection.commit()
+        self._storage.commit()
 
     def _add_conditon(self, values: str) -> int:
         data = values.split(" ")
         try:
-            upload = int(data[0])//1000
-            download = int(data[1])//1000
-            rtt = int(data[2])
-            loss = int(data[3])
-            condition = self._select(f"""SELECT id FROM conditions
-                                                WHERE upload={upload}
-                                                    AND download={download}
-                                                    AND rtt={rtt}
-                                                    AND loss={loss}""")
-            if not condition:
-                condition = self._select(f"""INSERT INTO conditions (upload, download,
-                                                                            rtt, loss)
-                                                    VALUES ({upload}, {download}, {rtt}, {loss})
-                                                    RETURNING id""")
+            return self._storage.add_condition({"upload": int(data[0])//1000,
+                                                "download": int(data[1])//1000,
+                                                "rtt": int(data[2]),
+                                                "loss": int(data[3])})
         except ValueError:
-            technology = data[0]
-            quality = data[1]
-            _country = data[2]
-            operator = data[3]
-
             # Ignore operator, not needed at the time
-            if operator != "universal":
-                operator = "universal"
-            condition = self._select(f"""SELECT id FROM conditions
-                                                WHERE technology=\"{technology}\"
-                                                    AND quality=\"{quality}\"
-                                                    AND operator=\"{operator}\"
-                                                    AND country=\"{_country}\"""")
-            if not condition:
-                condition = self._select(f"""INSERT INTO conditions (technology, quality,
-                                                                            operator, country)
-                                                    VALUES (\"{technology}\",\"{quality}\",
-                                                            \"{operator}\", \"{_country}\")
-                                                    RETURNING id""")
-        assert len(condition) == 1
-        assert isinstance(condition[0], int)
-        return condition[0]
-
-    def _select(self, request: str) -> List:
-        try:
-            res = []
-            for line in self._cursor.execute(request).fetchall():
-                if line is not None:
-                    if len(line) == 1:
-                        if line[0] is not None:
-                            res.append(line[0])
-                    else:
-                        res.append([value for value in line if value is not None])
-            return res
-        except OperationalError:
-            debug(f"An error occured while executing this resquest: {request}")
-            raise
+            return self._storage.add_condition({"technology": data[0],
+                                                "quality": data[1],
+                                                "operator": "universal",
+                                                "country": data[2]})
 
     def _insert(self, data: Result, table:str, experiment_id: int):
-        def aux(metrics: list, values: list, test: Run, table: str):
-            constant_field = len(metrics)
-            for metric, data in CONFIG["metrics"].items():
-                if data["table"] == table:
-                    metrics.append(data["column"])
-                    if CONFIG["tables"][table]["columns"][metrics[-1]] == "TEXT":
-                        values.append(f"\"{test.get_metric(metric)}\"")
-                    else:
-                        values.append(test.get_metric(metric))
-            if (isinstance(values[constant_field], Iterable)
-                and not isinstance(values[constant_field], str)):
-                maxi = max(len(metric) for metric in values[constant_field:])
-                for metric in values[constant_field:]:
-                    metric.extend(["NULL"]*(maxi - len(metric)))
-                for i in range(maxi):
-                    val = (values[:constant_field]
-                           + [str(metric[i]) for metric in values[constant_field:]])
-                    if any(v!= 'NULL' for v in val[constant_field:]):
-                        self._cursor.execute(f"""INSERT INTO {table} ({", ".join(metrics)})
-                                                 VALUES ({", ".join(val)})""")
-            else:
-                if any(v!= 'NULL' for v in values[constant_field:]):
-                    self._cursor.execute(f"""INSERT INTO {table} ({", ".join(metrics)})
-                                             VALUES ({", ".join([str(val) for val in values])})""")
+        def aux(tests: Iterable[Run]) -> Dict[str, List]:
+            # The values measured together are at the same index, a missing one is None
+            values = {column: [] for column in columns}
+            for test in tests:
+                metrics = {}
+                for column, metric in columns.items():
+                    value = test.get_metric(metric)
+                    metrics[column] = (list(value) if (isinstance(value, Iterable)
+                                                       and not isinstance(value, str))
+                                       else [value])
+                length = max(len(metric) for metric in metrics.values())
+                for column, metric in metrics.items():
+                    values[column].extend(None if value == "NULL" else value for value in metric)
+                    values[column].extend([None] * (length - len(metric)))
+            return values
+
+        columns = {conf["column"]: metric for metric, conf in CONFIG["metrics"].items()
+                   if conf["table"] == table}
         for field in data.get_fields():
+            proxy = self._storage.identifier("proxies", field)
             if CONFIG["tables"][table]["website_dependent"]:
                 field_data = data.get_field(field)
                 assert isinstance(field_data, dict)
                 for website, test in field_data.items():
-                    metrics = ["experimentid", "proxy", "website"]
-                    values = [str(experiment_id), f"\"{field}\"", f"\"{website}\""]
-                    aux(metrics, values, test, table)
+                    self._storage.insert(table, experiment_id, proxy,
+                                         self._storage.identifier("websites", website),
+                                         aux([test]))
             else:
-                for test in data.get_field(field):
-                    metrics = ["experimentid", "proxy"]
-                    values = [str(experiment_id), f"\"{field}\""]
-                    aux(metrics, values, test, table)
+                self._storage.insert(table, experiment_id, proxy, None,
+                                     aux(data.get_field(field)))
+
+    # pylint: disable=R0913
+    def plot(self, full: bool = False, country_dependent: bool = False,
+             website_dependent: bool = False, jobs: int = 1, force: bool = False,
+             metrics: Optional[List[str]] = None, dependings: Optional[List[str]] = None
+            ) -> List[Tuple[PlotJob, BaseException]]:
+        """
+        Plot all the metrics for all the scenarii
+
+        :param      full:               If we want a full or only specific plot
+        :type       full:               bool
+        :param      country_dependent:  If it is not a full does we want the country dependent plot
+        :type       country_dependent:  bool
+        :param      website_dependent:  If it is not a full does we want the website dependent plot
+        :type       website_dependent:  bool
+        :param      jobs:               The number of process rendering the plots
+        :type       jobs:               int
+        :param      force:              If we render the plots even if they are up to date
+        :type       force:              bool
+        :param      metrics:            The metrics, all of them if None
+        :type       metrics:            str list
+        :param      dependings:         The names of the dependings, all of them if None
+        :type       dependings:         str list
+
+        :returns:   The jobs that failed with their error
+        :rtype:     (PlotJob * BaseException) list
+        """
+        # pylint: disable=C0415
+        from .datas import render_plots
+        errors = render_plots(self.plot_jobs(full, country_dependent, website_dependent, force,
+                                             metrics, dependings),
+                              jobs)
+        # Once every render is done, even in the other processes
+        self.check_memory("plotting")
+        return errors
 
     # pylint: disable=R1702
-    def plot(self, full: bool = False,
-             country_dependent: bool = False, website_dependent: bool = False):
+    def plot_jobs(self, full: bool = False, country_dependent: bool = False,
+                  website_dependent: bool = False, force: bool = False,
+                  metrics: Optional[List[str]] = None, dependings: Optional[List[str]] = None
+                 ) -> Iterator[PlotJob]:
         """
-        Plot all the metrics for all the scenarii
+        Generate the jobs to plot all the metrics for all the scenarii.
+        The datas are fetched as the jobs are consumed.
 
         :param      full:               If we want a full or only specific plot
         :type       full:               bool
@@ -264,23 +451,39 @@ class Results:
         :type       country_dependent:  bool
         :param      website_dependent:  If it is not a full does we want the website dependent plot
         :type       website_dependent:  bool
+        :param      force:              If we create the jobs even for the plots up to date
+        :type       force:              bool
+        :param      metrics:            The metrics, all of them if None
+        :type       metrics:            str list
+        :param      dependings:         The names of the dependings, all of them if None
+        :type       dependings:         str list
+
+        :returns:   The plot jobs
+        :rtype:     PlotJob iterator
         """
-        for depending in ['rtt', 'loss', ['upload', 'download'], ['technology', 'quality']]:
+        for key, depending in DEPENDINGS.items():
+            if dependings is not None and key not in dependings:
+                continue
             info(f"Plotting depending on: {depending}")
+            selected = [metric for metric in CONFIG['metrics']
+                        if metrics is None or metric in metrics]
             if full:
                 for country_dep in [True, False]:
-                    for metric in CONFIG['metrics']:
+                    for metric in selected:
                         info(f"Plotting: {CONFIG['metrics'][metric]['name']}")
                         if CONFIG["tables"][CONFIG['metrics'][metric]['table']
                                            ]['website_dependent']:
                             for website_dep in [True, False]:
-                                self.plot_metric(metric, depending, country_dep, website_dep)
+                                yield from self.plot_metric_jobs(metric, depending,
+                                                                 country_dep, website_dep, force)
                         else:
-                            self.plot_metric(metric, depending, country_dep)
+                            yield from self.plot_metric_jobs(metric, depending, country_dep,
+                                                             force=force)
             else:
-                for metric in CONFIG['metrics']:
+                for metric in selected:
                     info(f"Plotting: {CONFIG['metrics'][metric]['name']}")
-                    self.plot_metric(metric, depending, country_dependent, website_dependent)
+                    yield from self.plot_metric_jobs(metric, depending, country_dependent,
+                                                     website_dependent, force)
 
     def print_analyse(self, country_dependent: bool = False,
                       detailed: bool = False, **kwargs) -> Dict[str, str]:
@@ -297,16 +500,50 @@ class Results:
         :returns:   A dict of conditions and analyse results
         :rtype:     Dict str * str
         """
-        res = {}
-        value, conditions = self.analyse(country_dependent, **kwargs)
-        for depending, datas in value.items():
+        return dict(self.iter_analyse(country_dependent, detailed, **kwargs))
+
+    def iter_analyse(self, country_dependent: bool = False,
+                     detailed: bool = False, **kwargs) -> Iterator[Tuple[str, str]]:
+        """
+        Generate the heading and the LaTeX table of the analyse,
+        as soon as each depending is analysed.
+
+        :param      country_dependent:  The country dependent
+        :type       country_dependent:  bool
+        :param      detailed:           Indicates if we print the error instead of the arrow
+        :type       detailed:           bool
+        :param      kwargs:             The keywords arguments of analyse
+        :type       kwargs:             dictionary
+
+        :returns:   The headings and tables
+        :rtype:     (str * str) iterator
+        """
+        for depending, datas, conditions in self.iter_analysed(country_dependent, **kwargs):
             # pylint: disable=C2801
-            res[f"{depending} with {conditions[depending]}"] = datas.__str__(detailed=detailed)
-        return res
+            yield f"{depending} with {conditions}", datas.__str__(detailed=detailed)
 
+    def write_analyse(self, file: TextIO, country_dependent: bool = False,
+                      detailed: bool = False, **kwargs):
+        """
+        Write the analyse in a file, flushing each table as soon as it is computed,
+        so an interrupted run still leaves a usable partial report.
+
+        :param      file:               The file
+        :type       file:               TextIO
+        :param      country_dependent:  The country dependent
+        :type       country_dependent:  bool
+        :param      detailed:           Indicates if we print the error instead of the arrow
+        :type       detailed:           bool
+        :param      kwargs:             The keywords arguments of analyse
+        :type       kwargs:             dictionary
+        """
+        for heading, table in self.iter_analyse(country_dependent, detailed, **kwargs):
+            file.write(heading)
+            file.write(table)
+            file.flush()
 
     def analyse(self, country_dependent: bool = False, test_type: str = "all",
-                metrics: Optional[List[str]] = None
+                metrics: Optional[List[str]] = None, dependings: Optional[List[str]] = None
                ) -> Tuple[Dict[str, AnalysedData], Dict[str, str]]:
         """
         Compare the different scenarios
@@ -315,28 +552,60 @@ class Results:
         :type       country_dependent:  bool
         :param      test_type:          The test type
         :type       test_type:          str
+        :param      metrics:            The metrics, all of them if None
+        :type       metrics:            str list
+        :param      dependings:         The names of the dependings, all of them if None
+        :type       dependings:         str list
 
         :returns:   A dict of the analysed data with the coresponding conditions
         :rtype:     Dict (str * AnalysedData) * Dict(str * str)
         """
         res = {}
         conditions = {}
-        for depending in ['rtt', 'loss', ['upload', 'download'], ['technology', 'quality']]:
+        for depending, datas, condition in self.iter_analysed(country_dependent, test_type,
+                                                              metrics, dependings):
+            res[depending] = datas
+            conditions[depending] = condition
+        return res, conditions
+
+    def iter_analysed(self, country_dependent: bool = False, test_type: str = "all",
+                      metrics: Optional[List[str]] = None, dependings: Optional[List[str]] = None
+                     ) -> Iterator[Tuple[str, AnalysedData, str]]:
+        """
+        Compare the different scenarios, one depending at a time
+
+        :param      country_dependent:  The country dependent
+        :type       country_dependent:  bool
+        :param      test_type:          The test type
+        :type       test_type:          str
+        :param      metrics:            The metrics, all of them if None
+        :type       metrics:            str list
+        :param      dependings:         The names of the dependings, all of them if None
+        :type       dependings:         str list
+
+        :returns:   The depending with its analysed data and the coresponding conditions
+        :rtype:     (str * AnalysedData * str) iterator
+        """
+        # pylint: disable=C0415
+        from .datas import AnalysedData
+        from .datas import AnalysedDataCountryDependent
+        for key, depending in DEPENDINGS.items():
+            if dependings is not None and key not in dependings:
+                continue
             info(f"Analysing depending on: {depending}")
             if country_dependent:
-                res[str(depending)] = AnalysedDataCountryDependent()
+                res = AnalysedDataCountryDependent()
             else:
-                res[str(depending)] = AnalysedData()
+                res = AnalysedData()
+            conditions = ""
             for metric in CONFIG['metrics']:
                 if metrics is None or metric in metrics:
                     info(f"Analysing: {CONFIG['metrics'][metric]['name']}")
-                    datas, conditions[str(depending)] = self.analyse_metric(metric,
-                                                                            depending,
-                                                                            country_dependent,
-                                                                            test_type)
-                    res[str(depending)].insert(-1, CONFIG["metrics"][metric]["name_short"], datas)
-        return res, conditions
-
+                    datas, conditions = self.analyse_metric(metric, depending,
+                                                            country_dependent, test_type)
+                    res.insert(-1, CONFIG["metrics"][metric]["name_short"], datas)
+            self.check_memory(f"analysing depending on {depending}")
+            yield str(depending), res, conditions
 
     def analyse_metric(self, metric: str, depending: Union[List[str],str],
                        country_dependent: bool = False, test_type: str = "t-test"
@@ -357,7 +626,8 @@ class Results:
         :rtype:     AnalysedData * str
         """
         datas, conditions = self.get_metric(metric, depending, country_dependent)
-        return datas.analyse(test_type), conditions
+        with span(f"analyse: {metric} depending on {depending}"):
+            return datas.analyse(test_type), conditions
 
     def get_metric(self, metric: str, depending: Union[List[str],str],
                    country_dependent: bool = False, website_dependent: bool = False
@@ -379,6 +649,14 @@ class Results:
 
         :raises     AssertionError:     Wrong usage of the method
         """
+        with span(f"query: {metric} depending on {depending}"):
+            return self._get_metric(metric, depending, country_dependent, website_dependent)
+
+    def _get_metric(self, metric: str, depending: Union[List[str],str],
+                    country_dependent: bool = False, website_dependent: bool = False
+                   ) -> Tuple[Data, str]:
+        # pylint: disable=C0415
+        from .datas import DataCountryDependent
         experiments, conditions = self.get_experiment(depending, country_dependent)
         if isinstance(depending, str):
             depending = [depending]
@@ -408,8 +686,10 @@ class Results:
         data.set_name(name)
         return data, conditions
 
+    # pylint: disable=R0913
     def plot_metric(self, metric: str, depending: Union[List[str],str],
-                    country_dependent: bool = False, website_dependent: bool = False):
+                    country_dependent: bool = False, website_dependent: bool = False,
+                    jobs: int = 1, force: bool = False) -> List[Tuple[PlotJob, BaseException]]:
         """
         Plot the graph(s) corresponding to the metrics
 
@@ -421,11 +701,46 @@ class Results:
         :type       country_dependent:  bool
         :param      website_dependent:  The website dependent
         :type       website_dependent:  bool
+        :param      jobs:               The number of process rendering the plots
+        :type       jobs:               int
+        :param      force:              If we render the plots even if they are up to date
+        :type       force:              bool
+
+        :returns:   The jobs that failed with their error
+        :rtype:     (PlotJob * BaseException) list
+
+        :raises     AssertionError:     Wrong usage of the method
+        """
+        # pylint: disable=C0415
+        from .datas import render_plots
+        return render_plots(self.plot_metric_jobs(metric, depending, country_dependent,
+                                                  website_dependent, force), jobs)
+
+    def plot_metric_jobs(self, metric: str, depending: Union[List[str],str],
+                         country_dependent: bool = False, website_dependent: bool = False,
+                         force: bool = False) -> List[PlotJob]:
+        """
+        Create the jobs to plot the graph(s) corresponding to the metrics
+
+        :param      metric:             The metric
+        :type       metric:             str
+        :param      depending:          The depending
+        :type       depending:          str list | str
+        :param      country_dependent:  The country dependent
+        :type       country_dependent:  bool
+        :param      website_dependent:  The website dependent
+        :type       website_dependent:  bool
+        :param      force:              If we create the jobs even for the plots up to date
+        :type       force:              bool
+
+        :returns:   The plot jobs
+        :rtype:     PlotJob list
 
         :raises     AssertionError:     Wrong usage of the method
         """
         data, conditions = self.get_metric(metric, depending, country_dependent, website_dependent)
-        data.plot(metric, depending, conditions)
+        with span(f"plot statistics: {metric} depending on {depending}"):
+            return data.plot_jobs(metric, depending, conditions, force=force)
 
     # pylint: disable=R0912
     def get_data(self, experiments: Dict[int,List[int]],
@@ -446,26 +761,31 @@ class Results:
 
         :raises     ValueError:         Wrong parameters
         """
+        # pylint: disable=C0415
+        from .datas import Data
+        from .datas import DataWebsiteDependent
         metric = metric.lower()
         table = CONFIG["metrics"][metric]["table"]
 
-        column = CONFIG["metrics"][metric]["column"]
+        proxies = self._proxies(metric)
 
-        proxies = self._select(f"SELECT DISTINCT(proxy) FROM {table}")
+        if self._sketch is not None:
+            sketch = self._sketch
+            return self._get_streamed_data(experiments, metric, proxies,
+                                           lambda: QuantileSketch(sketch), website_dependent)
+        if self._low_memory or self._over_budget(experiments, metric):
+            return self._get_streamed_data(experiments, metric, proxies,
+                                           lambda: array('d'), website_dependent)
 
         data = {}
 
         if not CONFIG["tables"][table]["website_dependent"]:
 
             for condition, ids in experiments.items():
-                request = f"""SELECT {column} FROM {table}
-                              WHERE proxy=\"%s\"
-                                AND experimentid {f'= {ids[0]}' if len(ids) == 1
-                                                  else f'IN {tuple(ids)}'}"""
                 data[condition] = {}
                 for proxy in proxies:
-                    data[condition][proxy] = self._select(request % proxy)
-                    if data[condition][proxy] == []:
+                    data[condition][proxy] = self._values(metric, ids, proxy)
+                    if len(data[condition][proxy]) == 0:
                         del data[condition][proxy]
                 if "masquerade" not in data[condition] or "native" not in data[condition]:
                     del data[condition]
@@ -475,21 +795,17 @@ class Results:
                         del data[condition]
                     else:
                         for proxy in data[condition]:
-                            data[condition][proxy] = data[condition][proxy][:mini]
+                            data[condition][proxy] = self._cell(data[condition][proxy][:mini])
             return Data(data).transpose()
 
-        for website in self._select(f"SELECT DISTINCT(website) FROM {table}"):
+        for website, website_id in self._get_websites(metric).items():
             data[website] = {}
             mini = None
             for condition, ids in experiments.items():
-                request = f"""SELECT {column} FROM {table}
-                                  WHERE proxy=\"%s\" AND website=\"{website}\"
-                                        AND {column} IS NOT NULL
-                                        AND experimentid {f'= {ids[0]}' if len(ids) == 1
-                                                          else f'IN {tuple(ids)}'}"""
                 data[website][condition] = {}
                 for proxy in proxies:
-                    data[website][condition][proxy] = self._select(request % proxy)
+                    data[website][condition][proxy] = self._values(
+                        metric, ids, proxy, website_id)
                     mini = (len(data[website][condition][proxy]) if mini is None
                             else min(mini, len(data[website][condition][proxy])))
             # Strengthening the datas,
@@ -500,7 +816,10 @@ class Results:
             else:
                 for condition in experiments:
                     for proxy in proxies:
-                        data[website][condition][proxy] = data[website][condition][proxy][:mini]
+                        values = data[website][condition][proxy][:mini]
+                        # Else the websites are concatenated in the cells after
+                        data[website][condition][proxy] = (self._cell(values)
+                                                           if website_dependent else values)
 
         if website_dependent:
             return DataWebsiteDependent({website: Data(value) for website, value in data.items()}
@@ -509,9 +828,117 @@ class Results:
         for condition in experiments:
             ret[condition] = {}
             for proxy in proxies:
-                ret[condition][proxy] = []
-                for _, website in data.items():
-                    ret[condition][proxy].extend(website[condition][proxy])
+                ret[condition][proxy] = self._cell(concatenate(
+                    [website[condition][proxy] for website in data.values()] or [[]]))
+        return Data(ret).transpose()
+
+    def _proxies(self, metric: str) -> List[str]:
+        return [self._storage.name("proxies", proxy)
+                for proxy in self._storage.proxies(CONFIG["metrics"][metric]["table"])]
+
+    def _get_websites(self, metric: str) -> Dict[str, int]:
+        websites = {self._storage.name("websites", website): website
+                    for website in self._storage.websites(CONFIG["metrics"][metric]["table"])}
+        if self._websites is None:
+            return websites
+        return {website: website_id for website, website_id in websites.items()
+                if website in self._websites}
+
+    def _country_ids(self) -> Optional[List[int]]:
+        if self._countries is None:
+            return None
+        ids = {name: identifier for identifier, name in self._storage.names("countries").items()}
+        return [ids[country] for country in self._countries if country in ids]
+
+    @staticmethod
+    def _cell(values: ndarray) -> array:
+        # Copied at once from the buffer, as the cells of the low memory mode
+        return array('d', asarray(values, dtype="<f8").tobytes())
+
+    def _values(self, metric: str, ids: List[int], proxy: str, website: Optional[int] = None
+               ) -> ndarray:
+        return self._storage.values(CONFIG["metrics"][metric]["table"],
+                                    CONFIG["metrics"][metric]["column"], ids,
+                                    self._storage.identifier("proxies", proxy), website)
+
+    def _count(self, metric: str, ids: List[int], website: Optional[int] = None
+              ) -> Dict[str, int]:
+        return {self._storage.name("proxies", proxy): count for proxy, count
+                in self._storage.count(CONFIG["metrics"][metric]["table"],
+                                       CONFIG["metrics"][metric]["column"], ids,
+                                       website).items()}
+
+    # pylint: disable=R0913
+    def _stream(self, metric: str, ids: List[int], proxy: str, website: Optional[int],
+                limit: int, cell: QuantileSketch | array) -> QuantileSketch | array:
+        return self._storage.stream(CONFIG["metrics"][metric]["table"],
+                                    CONFIG["metrics"][metric]["column"], ids,
+                                    self._storage.identifier("proxies", proxy), website, limit,
+                                    cell)
+
+    # pylint: disable=R0913,R0914
+    def _get_streamed_data(self, experiments: Dict[int,List[int]], metric: str,
+                           proxies: List[str], new: Callable[[], QuantileSketch | array],
+                           website_dependent: bool = False) -> Data | DataWebsiteDependent:
+        """
+        Gets the data, streaming the values from the database into compact cells,
+        quantile sketches or arrays of floats.
+        The values are counted first, so only the ones kept are read.
+        It selects the same values than the exact mode.
+
+        :param      experiments:        The experiments
+        :type       experiments:        dict int * int list
+        :param      metric:             The metric
+        :type       metric:             str
+        :param      proxies:            The proxies
+        :type       proxies:            str list
+        :param      new:                The constructor of an empty cell
+        :type       new:                () -> QuantileSketch | array
+        :param      website_dependent:  The website dependent
+        :type       website_dependent:  bool
+
+        :returns:   The data.
+        :rtype:     Data | DataWebsiteDependent
+        """
+        # pylint: disable=C0415
+        from .datas import Data
+        from .datas import DataWebsiteDependent
+        data = {}
+
+        if not CONFIG["tables"][CONFIG["metrics"][metric]["table"]]["website_dependent"]:
+            for condition, ids in experiments.items():
+                counts = self._count(metric, ids)
+                counts = {proxy: count for proxy, count in counts.items() if count}
+                if "masquerade" not in counts or "native" not in counts:
+                    continue
+                mini = min(counts.values())
+                data[condition] = {
+                    proxy: self._stream(metric, ids, proxy, None, mini,
+                                        new())
+                    for proxy in counts}
+            return Data(data).transpose()
+
+        ret = {condition: {proxy: new() for proxy in proxies} for condition in experiments}
+        for website, website_id in self._get_websites(metric).items():
+            counts = {}
+            for condition, ids in experiments.items():
+                counts[condition] = self._count(metric, ids, website_id)
+            mini = min((counts[condition].get(proxy, 0)
+                        for condition in experiments for proxy in proxies), default=0)
+            if mini == 0:
+                continue
+            if website_dependent:
+                data[website] = {condition: {proxy: new() for proxy in proxies}
+                                 for condition in experiments}
+            for condition, ids in experiments.items():
+                for proxy in proxies:
+                    # Without the website dependence, the values are added to the global cell
+                    self._stream(metric, ids, proxy, website_id, mini,
+                                 (data[website] if website_dependent else ret)[condition][proxy])
+
+        if website_dependent:
+            return DataWebsiteDependent({website: Data(value) for website, value in data.items()}
+                ).transpose()
         return Data(ret).transpose()
 
     # pylint: disable=R0912,R0914
@@ -538,61 +965,51 @@ class Results:
         depending = [x.lower() for x in depending]
         match depending[0]:
             case "upload" | "download" | "rtt" | "loss":
-                condition_str = ("technology IS NULL AND quality IS NULL "
-                                 + "AND country IS NULL and operator IS NULL")
                 group_by = ["upload", "download", "rtt", "loss"]
             case "technology" | "quality" | "country" | "operator":
-                condition_str = ("upload IS NULL AND download IS NULL "
-                                 + "AND rtt IS NULL and loss IS NULL")
                 group_by = ["technology", "quality", "country", "operator"]
             case _:
                 raise ValueError(f"Unknown depending: {depending[0]}")
+        # The fields of the other family are missing
+        family = [field for field in FIELDS if field not in group_by]
         for column in depending:
             group_by.remove(column)
 
-
-        request = f"""SELECT {','.join(group_by)}
-                      FROM (SELECT COUNT(*) as tmp, {','.join(group_by)}
-                            FROM conditions
-                            WHERE {condition_str}
-                            GROUP BY {','.join(group_by)})
-                      WHERE tmp > 1"""
-        conditions = self._select(request)
-        ids = []
-        for condition in conditions:
-            request = f"""SELECT id FROM conditions
-                          WHERE ({','.join(group_by)}) ==
-                            ({','.join([f'"{v}"' if isinstance(v, str) else str(v)
-                                        for v in condition])})"""
-            ids.append(self._select(request))
-        if not ids:
+        groups = {}
+        for condition in self._storage.conditions():
+            if all(condition[field] is None for field in family):
+                groups.setdefault(tuple(condition[field] for field in group_by),
+                                  []).append(condition)
+        groups = {key: conditions for key, conditions in groups.items() if len(conditions) > 1}
+        if not groups:
             return {}, ""
-        assert len(ids) == 1  # Don't need more at the moment
-        ids = ids[0]
+        assert len(groups) == 1  # Don't need more at the moment
+        key, conditions = groups.popitem()
 
-        conditions_str = ", ".join([f"{cond}={conditions[0][i]}"
-                                    for i, cond in enumerate(group_by)])
+        conditions_str = ", ".join([f"{cond}={key[i]}" for i, cond in enumerate(group_by)])
 
+        ids = []
         index = []
-        for condition in ids:
-            tmp = self._select(f"""SELECT {','.join(depending)} FROM conditions
-                                   WHERE id = {condition}""")
+        for condition in conditions:
+            ids.append(condition["id"])
+            tmp = [condition[column] for column in depending if condition[column] is not None]
+            if len(tmp) == 1:
+                tmp = tmp[0]
             try:
-                index.append(Connectivity(*tmp[0]))
+                index.append(Connectivity(*tmp))
             except ValueError:
-                index.append(tmp[0][0])
-            except TypeError:
                 index.append(tmp[0])
+            except TypeError:
+                index.append(tmp)
 
+        country_ids = self._country_ids()
         if country_dependent:
-            countries = self._select("SELECT DISTINCT(country) FROM experiments")
             res = {}
-            for country in countries:
+            for country_id in self._storage.countries(country_ids):
+                country = self._storage.name("countries", country_id)
                 res[country] = {}
                 for i, cond in enumerate(ids):
-                    res[country][index[i]] = self._select(
-                        f"""SELECT id FROM experiments
-                            WHERE country=\"{country}\" AND condition = {cond}""")
+                    res[country][index[i]] = self._storage.experiments(cond, [country_id])
                     if res[country][index[i]] == []:
                         del res[country][index[i]]
                 if res[country] == {}:
@@ -600,7 +1017,7 @@ class Results:
             return res, conditions_str
         res = {}
         for i, cond in enumerate(ids):
-            res[index[i]] = self._select(f"SELECT id FROM experiments WHERE condition = {cond}")
+            res[index[i]] = self._storage.experiments(cond, country_ids)
             if res[index[i]] == []:
                 del res[index[i]]
         return res, conditions_str
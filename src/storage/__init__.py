@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 18:20:27
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 18:20:27
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Module for the storages of the results
+
+A storage is chosen by its name, with the option --storage or the key storage of the configuration:
+ - sqlite: a SQLite database, the default;
+ - memory: NumPy arrays in memory, the datas are ingested every time.
+An export is read with ExportStorage.
+Another engine is added by implementing Storage and registering it in STORAGES.
+"""
+from typing import Dict
+from typing import Optional
+from typing import Type
+
+from ..config import CONFIG
+from .base import FIELDS
+from .base import LOOKUPS
+from .base import Storage
+from .exported import ExportStorage
+from .memory import MemoryStorage
+from .sqlite import PACKED
+from .sqlite import SQLiteStorage
+
+
+DEFAULT = "sqlite"
+STORAGES: Dict[str, Type[Storage]] = {"sqlite": SQLiteStorage, "memory": MemoryStorage}
+
+
+def open_storage(name: Optional[str] = None, **options) -> Storage:
+    """
+    Open a storage by its name
+
+    :param      name:     The name of the storage, by default the one of the configuration,
+                          else sqlite
+    :type       name:     str
+    :param      options:  The options of the storage: database, packed, slow_query,
+                          in_memory and checkpoint, the ones it does not use are ignored
+    :type       options:  dictionary
+
+    :returns:   The storage
+    :rtype:     Storage
+
+    :raises     ValueError:  If the storage is unknown
+    """
+    if name is None:
+        name = CONFIG.get("storage", DEFAULT)
+    if name not in STORAGES:
+        raise ValueError(f"Unknown storage {name}, choose from {', '.join(STORAGES)}")
+    return STORAGES[name](**options)
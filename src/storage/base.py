@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 17:48:36
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 17:48:36
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Base class of the storages
+"""
+from abc import ABC
+from abc import abstractmethod
+from array import array
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import TextIO
+from typing import Tuple
+
+from numpy import asarray
+from numpy import ndarray
+
+from ..datas.sketch import QuantileSketch
+
+
+# The dictionary-encoded columns, stored as the id of their value in a lookup table
+LOOKUPS = {"proxy": "proxies", "website": "websites", "country": "countries"}
+# The fields of a condition
+FIELDS = ["upload", "download", "rtt", "loss", "technology", "quality", "operator", "country"]
+
+
+def extend(cell: QuantileSketch | array, values: ndarray) -> QuantileSketch | array:
+    """
+    Add values to a cell, an array of doubles is extended at once from their buffer
+
+    :param      cell:    The cell
+    :type       cell:    QuantileSketch | array
+    :param      values:  The values
+    :type       values:  ndarray
+
+    :returns:   The cell
+    :rtype:     QuantileSketch | array
+    """
+    if isinstance(cell, array):
+        cell.frombytes(asarray(values, dtype="<f8").tobytes())
+    else:
+        # A sketch adds the values one by one anyway
+        cell.extend(values.tolist())
+    return cell
+
+
+class Storage(ABC):
+    """
+    This class describes the storage of the results:
+    the lookup tables, the conditions, the experiments and the values of the tests.
+
+    The proxies, the websites and the countries are given by their id in the lookup tables.
+    The values of a test are read in the order they were inserted, without the missing ones.
+    """
+    # If the storage keeps the results once closed, else they are ingested every time
+    PERSISTENT = True
+
+    # lookup table -> name -> id, and id -> name
+    _ids: Dict[str, Dict[str, int]]
+    _names: Dict[str, Dict[int, str]]
+
+    def __init__(self):
+        self._ids = {lookup: {} for lookup in LOOKUPS.values()}
+        self._names = {lookup: {} for lookup in LOOKUPS.values()}
+
+    def _cache(self, lookup: str, identifier: int, name: str):
+        self._ids[lookup][name] = identifier
+        self._names[lookup][identifier] = name
+
+    @abstractmethod
+    def _add_name(self, lookup: str, name: str) -> int:
+        """
+        Add a name to a lookup table
+
+        :param      lookup:  The lookup table
+        :type       lookup:  str
+        :param      name:    The name
+        :type       name:    str
+
+        :returns:   Its id
+        :rtype:     int
+        """
+        raise NotImplementedError
+
+    def identifier(self, lookup: str, name: str) -> int:
+        """
+        Gets the id of a name in a lookup table, it is added if needed
+
+        :param      lookup:  The lookup table
+        :type       lookup:  str
+        :param      name:    The name
+        :type       name:    str
+
+        :returns:   The id
+        :rtype:     int
+        """
+        if name not in self._ids[lookup]:
+            self._cache(lookup, self._add_name(lookup, name), name)
+        return self._ids[lookup][name]
+
+    def name(self, lookup: str, identifier: int) -> str:
+        """
+        Gets the name of an id in a lookup table
+
+        :param      lookup:      The lookup table
+        :type       lookup:      str
+        :param      identifier:  The id
+        :type       identifier:  int
+
+        :returns:   The name
+        :rtype:     str
+        """
+        return self._names[lookup][identifier]
+
+    def names(self, lookup: str) -> Dict[int, str]:
+        """
+        Gets the names of a lookup table
+
+        :param      lookup:  The lookup table
+        :type       lookup:  str
+
+        :returns:   The names by their id
+        :rtype:     dict int * str
+        """
+        return self._names[lookup]
+
+    def report_queries(self, file: TextIO, top: int = 10):
+        """
+        Write the queries taking the most time, if the storage logs them
+
+        :param      file:  The file
+        :type       file:  TextIO
+        :param      top:   The number of queries
+        :type       top:   int
+        """
+
+    @abstractmethod
+    def run_dates(self, country: int, run: int) -> List[float]:
+        """
+        Gets the dates of the experiments of a run
+
+        :param      country:  The country
+        :type       country:  int
+        :param      run:      The run
+        :type       run:      int
+
+        :returns:   The dates
+        :rtype:     float list
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_run(self, country: int, run: int):
+        """
+        Delete the experiments of a run and their values
+
+        :param      country:  The country
+        :type       country:  int
+        :param      run:      The run
+        :type       run:      int
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_condition(self, fields: Dict[str, Any]) -> int:
+        """
+        Gets the condition with these fields, it is added if needed
+
+        :param      fields:  The fields, the other ones are missing
+        :type       fields:  dict str * Any
+
+        :returns:   The id of the condition
+        :rtype:     int
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_experiment(self, country: int, run: int, condition: int, date: float) -> int:
+        """
+        Add an experiment
+
+        :param      country:    The country
+        :type       country:    int
+        :param      run:        The run
+        :type       run:        int
+        :param      condition:  The condition
+        :type       condition:  int
+        :param      date:       The date of the run
+        :type       date:       float
+
+        :returns:   The id of the experiment
+        :rtype:     int
+        """
+        raise NotImplementedError
+
+    # pylint: disable=R0913
+    @abstractmethod
+    def insert(self, table: str, experiment: int, proxy: int, website: Optional[int],
+               values: Dict[str, List]):
+        """
+        Add the values of a test.
+        The lists are aligned, the i-th values of the columns are measured together,
+        a missing value is None.
+
+        :param      table:       The table of the test
+        :type       table:       str
+        :param      experiment:  The experiment
+        :type       experiment:  int
+        :param      proxy:       The proxy
+        :type       proxy:       int
+        :param      website:     The website, None for the tests without website
+        :type       website:     int
+        :param      values:      The values of each column
+        :type       values:      dict str * list
+        """
+        raise NotImplementedError
+
+    def commit(self):
+        """
+        Commit the writes since the last commit, at the end of each experiment
+        """
+
+    def save(self):
+        """
+        Write the storage where it is kept, if it is kept elsewhere than where it is used
+        """
+
+    @abstractmethod
+    def conditions(self) -> List[Dict[str, Any]]:
+        """
+        Gets the conditions, in the order of their id
+
+        :returns:   The id and the fields of each condition, None if missing
+        :rtype:     dict str * Any list
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def experiments(self, condition: int, countries: Optional[List[int]] = None) -> List[int]:
+        """
+        Gets the experiments of a condition
+
+        :param      condition:  The condition
+        :type       condition:  int
+        :param      countries:  Only the experiments of these countries, all of them if None
+        :type       countries:  int list
+
+        :returns:   The experiments, in the order they were added
+        :rtype:     int list
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def experiment_rows(self) -> List[Tuple[int, int, int, int, float]]:
+        """
+        Gets the experiments, in the order they were added
+
+        :returns:   The id, the country, the run, the condition and the date of each experiment
+        :rtype:     (int * int * int * int * float) list
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def countries(self, countries: Optional[List[int]] = None) -> List[int]:
+        """
+        Gets the countries having experiments
+
+        :param      countries:  Only these countries, all of them if None
+        :type       countries:  int list
+
+        :returns:   The countries, in the order of their first experiment
+        :rtype:     int list
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def proxies(self, table: str) -> List[int]:
+        """
+        Gets the proxies having values in a table
+
+        :param      table:  The table
+        :type       table:  str
+
+        :returns:   The proxies, in the order of their first values
+        :rtype:     int list
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def websites(self, table: str) -> List[int]:
+        """
+        Gets the websites having values in a table
+
+        :param      table:  The table
+        :type       table:  str
+
+        :returns:   The websites, in the order of their first values
+        :rtype:     int list
+        """
+        raise NotImplementedError
+
+    # pylint: disable=R0913
+    @abstractmethod
+    def values(self, table: str, column: str, ids: List[int], proxy: int,
+               website: Optional[int] = None) -> ndarray:
+        """
+        Gets the values of a column for some experiments, a proxy and a website,
+        without copying them when the storage holds them in an array
+
+        :param      table:    The table
+        :type       table:    str
+        :param      column:   The column
+        :type       column:   str
+        :param      ids:      The experiments
+        :type       ids:      int list
+        :param      proxy:    The proxy
+        :type       proxy:    int
+        :param      website:  The website, None for the tests without website
+        :type       website:  int
+
+        :returns:   The values
+        :rtype:     ndarray
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def count(self, table: str, column: str, ids: List[int], website: Optional[int] = None
+             ) -> Dict[int, int]:
+        """
+        Count the values of a column for some experiments and a website, for each proxy
+
+        :param      table:    The table
+        :type       table:    str
+        :param      column:   The column
+        :type       column:   str
+        :param      ids:      The experiments
+        :type       ids:      int list
+        :param      website:  The website, None for the tests without website
+        :type       website:  int
+
+        :returns:   The number of values by proxy
+        :rtype:     dict int * int
+        """
+        raise NotImplementedError
+
+    # pylint: disable=R0913
+    def stream(self, table: str, column: str, ids: List[int], proxy: int,
+               website: Optional[int], limit: int, cell: QuantileSketch | array
+              ) -> QuantileSketch | array:
+        """
+        Add the first values of a column for some experiments, a proxy and a website to a cell
+
+        :param      table:    The table
+        :type       table:    str
+        :param      column:   The column
+        :type       column:   str
+        :param      ids:      The experiments
+        :type       ids:      int list
+        :param      proxy:    The proxy
+        :type       proxy:    int
+        :param      website:  The website, None for the tests without website
+        :type       website:  int
+        :param      limit:    The number of values
+        :type       limit:    int
+        :param      cell:     The cell
+        :type       cell:     QuantileSketch | array
+
+        :returns:   The cell
+        :rtype:     QuantileSketch | array
+        """
+        return extend(cell, self.values(table, column, ids, proxy, website)[:limit])
+
+    @abstractmethod
+    def lines(self, table: str, column: str) -> Tuple[ndarray, ndarray, ndarray, ndarray]:
+        """
+        Gets all the values of a column, in the order they were added
+
+        :param      table:   The table
+        :type       table:   str
+        :param      column:  The column
+        :type       column:  str
+
+        :returns:   The experiment, the proxy, the website (-1 if none) and the value,
+                    of each value
+        :rtype:     ndarray * ndarray * ndarray * ndarray
+        """
+        raise NotImplementedError
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 18:14:03
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 18:14:03
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Module for the storage read from an export
+"""
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from numpy import ndarray
+
+from ..config import CONFIG
+from ..export import Export
+from .base import LOOKUPS
+from .base import Storage
+
+
+class ExportStorage(Storage):
+    """
+    This class describes the storage read from an export, its files are memory-mapped.
+    It is read-only, the lines of a metric are sorted by proxy and website.
+    """
+    _export: Export
+    # (table, column) -> metric
+    _metrics: Dict[Tuple[str, str], str]
+    _conditions: List[Dict[str, Any]]
+    _experiments: List[Tuple[int, int, int, int, float]]
+
+    def __init__(self, path: str, **_options):
+        """
+        Open an export, the options of the other storages are ignored
+
+        :param      path:  The folder of the export
+        :type       path:  str
+        """
+        super().__init__()
+        self._export = Export(path)
+        schema = self._export.schema()
+        for column, lookup in LOOKUPS.items():
+            for identifier, name in enumerate(self._export.categories(column)):
+                self._cache(lookup, identifier, name)
+        self._metrics = {(conf["table"], conf["column"]): metric
+                         for metric, conf in CONFIG["metrics"].items()
+                         if metric in schema["metrics"]}
+        self._conditions = [dict(zip(schema["conditions"]["columns"], row))
+                            for row in schema["conditions"]["rows"]]
+        self._experiments = [tuple(row) for row in schema["experiments"]["rows"]]
+
+    def _metric(self, table: str, column: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Gets the schema of the metric of a column
+
+        :param      table:   The table
+        :type       table:   str
+        :param      column:  The column, any column of the table if None
+        :type       column:  str
+
+        :returns:   The schema of the metric
+        :rtype:     dict
+        """
+        for (metric_table, metric_column), metric in self._metrics.items():
+            if metric_table == table and column in [None, metric_column]:
+                return self._export.schema()["metrics"][metric]
+        return {"proxies": [], "websites": []}
+
+    def _read_only(self, *_):
+        raise ValueError("An export is read-only")
+
+    _add_name = _read_only
+    run_dates = _read_only
+    delete_run = _read_only
+    add_condition = _read_only
+    add_experiment = _read_only
+    insert = _read_only
+
+    def conditions(self) -> List[Dict[str, Any]]:
+        return self._conditions
+
+    def experiments(self, condition: int, countries: Optional[List[int]] = None) -> List[int]:
+        return [experiment[0] for experiment in self._experiments
+                if experiment[3] == condition
+                    and (countries is None or experiment[1] in countries)]
+
+    def experiment_rows(self) -> List[Tuple[int, int, int, int, float]]:
+        return self._experiments
+
+    def countries(self, countries: Optional[List[int]] = None) -> List[int]:
+        return list(dict.fromkeys(experiment[1] for experiment in self._experiments
+                                  if countries is None or experiment[1] in countries))
+
+    def proxies(self, table: str) -> List[int]:
+        return [self._ids["proxies"][proxy] for proxy in self._metric(table)["proxies"]]
+
+    def websites(self, table: str) -> List[int]:
+        return [self._ids["websites"][website] for website in self._metric(table)["websites"]]
+
+    # pylint: disable=R0913
+    def values(self, table: str, column: str, ids: List[int], proxy: int,
+               website: Optional[int] = None) -> ndarray:
+        return self._export.values(self._metrics[(table, column)], ids, proxy,
+                                   -1 if website is None else website)
+
+    def count(self, table: str, column: str, ids: List[int], website: Optional[int] = None
+             ) -> Dict[int, int]:
+        return self._export.count(self._metrics[(table, column)], ids,
+                                  -1 if website is None else website)
+
+    def lines(self, table: str, column: str) -> Tuple[ndarray, ndarray, ndarray, ndarray]:
+        return self._export.lines(self._metrics[(table, column)])
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 18:06:41
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 18:06:41
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Module for the storage in memory
+"""
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from numpy import asarray
+from numpy import concatenate
+from numpy import ndarray
+from numpy import repeat
+
+from ..config import CONFIG
+from .base import FIELDS
+from .base import Storage
+
+
+# The type of the values of a column
+_TYPES = {"INTEGER": "<i8", "REAL": "<f8", "TEXT": object}
+
+
+class MemoryStorage(Storage):
+    """
+    This class describes a storage in memory, nothing is written on the disk.
+    The values are kept as in the packed layout of the database:
+    a row holds the NumPy arrays of the values of an experiment, a proxy and a website.
+    """
+    PERSISTENT = False
+
+    _conditions: List[Dict[str, Any]]
+    # id -> country, run, condition and date, in the order they were added
+    _experiments: Dict[int, Tuple[int, int, int, float]]
+    # table -> the experiment, the proxy, the website (-1 if none) and the values of each row
+    _rows: Dict[str, List[Tuple[int, int, int, Dict[str, ndarray]]]]
+    # table -> (proxy, website) -> the index of their rows
+    _index: Dict[str, Dict[Tuple[int, int], List[int]]]
+
+    def __init__(self, **_options):
+        """
+        Create an empty storage, the options of the other storages are ignored
+        """
+        super().__init__()
+        self._conditions = []
+        self._experiments = {}
+        self._rows = {table: [] for table in CONFIG["tables"]}
+        self._index = {table: {} for table in CONFIG["tables"]}
+
+    def _add_name(self, lookup: str, name: str) -> int:
+        return len(self._names[lookup]) + 1
+
+    def run_dates(self, country: int, run: int) -> List[float]:
+        return [date for country_id, number, _, date in self._experiments.values()
+                if country_id == country and number == run]
+
+    def delete_run(self, country: int, run: int):
+        deleted = {identifier for identifier, (country_id, number, _, _)
+                   in self._experiments.items() if country_id == country and number == run}
+        if not deleted:
+            return
+        for identifier in deleted:
+            del self._experiments[identifier]
+        for table, rows in self._rows.items():
+            self._rows[table] = [row for row in rows if row[0] not in deleted]
+            self._index[table] = {}
+            for i, row in enumerate(self._rows[table]):
+                self._index[table].setdefault((row[1], row[2]), []).append(i)
+
+    def add_condition(self, fields: Dict[str, Any]) -> int:
+        for condition in self._conditions:
+            if all(condition[field] == value for field, value in fields.items()):
+                return condition["id"]
+        self._conditions.append({"id": len(self._conditions) + 1,
+                                 **{field: fields.get(field) for field in FIELDS}})
+        return len(self._conditions)
+
+    def add_experiment(self, country: int, run: int, condition: int, date: float) -> int:
+        # The next id, as in SQLite
+        identifier = max(self._experiments, default=0) + 1
+        self._experiments[identifier] = (country, run, condition, date)
+        return identifier
+
+    # pylint: disable=R0913
+    def insert(self, table: str, experiment: int, proxy: int, website: Optional[int],
+               values: Dict[str, List]):
+        types = CONFIG["tables"][table]["columns"]
+        arrays = {column: asarray([value for value in column_values if value is not None],
+                                  dtype=_TYPES[types[column]])
+                  for column, column_values in values.items()}
+        arrays = {column: values for column, values in arrays.items() if len(values)}
+        if not arrays:
+            return
+        website = -1 if website is None else website
+        self._index[table].setdefault((proxy, website), []).append(len(self._rows[table]))
+        self._rows[table].append((experiment, proxy, website, arrays))
+
+    def conditions(self) -> List[Dict[str, Any]]:
+        return self._conditions
+
+    def experiments(self, condition: int, countries: Optional[List[int]] = None) -> List[int]:
+        return [identifier for identifier, (country, _, condition_id, _)
+                in self._experiments.items()
+                if condition_id == condition and (countries is None or country in countries)]
+
+    def experiment_rows(self) -> List[Tuple[int, int, int, int, float]]:
+        return [(identifier, *experiment) for identifier, experiment in self._experiments.items()]
+
+    def countries(self, countries: Optional[List[int]] = None) -> List[int]:
+        return list(dict.fromkeys(country for country, _, _, _ in self._experiments.values()
+                                  if countries is None or country in countries))
+
+    def proxies(self, table: str) -> List[int]:
+        return list(dict.fromkeys(row[1] for row in self._rows[table]))
+
+    def websites(self, table: str) -> List[int]:
+        return list(dict.fromkeys(row[2] for row in self._rows[table]))
+
+    # pylint: disable=R0913
+    def _array(self, table: str, column: str, ids: List[int], proxy: int,
+               website: Optional[int]) -> ndarray:
+        kept = set(ids)
+        rows = self._rows[table]
+        arrays = [rows[i][3][column]
+                  for i in self._index[table].get((proxy, -1 if website is None else website), [])
+                  if rows[i][0] in kept and column in rows[i][3]]
+        if len(arrays) == 1:
+            return arrays[0]
+        return concatenate(arrays or [asarray([], dtype=_TYPES[
+            CONFIG["tables"][table]["columns"][column]])])
+
+    # pylint: disable=R0913
+    def values(self, table: str, column: str, ids: List[int], proxy: int,
+               website: Optional[int] = None) -> ndarray:
+        return self._array(table, column, ids, proxy, website)
+
+    def count(self, table: str, column: str, ids: List[int], website: Optional[int] = None
+             ) -> Dict[int, int]:
+        kept = set(ids)
+        website = -1 if website is None else website
+        rows = self._rows[table]
+        res = {}
+        for (proxy, site), indexes in self._index[table].items():
+            if site == website:
+                res[proxy] = sum(len(rows[i][3][column]) for i in indexes
+                                 if rows[i][0] in kept and column in rows[i][3])
+        return res
+
+    def lines(self, table: str, column: str) -> Tuple[ndarray, ndarray, ndarray, ndarray]:
+        rows = [row for row in self._rows[table] if column in row[3]]
+        keys = repeat(asarray([row[:3] for row in rows], dtype="<i8").reshape(-1, 3),
+                      [len(row[3][column]) for row in rows], axis=0)
+        values = concatenate([row[3][column] for row in rows] or [[]]).astype("<f8")
+        return keys[:, 0], keys[:, 1], keys[:, 2], values
@@ -0,0 +1,488 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 17:55:12
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 17:55:12
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Module for the storage in a SQLite database
+"""
+from array import array
+from logging import debug
+from logging import info
+from sqlite3 import connect
+from sqlite3 import Connection
+from sqlite3 import Cursor
+from sqlite3 import OperationalError
+from time import perf_counter
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import TextIO
+from typing import Tuple
+
+from numpy import asarray
+from numpy import concatenate
+from numpy import dtype
+from numpy import frombuffer
+from numpy import ndarray
+from numpy import repeat
+
+from ..config import CONFIG
+from ..datas.sketch import QuantileSketch
+from ..profiling import count
+from ..profiling import span
+from ..query_log import QueryLog
+from .base import extend
+from .base import FIELDS
+from .base import LOOKUPS
+from .base import Storage
+
+
+# The little-endian type of the values of a column, in the packed layout
+PACKED = {"INTEGER": "<i4", "REAL": "<f8"}
+
+
+class SQLiteStorage(Storage):
+    """
+    This class describes the storage in a SQLite database.
+
+    In the row layout, a row of a test holds the values measured together.
+    In the packed layout, a row holds all the values of an experiment, a proxy and a website,
+    each column is a BLOB of little-endian values.
+
+    In memory, the database is loaded from its file when opened and written back
+    by save, the file is the same as without.
+    """
+    _connection: Connection
+    _cursor: Cursor
+    _queries: Optional[QueryLog]
+    _packed: bool
+    # The file of the database when it is in memory, else None
+    _disk: Optional[Connection]
+    _checkpoint: Optional[int]
+    _commits: int
+    # The schema version and the number of changes at the last save
+    _saved: Tuple[int, int]
+
+    # pylint: disable=R0913
+    def __init__(self, database: str = "tmp", packed: bool = False,
+                 slow_query: Optional[float] = None, in_memory: bool = False,
+                 checkpoint: Optional[int] = None):
+        """
+        Open a database, it is created or migrated if needed
+
+        :param      database:    The database, the extension .db is added if needed
+        :type       database:    str
+        :param      packed:      If a new database has the packed layout
+        :type       packed:      bool
+        :param      slow_query:  The threshold in ms to log the slow queries, None to not log them
+        :type       slow_query:  float
+        :param      in_memory:   If the database is loaded in memory and written back by save
+        :type       in_memory:   bool
+        :param      checkpoint:  In memory, the number of commits between two saves,
+                                 None to only save at the end
+        :type       checkpoint:  int
+        """
+        super().__init__()
+        if database[-3:] != ".db":
+            database += ".db"
+        self._queries = QueryLog(slow_query) if slow_query is not None else None
+        self._checkpoint = checkpoint
+        self._commits = 0
+
+        info("Creating the database")
+        if in_memory:
+            # The file is only read here and written by save, with the backup API
+            self._disk = connect(database)
+            self._connection = connect(":memory:")
+            with span("load database"):
+                self._disk.backup(self._connection)
+        else:
+            self._disk = None
+            self._connection = connect(database)
+        self._cursor = self._connection.cursor()
+        self._saved = self._state()
+
+        try:
+            self._cursor.execute("""CREATE TABLE conditions(
+                                    id INTEGER PRIMARY KEY NOT NULL,
+                                    upload INTEGER,
+                                    download INTEGER,
+                                    rtt INTEGER,
+                                    loss INTEGER,
+                                    technology TEXT,
+                                    quality TEXT,
+                                    operator TEXT,
+                                    country TEXT
+                                )""")
+        except OperationalError:
+            debug("Table conditions already exists.")
+
+        for lookup in LOOKUPS.values():
+            try:
+                self._cursor.execute(f"""CREATE TABLE {lookup}(
+                                         id INTEGER PRIMARY KEY NOT NULL,
+                                         name TEXT UNIQUE NOT NULL
+                                     )""")
+            except OperationalError:
+                debug(f"Table {lookup} already exists.")
+
+        for table in ["experiments", *CONFIG["tables"]]:
+            try:
+                self._cursor.execute(self._schema(table, packed=packed))
+            except OperationalError:
+                debug(f"Table {table} already exists.")
+        self._migrate()
+        # The layout of an existing database is kept
+        self._packed = any(line[2] == "BLOB" for table in CONFIG["tables"]
+                           for line in self._select(f"PRAGMA table_info({table})"))
+        if self._packed != packed:
+            info(f"The database {database} keeps its {'packed' if self._packed else 'row'} layout")
+
+        for lookup in LOOKUPS.values():
+            for identifier, name in self._select(f"SELECT id, name FROM {lookup}"):
+                self._cache(lookup, identifier, name)
+
+    @staticmethod
+    def _schema(table: str, name: Optional[str] = None, packed: bool = False) -> str:
+        """
+        Gets the request creating a table, the experiments or the table of a test.
+        In the packed layout, a row of a test holds all the values of an experiment,
+        a proxy and a website, each column is a BLOB of little-endian values.
+
+        :param      table:   The table
+        :type       table:   str
+        :param      name:    The name of the table created, the table itself if None
+        :type       name:    str
+        :param      packed:  If the table of a test has the packed layout
+        :type       packed:  bool
+
+        :returns:   The request
+        :rtype:     str
+
+        :raises     ValueError:  If a column cannot be packed
+        """
+        if table == "experiments":
+            return f"""CREATE TABLE {name or table}(
+                       id INTEGER PRIMARY KEY NOT NULL,
+                       country INTEGER NOT NULL,
+                       run INTEGER NOT NULL,
+                       condition INTEGER NOT NULL,
+                       date REAL NOT NULL,
+                       FOREIGN KEY(country) REFERENCES countries(id),
+                       FOREIGN KEY(condition) REFERENCES conditions(id))"""
+        conf = CONFIG["tables"][table]
+        if packed:
+            for column, typ in conf["columns"].items():
+                if typ not in PACKED:
+                    raise ValueError(f"The column {column} of {table} cannot be packed, "
+                                     + f"only {', '.join(PACKED)} can")
+        columns = [f"{column} {'BLOB' if packed else typ}"
+                   for column, typ in conf["columns"].items()]
+        keys = ["FOREIGN KEY(experimentid) REFERENCES experiments(id)",
+                "FOREIGN KEY(proxy) REFERENCES proxies(id)"]
+        if conf["website_dependent"]:
+            columns.append("website INTEGER NOT NULL")
+            keys.append("FOREIGN KEY(website) REFERENCES websites(id)")
+        return f"""CREATE TABLE {name or table}(
+                   experimentid INTEGER,
+                   proxy INTEGER NOT NULL,
+                   {",".join(columns + keys)})"""
+
+    def _migrate(self):
+        """
+        Migrate the tables where the proxies, the websites and the countries are still text.
+        The tables are rebuilt in the same order, the lookup tables are filled on the way.
+        """
+        migrated = False
+        for table in ["experiments", *CONFIG["tables"]]:
+            key = "country" if table == "experiments" else "proxy"
+            types = {line[1]: line[2] for line in self._select(f"PRAGMA table_info({table})")}
+            if types.get(key, "INTEGER") == "INTEGER":
+                continue
+            info(f"Migrating the table {table} to the integer ids")
+            encoded = [column for column in LOOKUPS if column in types]
+            for column in encoded:
+                self._cursor.execute(f"""INSERT OR IGNORE INTO {LOOKUPS[column]} (name)
+                                         SELECT DISTINCT({column}) FROM {table}""")
+            columns = [column for column in types if column not in encoded]
+            self._cursor.execute(self._schema(table, f"new_{table}"))
+            self._cursor.execute(f"""INSERT INTO new_{table} ({", ".join(columns + encoded)})
+                                     SELECT {", ".join([f"{table}.{column}"
+                                                        for column in columns]
+                                                       + [f"{LOOKUPS[column]}.id"
+                                                          for column in encoded])}
+                                     FROM {table}
+                                     {" ".join(f"JOIN {LOOKUPS[column]} ON "
+                                               + f"{LOOKUPS[column]}.name = {table}.{column}"
+                                               for column in encoded)}
+                                     ORDER BY {table}.rowid""")
+            self._cursor.execute(f"DROP TABLE {table}")
+            self._cursor.execute(f"ALTER TABLE new_{table} RENAME TO {table}")
+            migrated = True
+        if migrated:
+            self._connection.commit()
+            self._cursor.execute("VACUUM")
+
+    def _add_name(self, lookup: str, name: str) -> int:
+        return self._select(f"""INSERT INTO {lookup} (name) VALUES (\"{name}\")
+                                RETURNING id""")[0]
+
+    def report_queries(self, file: TextIO, top: int = 10):
+        if self._queries is not None:
+            self._queries.report(file, top)
+
+    def _select(self, request: str) -> List:
+        count("sql queries")
+        try:
+            res = []
+            start = perf_counter()
+            lines = self._cursor.execute(request).fetchall()
+            if self._queries is not None:
+                self._queries.record(self._connection, request, perf_counter() - start)
+            count("rows fetched", len(lines))
+            for line in lines:
+                if line is not None:
+                    if len(line) == 1:
+                        if line[0] is not None:
+                            res.append(line[0])
+                    else:
+                        res.append([value for value in line if value is not None])
+            return res
+        except OperationalError:
+            debug(f"An error occured while executing this resquest: {request}")
+            raise
+
+    def run_dates(self, country: int, run: int) -> List[float]:
+        return self._select(f"""SELECT date FROM experiments
+                                WHERE country={country}
+                                   AND run={run}""")
+
+    def delete_run(self, country: int, run: int):
+        for table in CONFIG["tables"]:
+            self._cursor.execute(f"""DELETE FROM {table}
+                                     WHERE experimentid IN (SELECT id FROM experiments
+                                                            WHERE country={country}
+                                                                AND run={run})""")
+        self._cursor.execute(f"""DELETE FROM experiments
+                                 WHERE country={country} AND run={run}""")
+
+    def add_condition(self, fields: Dict[str, Any]) -> int:
+        values = {field: f"\"{value}\"" if isinstance(value, str) else str(value)
+                  for field, value in fields.items()}
+        condition = self._select(f"""SELECT id FROM conditions
+                                     WHERE {" AND ".join(f"{field}={value}"
+                                                         for field, value in values.items())}""")
+        if not condition:
+            condition = self._select(f"""INSERT INTO conditions ({", ".join(values)})
+                                         VALUES ({", ".join(values.values())})
+                                         RETURNING id""")
+        assert len(condition) == 1
+        assert isinstance(condition[0], int)
+        return condition[0]
+
+    def add_experiment(self, country: int, run: int, condition: int, date: float) -> int:
+        experiment_id = self._select(f"""INSERT INTO experiments (country, run, condition, date)
+                                         VALUES ({country}, {run}, {condition}, {date})
+                                         RETURNING id""")
+        assert len(experiment_id) == 1
+        assert isinstance(experiment_id[0], int)
+        return experiment_id[0]
+
+    # pylint: disable=R0913
+    def insert(self, table: str, experiment: int, proxy: int, website: Optional[int],
+               values: Dict[str, List]):
+        keys = {"experimentid": experiment, "proxy": proxy}
+        if website is not None:
+            keys["website"] = website
+        types = CONFIG["tables"][table]["columns"]
+        if self._packed:
+            values = {column: [value for value in column_values if value is not None]
+                      for column, column_values in values.items()}
+            if not any(values.values()):
+                return
+            row = {**keys, **{column: asarray(value, dtype=PACKED[types[column]]).tobytes()
+                                      if value else None
+                              for column, value in values.items()}}
+            self._cursor.execute(f"""INSERT INTO {table} ({", ".join(row)})
+                                     VALUES ({", ".join("?" * len(row))})""",
+                                 list(row.values()))
+            return
+        columns = [*keys, *values]
+        for i in range(max((len(value) for value in values.values()), default=0)):
+            line = [value[i] if i < len(value) else None for value in values.values()]
+            if any(value is not None for value in line):
+                line = ["NULL" if value is None
+                        else f"\"{value}\"" if types[column] == "TEXT" else str(value)
+                        for column, value in zip(values, line)]
+                self._cursor.execute(f"""INSERT INTO {table} ({", ".join(columns)})
+                                         VALUES ({", ".join([str(key) for key in keys.values()]
+                                                            + line)})""")
+
+    def commit(self):
+        self._connection.commit()
+        self._commits += 1
+        if self._checkpoint is not None and self._commits % self._checkpoint == 0:
+            self.save()
+
+    def _state(self) -> Tuple[int, int]:
+        return (self._cursor.execute("PRAGMA schema_version").fetchone()[0],
+                self._connection.total_changes)
+
+    def save(self):
+        if self._disk is None or self._state() == self._saved:
+            return
+        self._connection.commit()
+        info("Writing the database from memory")
+        with span("save database"):
+            self._connection.backup(self._disk)
+        self._saved = self._state()
+
+    def conditions(self) -> List[Dict[str, Any]]:
+        return [dict(zip(["id", *FIELDS], line)) for line in self._cursor.execute(
+            f"SELECT id, {', '.join(FIELDS)} FROM conditions ORDER BY id").fetchall()]
+
+    def experiments(self, condition: int, countries: Optional[List[int]] = None) -> List[int]:
+        return self._select(f"""SELECT id FROM experiments
+                                WHERE condition = {condition}{self._country_filter(countries)}""")
+
+    def experiment_rows(self) -> List[Tuple[int, int, int, int, float]]:
+        return self._cursor.execute("""SELECT id, country, run, condition, date
+                                       FROM experiments""").fetchall()
+
+    def countries(self, countries: Optional[List[int]] = None) -> List[int]:
+        return self._select(f"""SELECT DISTINCT(country) FROM experiments
+                                WHERE 1{self._country_filter(countries)}""")
+
+    @staticmethod
+    def _country_filter(countries: Optional[List[int]]) -> str:
+        if countries is None:
+            return ""
+        return f" AND country IN ({', '.join(str(country) for country in countries)})"
+
+    def proxies(self, table: str) -> List[int]:
+        return self._select(f"SELECT DISTINCT(proxy) FROM {table}")
+
+    def websites(self, table: str) -> List[int]:
+        return self._select(f"SELECT DISTINCT(website) FROM {table}")
+
+    @staticmethod
+    def _where(ids: List[int], proxy: Optional[int] = None, website: Optional[int] = None
+              ) -> str:
+        """
+        Gets the condition on the rows of some experiments, a proxy and a website
+
+        :param      ids:      The experiments
+        :type       ids:      int list
+        :param      proxy:    The proxy, all of them if None
+        :type       proxy:    int
+        :param      website:  The website, all of them if None
+        :type       website:  int
+
+        :returns:   The condition
+        :rtype:     str
+        """
+        where = f"experimentid {f'= {ids[0]}' if len(ids) == 1 else f'IN {tuple(ids)}'}"
+        if website is not None:
+            where = f"website={website} AND {where}"
+        if proxy is not None:
+            where = f"proxy={proxy} AND {where}"
+        return where
+
+    def _unpack(self, table: str, column: str, where: str) -> ndarray:
+        """
+        Gets the values of a column in the packed layout, in the order of the rows.
+        The values of a single row are not copied.
+
+        :param      table:   The table
+        :type       table:   str
+        :param      column:  The column
+        :type       column:  str
+        :param      where:   The condition on the rows
+        :type       where:   str
+
+        :returns:   The values
+        :rtype:     ndarray
+        """
+        typ = dtype(PACKED[CONFIG["tables"][table]["columns"][column]])
+        blobs = self._select(f"""SELECT {column} FROM {table}
+                                  WHERE {where} AND {column} IS NOT NULL
+                                  ORDER BY rowid""")
+        if len(blobs) == 1:
+            res = frombuffer(blobs[0], dtype=typ)
+        else:
+            res = concatenate([frombuffer(blob, dtype=typ) for blob in blobs] or [[]]
+                              ).astype(typ, copy=False)
+        count("values unpacked", len(res))
+        return res
+
+    # pylint: disable=R0913
+    def values(self, table: str, column: str, ids: List[int], proxy: int,
+               website: Optional[int] = None) -> ndarray:
+        if self._packed:
+            return self._unpack(table, column, self._where(ids, proxy, website))
+        return asarray(self._select(f"""SELECT {column} FROM {table}
+                                        WHERE {self._where(ids, proxy, website)}
+                                            AND {column} IS NOT NULL"""))
+
+    def count(self, table: str, column: str, ids: List[int], website: Optional[int] = None
+             ) -> Dict[int, int]:
+        if self._packed:
+            size = dtype(PACKED[CONFIG["tables"][table]["columns"][column]]).itemsize
+            request = f"""SELECT proxy, COALESCE(SUM(LENGTH({column})), 0) / {size}
+                          FROM {table} WHERE {self._where(ids, website=website)}
+                          GROUP BY proxy"""
+        else:
+            request = f"""SELECT proxy, COUNT({column}) FROM {table}
+                          WHERE {self._where(ids, website=website)} GROUP BY proxy"""
+        return dict(self._select(request))
+
+    # pylint: disable=R0913
+    def stream(self, table: str, column: str, ids: List[int], proxy: int,
+               website: Optional[int], limit: int, cell: QuantileSketch | array
+              ) -> QuantileSketch | array:
+        if self._packed:
+            return extend(cell, self._unpack(table, column, self._where(ids, proxy, website)
+                                             )[:limit])
+        request = f"""SELECT {column} FROM {table}
+                      WHERE {self._where(ids, proxy, website)} AND {column} IS NOT NULL
+                      LIMIT {limit}"""
+        count("sql queries")
+        start = perf_counter()
+        length = len(cell)
+        # A dedicated cursor, the rows are never all in memory
+        cell.extend(value for (value,) in self._connection.execute(request) if value is not None)
+        if self._queries is not None:
+            self._queries.record(self._connection, request, perf_counter() - start)
+        count("rows fetched", len(cell) - length)
+        return cell
+
+    def lines(self, table: str, column: str) -> Tuple[ndarray, ndarray, ndarray, ndarray]:
+        website = "website" if CONFIG["tables"][table]["website_dependent"] else "-1"
+        rows = self._cursor.execute(f"""SELECT experimentid, proxy, {website}, {column}
+                                        FROM {table} WHERE {column} IS NOT NULL
+                                        ORDER BY rowid""").fetchall()
+        keys = asarray([row[:3] for row in rows], dtype="<i8").reshape(-1, 3)
+        if self._packed:
+            typ = dtype(PACKED[CONFIG["tables"][table]["columns"][column]])
+            values = [frombuffer(row[3], dtype=typ) for row in rows]
+            keys = repeat(keys, [len(value) for value in values], axis=0)
+            values = concatenate(values or [[]]).astype("<f8")
+        else:
+            values = asarray([row[3] for row in rows], dtype="<f8")
+        return keys[:, 0], keys[:, 1], keys[:, 2], values
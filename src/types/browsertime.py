@@ -19,12 +19,19 @@
 """
 Module for the browsertime results
 """
+import itertools
 import json
 import os
+import re
 import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 import yaml
 
@@ -32,101 +39,293 @@ from .result import Result
 from .result import Run
 
 
+CHUNK_SIZE = 1 << 20
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+
+
+class _Incomplete(Exception):
+    """
+    This class describes the error raised when the buffer ends before the value.
+    """
+
+
+def _value(buffer: str, start: int) -> Tuple[Any, int]:
+    """
+    Decode the value following a key
+
+    :param      buffer:  The buffer
+    :type       buffer:  str
+    :param      start:   The end of the key
+    :type       start:   int
+
+    :returns:   The value, None if it was not a key, and its end
+    :rtype:     Any * int
+
+    :raises     _Incomplete:  if the value does not end in the buffer
+    """
+    colon = _WHITESPACE.match(buffer, start).end()        # pyright: ignore[reportOptionalMemberAccess]
+    if colon == len(buffer):
+        raise _Incomplete
+    if buffer[colon] != ":":
+        return None, start
+    begin = _WHITESPACE.match(buffer, colon + 1).end()    # pyright: ignore[reportOptionalMemberAccess]
+    try:
+        return _DECODER.raw_decode(buffer, begin)
+    except json.JSONDecodeError as err:
+        raise _Incomplete from err
+
+
+def extract(filename: str, keys: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Extract the first lists associated to some keys in a json file, without parsing the rest.
+    The file is read by chunks, only the chunk being searched and the lists are in memory.
+
+    :param      filename:    The filename
+    :type       filename:    str
+    :param      keys:        The keys
+    :type       keys:        str iterable
+    :param      chunk_size:  The size of the chunks
+    :type       chunk_size:  int
+
+    :returns:   The lists found, by key
+    :rtype:     dict str * list
+    """
+    patterns = {f'"{key}"': key for key in keys}
+    overlap = max(len(pattern) for pattern in patterns)
+    res = {}
+    with open(filename, "r", encoding="utf-8") as file:
+        buffer = ""
+        position = 0
+        while patterns:
+            index, pattern = min(((buffer.find(pattern, position), pattern)
+                                  for pattern in patterns if buffer.find(pattern, position) != -1),
+                                 default=(-1, ""))
+            if index != -1:
+                try:
+                    value, position = _value(buffer, index + len(pattern))
+                    # A key is not escaped, the lists of statistics are not kept
+                    if buffer[index - 1:index] != "\\" and isinstance(value, list):
+                        res[patterns.pop(pattern)] = value
+                    position = max(position, index + 1)
+                    continue
+                except _Incomplete:
+                    # Read until the end of the value
+                    buffer = buffer[index:]
+                    position = 0
+            else:
+                # A key may be cut between two chunks
+                buffer = buffer[max(position, len(buffer) - overlap):]
+                position = 0
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            buffer += chunk
+    return res
+
+
+def _array(values: Iterable) -> array:
+    """
+    Store values in an array, of integers if they all are
+
+    :param      values:  The values
+    :type       values:  iterable
+
+    :returns:   The array
+    :rtype:     array
+    """
+    values = list(values)
+    try:
+        return array("q", values)
+    except TypeError:
+        return array("d", values)
+
+
+def _nonzero(values: array) -> array:
+    """
+    Remove the zeros, the failed attempts, from values
+
+    :param      values:  The values
+    :type       values:  array
+
+    :returns:   The values without the zeros, the same array if there is none
+    :rtype:     array
+    """
+    if 0 not in values:
+        return values
+    return array(values.typecode, (value for value in values if value != 0))
+
+
 class Report(Run):
     """
     This class describes the result of one run of browsertime.
     """
-    _page_load_time: List[int]
-    _speed_index: List[int]
+    __slots__ = ("_values", "_split", "_plt", "_si")
+    # The page load times followed by the speed indexes
+    _values: array
+    _split: int
+    # The metrics without the failed attempts, computed when first asked
+    _plt: Optional[array]
+    _si: Optional[array]
 
     def __init__(self, old_self = None,
                  filename: str = "",
                  _page_load_time: Optional[List] = None,
                  _speed_index: Optional[List] = None):
         super().__init__(None)
+        self._plt = None
+        self._si = None
         if old_self:
-            self._page_load_time = old_self._page_load_time
-            self._speed_index = old_self._speed_index
-            return
-        if _page_load_time is not None and _speed_index is not None:
-            self._page_load_time = _page_load_time
-            self._speed_index = _speed_index
+            # The array is never modified, it can be shared
+            self._values = old_self._values
+            self._split = old_self._split
             return
+        if _page_load_time is None or _speed_index is None:
+            _page_load_time = []
+            _speed_index = []
+            try:
+                # Only the metrics are parsed, the file is mostly made of other details
+                content = extract(filename+"/browsertime.json",
+                                  ["browserScripts", "visualMetrics"])
+
+                for attempt in content["browserScripts"]:
+                    _page_load_time.append(attempt["timings"]["pageTimings"]["pageLoadTime"])
+                for attempt in content["visualMetrics"]:
+                    _speed_index.append(attempt["SpeedIndex"])
+            except FileNotFoundError:
+                pass
+        self._values = _array(itertools.chain(_page_load_time, _speed_index))
+        self._split = len(_page_load_time)
+
+    @classmethod
+    def from_array(cls, values: array, split: int) -> "Report":
+        """
+        Create a report from its values, without copying them
 
-        self._page_load_time = []
-        self._speed_index = []
+        :param      values:  The page load times followed by the speed indexes
+        :type       values:  array
+        :param      split:   The number of page load times
+        :type       split:   int
 
-        try:
-            with open(filename+"/browsertime.json", "r", encoding="utf-8") as file:
-                content = json.load(file)
+        :returns:   The report
+        :rtype:     Report
+        """
+        report = cls.__new__(cls)
+        Run.__init__(report, None)
+        report._values = values
+        report._split = split
+        report._plt = None
+        report._si = None
+        return report
+
+    def __getstate__(self) -> Dict[str, List]:
+        return {"_page_load_time": self.get_page_load_time().tolist(),
+                "_speed_index": self.get_speed_index().tolist()}
 
-            for attempt in content[0]["browserScripts"]:
-                self._page_load_time.append(attempt["timings"]["pageTimings"]["pageLoadTime"])
-            for attempt in content[0]["visualMetrics"]:
-                self._speed_index.append(attempt["SpeedIndex"])
-        except FileNotFoundError:
-            pass
+    def __setstate__(self, state: Dict[str, List]):
+        Report.__init__(self, **state)
 
-    def get_page_load_time(self) -> List[int]:
+    def get_page_load_time(self) -> array:
         """
         Gets the page load time.
 
         :returns:   The page load time.
-        :rtype:     int list
+        :rtype:     int array
         """
-        return self._page_load_time
+        return self._values[:self._split]
 
-    def get_speed_index(self) -> List[int]:
+    def get_speed_index(self) -> array:
         """
         Gets the speed index.
 
         :returns:   The speed index.
-        :rtype:     int list
+        :rtype:     int array
         """
-        return self._speed_index
+        return self._values[self._split:]
 
-    def get_metric(self, metric: str):
+    def get_metric(self, metric: str) -> memoryview:
+        # A read-only view of the cached values, they are neither copied nor modified
         match metric.lower():
             case "plt":
-                return [plt for plt in self.get_page_load_time() if plt != 0]
+                if self._plt is None:
+                    self._plt = _nonzero(self.get_page_load_time())
+                return memoryview(self._plt).toreadonly()
             case "si":
-                return [si for si in self.get_speed_index() if si != 0]
+                if self._si is None:
+                    self._si = _nonzero(self.get_speed_index())
+                return memoryview(self._si).toreadonly()
             case _:
                 raise ValueError
 
 
+def _load_website(path: str, run_constructor=Report) -> Optional[Tuple[Run, Run, Run]]:
+    """
+    Load the reports of the three attempts of a website
+
+    :param      path:             The path of the website folder
+    :type       path:             str
+    :param      run_constructor:  The run constructor
+    :type       run_constructor:  type
 
+    :returns:   The native, masquerade and squid reports, None if an attempt is missing
+    :rtype:     (Run * Run * Run) option
+    """
+    attempts = list(os.scandir(path))
+    if len(attempts) != 3:
+        return None
+    attempts.sort(key=lambda f: f.path)
+    native, masquerade, squid = (run_constructor(filename=attempt.path) for attempt in attempts)
+    return native, masquerade, squid
 
 
 class BrowserTime(Result):
     """
     This class describes the result of one run of the browsertime experiment.
     """
+    __slots__ = ("_page_load_time", "_speed_index")
     _native: Dict[str, Report]
     _masquerade: Dict[str, Report]
     _squid: Dict[str, Report]
+    # The metrics of the websites measured by the three proxies, computed when first asked
+    _page_load_time: Optional[Dict[str, List[int]]]
+    _speed_index: Optional[Dict[str, List[int]]]
 
+    # pylint: disable=R0913
     def __init__(self, folder: str = ".", run_constructor=Report,
                  _native: Optional[Dict] = None,
                  _masquerade: Optional[Dict] = None,
-                 _squid: Optional[Dict] = None):
+                 _squid: Optional[Dict] = None,
+                 jobs: Optional[int] = None):
+        self._page_load_time = None
+        self._speed_index = None
         if _native is not None and _masquerade is not None and _squid is not None:
             # pylint: disable=C0301
             super().__init__(folder, "", run_constructor, _native=_native, _masquerade=_masquerade, _squid=_squid) # pyright: ignore[reportGeneralTypeIssues]
             return
 
+        self._run_constructor = run_constructor
+        self._contents = {}
         self._native = {}
         self._masquerade = {}
         self._squid = {}
 
-        for website in os.scandir(folder):
-            if website.name not in ("archives", "results") and website.is_dir():
-                attempts = list(os.scandir(website.path))
-                if len(attempts) == 3:
-                    attempts.sort(key=lambda f: f.path)
-                    self._native[website.name] = run_constructor(filename=attempts[0].path)
-                    self._masquerade[website.name] = run_constructor(filename=attempts[1].path)
-                    self._squid[website.name] = run_constructor(filename=attempts[2].path)
+        websites = [website for website in os.scandir(folder)
+                    if website.name not in ("archives", "results") and website.is_dir()]
+        paths = [website.path for website in websites]
+        constructors = [run_constructor] * len(websites)
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        if jobs <= 1 or len(websites) <= 1:
+            reports = list(map(_load_website, paths, constructors))
+        else:
+            # The websites are parsed in parallel, the reports are sent back in order
+            with ProcessPoolExecutor(max_workers=min(jobs, len(websites))) as executor:
+                reports = list(executor.map(_load_website, paths, constructors,
+                                            chunksize=max(1, len(websites) // (4 * jobs))))
+        for website, report in zip(websites, reports):
+            if report is not None:
+                (self._native[website.name], self._masquerade[website.name],
+                 self._squid[website.name]) = report
 
     def save(self):
         """
@@ -136,26 +335,46 @@ class BrowserTime(Result):
                   "w", encoding="utf-8") as file:
             yaml.dump(self, file)
 
-    def get_page_load_time(self) -> Dict[str, List[int]]:
+    def __setstate__(self, state: Dict[str, Any]):
+        super().__setstate__(state)
+        self._page_load_time = None
+        self._speed_index = None
+
+    def _paired(self, metric) -> Dict[str, List[int]]:
         """
-        Gets the page load time.
+        Gets a metric of the websites measured by the three proxies,
+        truncated to the same number of attempts
 
-        :returns:   The page load time.
+        :param      metric:  The metric of a report
+        :type       metric:  Report -> int array
+
+        :returns:   The metric of each proxy
         :rtype:     str * (int List) dict
         """
         res = {"native": [],
                "masquerade" : [],
                "squid": []}
-        for website, native in self._native.items():
-            if website in self._masquerade and website in self._squid:
-                count = min(len(native.get_page_load_time()),
-                            len(self._masquerade[website].get_page_load_time()),
-                            len(self._squid[website].get_page_load_time()))
-                res["native"].extend(native.get_page_load_time()[:count])
-                res["masquerade"].extend(self._masquerade[website].get_page_load_time()[:count])
-                res["squid"].extend(self._squid[website].get_page_load_time()[:count])
+        masquerade = self.get_field("masquerade")
+        squid = self.get_field("squid")
+        for website, native in self.get_field("native").items():
+            if website in masquerade and website in squid:
+                values = (metric(native), metric(masquerade[website]), metric(squid[website]))
+                count = min(len(value) for value in values)
+                for field, value in zip(("native", "masquerade", "squid"), values):
+                    res[field].extend(value[:count])
         return res
 
+    def get_page_load_time(self) -> Dict[str, List[int]]:
+        """
+        Gets the page load time.
+
+        :returns:   The page load time.
+        :rtype:     str * (int List) dict
+        """
+        if self._page_load_time is None:
+            self._page_load_time = self._paired(lambda report: report.get_page_load_time())
+        return self._page_load_time
+
     def get_speed_index(self) -> Dict[str, List[int]]:
         """
         Gets the speed index.
@@ -163,15 +382,6 @@ class BrowserTime(Result):
         :returns:   The speed index.
         :rtype:     str * (int List) dict
         """
-        res = {"native": [],
-               "masquerade" : [],
-               "squid": []}
-        for website, native in self._native.items():
-            if website in self._masquerade and website in self._squid:
-                count = min(len(native.get_speed_index()),
-                            len(self._masquerade[website].get_speed_index()),
-                            len(self._squid[website].get_speed_index()))
-                res["native"].extend(native.get_speed_index()[:count])
-                res["masquerade"].extend(self._masquerade[website].get_speed_index()[:count])
-                res["squid"].extend(self._squid[website].get_speed_index()[:count])
-        return res
+        if self._speed_index is None:
+            self._speed_index = self._paired(lambda report: report.get_speed_index())
+        return self._speed_index
@@ -31,6 +31,8 @@ class BulkTestRun(Run):
     """
     This class describes a bulk test run.
     """
+    __slots__ = ()
+
     def get_metric(self, metric: str) -> float | str:
         match metric.lower():
             case "bulkdownload":
@@ -46,6 +48,8 @@ class BulkTest(Result):
     """
     This class describes a bulk test's result.
     """
+    __slots__ = ()
+
     def __init__(self, folder: str = ".", name: str = "bulk_download",
                  run_constructor=BulkTestRun, **kwargs):
         super().__init__(folder, name, run_constructor, **kwargs)
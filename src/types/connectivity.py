@@ -25,8 +25,10 @@ class Connectivity:
     """
     This class describes a connectivity.
     """
+    __slots__ = ("_technology", "_quality", "_hash")
     _technology: int
     _quality: int
+    _hash: int
 
     def __init__(self, technology: str, quality: str = "universal"):
         match technology:
@@ -53,6 +55,8 @@ class Connectivity:
                 self._quality = 4
             case _:
                 raise ValueError
+        # The connectivities are used as index of the datas, they are hashed a lot
+        self._hash = hash((self._technology, self._quality))
 
     def __eq__(self, other):
         if not isinstance(other, Connectivity):
@@ -66,7 +70,7 @@ class Connectivity:
                 (self._technology == other._technology and self._quality < other._quality))
 
     def __hash__(self):
-        return hash(str(self))
+        return self._hash
 
     def __str__(self):
         match self._technology:
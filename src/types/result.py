@@ -23,24 +23,37 @@ import os
 import time
 from abc import ABC
 from abc import abstractmethod
+from sys import intern
 from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 
-import matplotlib.pyplot as plt
+import numpy as np
 import yaml
+from numpy import ndarray
 
 # pylint: disable=R0903
 class Run(ABC):
     """
     This class describes a run.
     """
+    __slots__ = ("_content",)
     _content: Any
 
     def __init__(self, content: Any):
         self._content = content
 
+    def get_content(self) -> Any:
+        """
+        Gets the content, as in the result file.
+
+        :returns:   The content.
+        :rtype:     Any
+        """
+        return self._content
+
     @abstractmethod
     def get_metric(self, metric: str):
         """
@@ -56,76 +69,114 @@ class Result(ABC):
     """
     This class describes the result of an experiment
     """
+    __slots__ = ("_native", "_masquerade", "_squid", "_run_constructor", "_contents")
     _native: List[Run] | Dict[Any, Run]
     _masquerade: List[Run] | Dict[Any, Run]
     _squid: List[Run] | Dict[Any, Run]
+    _run_constructor: type
+    # field -> content of the runs not built yet
+    _contents: Dict[str, List | Dict]
+
+    # The key of each field in the result files
+    KEYS = {"native": "native", "masquerade": "proxy-masquerade", "squid": "proxy-squid"}
 
+    # pylint: disable=R0913
     @abstractmethod
     def __init__(self, folder: str, name: str,
                  run_constructor: type,
                  _native: Optional[List | Dict] = None,
                  _masquerade: Optional[List | Dict] = None,
-                 _squid: Optional[List | Dict] = None):
+                 _squid: Optional[List | Dict] = None,
+                 path: Optional[str] = None):
         assert issubclass(run_constructor, Run)
+        self._run_constructor = run_constructor
         if _native is not None and _masquerade is not None and _squid is not None:
-            if isinstance(_native, list):
-                self._native = [run_constructor(run) for run in _native]
-                self._masquerade = [run_constructor(run) for run in _masquerade]
-                self._squid = [run_constructor(run) for run in _squid]
-                return
-            if (isinstance(_native, dict) and isinstance(_masquerade, dict)
-                and isinstance(_squid, dict)):
-                self._native = {key: run_constructor(run) for key, run in _native.items()}
-                self._masquerade = {key: run_constructor(run) for key, run in _masquerade.items()}
-                self._squid = {key: run_constructor(run) for key, run in _squid.items()}
-                return
+            self._contents = {"native": _native, "masquerade": _masquerade, "squid": _squid}
+            return
 
+        if path is None:
+            path = self.find(folder, name)
         content = None
-        for file in os.scandir(folder):
-            if not file.is_dir() and name in file.name:
-                with open(file.path, "r", encoding="utf-8") as file:
-                    content = yaml.safe_load(file)
-
-        if content is None:
-            self._masquerade = []
-            self._squid = []
-            self._native = []
-            return
+        if path is not None:
+            with open(path, "r", encoding="utf-8") as file:
+                content = yaml.safe_load(file)
+        if not isinstance(content, dict):
+            content = {}
+        self._contents = {field: content.get(key) or [] for field, key in self.KEYS.items()}
+
+    @staticmethod
+    def find(folder: str, name: str) -> Optional[str]:
+        """
+        Find the newest result file of a test in a folder
 
-        try:
-            self._masquerade = [run_constructor(run) for run in content["proxy-masquerade"]]
-        except KeyError:
-            self._masquerade = []
-        try:
-            self._squid = [run_constructor(run) for run in content["proxy-squid"]]
-        except KeyError:
-            self._squid = []
-        try:
-            self._native = [run_constructor(run) for run in content["native"]]
-        except KeyError:
-            self._native = []
+        :param      folder:  The folder
+        :type       folder:  str
+        :param      name:    The name of the test, contained in the name of the file
+        :type       name:    str
 
-    def develop(self, field: List[Run] | Dict[Any, Run], convert) -> List:
+        :returns:   The path of the file, None if there is none
+        :rtype:     str option
+        """
+        newest = None
+        mtime = 0.
+        for file in os.scandir(folder):
+            if name in file.name and not file.is_dir():
+                file_mtime = file.stat().st_mtime
+                if newest is None or file_mtime > mtime:
+                    newest, mtime = file.path, file_mtime
+        return newest
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The runs are dumped as if they were all built
+        return {f"_{field}": self.get_field(field) for field in self.get_fields()}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self._contents = {}
+        for attribute, runs in state.items():
+            setattr(self, attribute, runs)
+
+    def develop(self, field: List[Run] | Dict[Any, Run], convert) -> ndarray:
         """
-        Convert a set of test's results in one sorted list
+        Convert a set of test's results in one sorted array
 
         :param      field:    The field
         :type       field:    List[Run] | Dict[Any, Run]
         :param      convert:  The convert
         :type       convert:  Any -> List
 
-        :returns:   the sorted list
-        :rtype:     List
+        :returns:   the sorted array
+        :rtype:     ndarray
         """
-        res = []
-        for test in field:
-            res.extend(convert(test))
-        res.sort()
-        return res
+        res = [convert(test) for test in field]
+        if not res:
+            return np.empty(0)
+        return np.sort(np.concatenate(res).astype(float))
+
+    @staticmethod
+    def ecdf(values: ndarray, points: Optional[int] = None) -> Tuple[ndarray, ndarray]:
+        """
+        Compute the ECDF of sorted values, downsampled to a fixed number of points if asked.
+        The points kept are evenly spaced in rank and include both ends,
+        so the steps of the ECDF are preserved.
+
+        :param      values:  The sorted values
+        :type       values:  ndarray
+        :param      points:  The maximum number of points
+        :type       points:  int
 
+        :returns:   The x and y of the ECDF
+        :rtype:     ndarray * ndarray
+        """
+        ecdf = np.arange(1, len(values) + 1) / len(values)
+        if points is None or len(values) <= points:
+            return values, ecdf
+        index = np.unique(np.linspace(0, len(values) - 1, points).round().astype(int))
+        return values[index], ecdf[index]
 
+    # pylint: disable=R0913
     def subplot(self, name: str, unit: str = "",
-                convert = lambda x: [float(x)], scale: str = "linear"):
+                convert = lambda x: [float(x)], scale: str = "linear",
+                points: Optional[int] = None):
         """
         Create a subplot of the result
 
@@ -137,43 +188,23 @@ class Result(ABC):
         :type       convert:  Any -> List
         :param      scale:    The scale
         :type       scale:    str
+        :param      points:   The maximum number of points per curve, to downsample them,
+                              None to keep them all
+        :type       points:   int
         """
-        mini = None
-        maxi = None
-
-        masquerade = self.develop(self._masquerade, convert)
-        if masquerade:
-            plt.plot(masquerade,
-                     [(i+1)/len(masquerade) for i in range(len(masquerade))],
-                     label=f"masquerade ({len(masquerade)} tests)")
-            mini = masquerade[0]
-            maxi = masquerade[-1]
-
-        squid = self.develop(self._squid, convert)
-        if squid:
-            plt.plot(squid,
-                     [(i+1)/len(squid) for i in range(len(squid))],
-                     label=f"squid ({len(squid)} tests)")
-            if mini and maxi:
-                mini = min(mini, squid[0])
-                maxi = max(maxi, squid[-1])
-            else:
-                mini = squid[0]
-                maxi = squid[-1]
-
-        native = self.develop(self._native, convert)
-        if native:
-            plt.plot(native,
-                     [(i+1)/len(native) for i in range(len(native))],
-                     label=f"native ({len(native)} tests)")
-            if mini and maxi:
-                mini = min(mini, native[0])
-                maxi = max(maxi, native[-1])
-            else:
-                mini = native[0]
-                maxi = native[-1]
-
-        plt.axis([mini, maxi, 0, 1])
+        import matplotlib.pyplot as plt      # pylint: disable=C0415
+        fields = {field: self.develop(self.get_field(field), convert)
+                  for field in ("masquerade", "squid", "native")}
+        fields = {field: values for field, values in fields.items() if len(values)}
+
+        for field, values in fields.items():
+            plt.plot(*self.ecdf(values, points), drawstyle="steps-post",
+                     label=f"{field} ({len(values)} tests)")
+
+        if fields:
+            mini = min(values[0] for values in fields.values())
+            maxi = max(values[-1] for values in fields.values())
+            plt.axis([mini, maxi, 0, 1])
         plt.ylabel('ECDF')
         plt.xlabel(f'{name}' + (f" ({unit})" if unit != "" else ""))
         plt.xscale(scale)
@@ -199,15 +230,19 @@ class Result(ABC):
         :returns:   The field.
         :rtype:     List
         """
-        match field:
-            case "native":
-                return self._native
-            case "masquerade":
-                return self._masquerade
-            case "squid":
-                return self._squid
-            case _:
-                raise ValueError
+        if field not in self.get_fields():
+            raise ValueError
+        attribute = f"_{field}"
+        if field in self._contents:
+            content = self._contents.pop(field)
+            if isinstance(content, dict):
+                # The keys, the websites, are shared by the fields
+                runs = {intern(key) if isinstance(key, str) else key: self._run_constructor(run)
+                        for key, run in content.items()}
+            else:
+                runs = [self._run_constructor(run) for run in content]
+            setattr(self, attribute, runs)
+        return getattr(self, attribute)
 
     def get_fields(self) -> List[str]:
         """
@@ -31,6 +31,8 @@ class SpeedTestRun(Run):
     """
     This class describes a speed test run.
     """
+    __slots__ = ()
+
     def get_metric(self, metric: str):
         match metric.lower():
             case "ping":
@@ -50,6 +52,8 @@ class SpeedTest(Result):
     """
     This class describes a speed test's result.
     """
+    __slots__ = ()
+
     def __init__(self, folder: str = ".", name: str = "speedtest",
                  run_constructor=SpeedTestRun, **kwargs):
         super().__init__(folder, name, run_constructor, **kwargs)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 19:02:11
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 19:02:11
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Configuration of the tests
+
+The tests import the package from the root of the repository,
+with the configuration of the repository.
+The fixture datas writes a small synthetic folder of datas, shaped as the real one.
+"""
+import os
+import sys
+from typing import Any
+from typing import Dict
+from typing import List
+
+from numpy.random import default_rng
+from pandas import DataFrame
+from pytest import fixture
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# pylint: disable=C0413
+from src.config import CONFIG
+from src.results import DEPENDINGS
+
+CONFIG.locate(os.path.join(ROOT, "config.yml"))
+
+# Each depending has one group of conditions where only it varies
+CONDITIONS = ["100000 100000 0 0", "100000 100000 50 0", "100000 100000 100 0",
+              "100000 100000 0 1", "10000 10000 0 0",
+              "4g bad universal universal", "4g good universal universal",
+              "3g bad universal universal"]
+RUNS = {"de": [1, 2], "it": [1]}
+PROXIES = ["masquerade", "native", "squid"]
+WEBSITES = ["www.a.com", "www.b.de", "www.c.it"]
+
+
+def _values(rng, size: int, high: int) -> list:
+    # Some values are 0, they are missing in the database
+    return [int(value) if rng.random() > .1 else 0 for value in rng.integers(1, high, size)]
+
+
+def _experiment(rng) -> str:
+    lines = ["browsertime: !!python/object:browsertime.BrowserTime"]
+    for proxy in PROXIES:
+        lines.append(f"  _{proxy}:")
+        for website in WEBSITES:
+            lines.append(f"    {website}: !!python/object:browsertime.Report")
+            for name in ["_page_load_time", "_speed_index"]:
+                lines.append(f"      {name}:")
+                lines.extend(f"      - {value}" for value in _values(rng, 3, 20000))
+    lines.append("bulkTest: !!python/object:bulktest.BulkTest")
+    for proxy in PROXIES:
+        lines.append(f"  _{proxy}:")
+        lines.extend(f"  - {value}" for value in _values(rng, 4, 5000000))
+    lines.append("speedtest: !!python/object:speedtest.SpeedTest")
+    for proxy in PROXIES:
+        lines.append(f"  _{proxy}:")
+        for ping, download, upload in zip(_values(rng, 4, 500), _values(rng, 4, 5000),
+                                          _values(rng, 4, 5000)):
+            lines.extend([f"  - download_mbps: '{download / 100:.2f}'",
+                          f"    ping_ms: '{ping}'",
+                          f"    upload_mbps: '{upload / 100:.2f}'"])
+    return "\n".join(lines) + "\n"
+
+
+def write_datas(folder: str, seed: int = 0):
+    """
+    Write a synthetic folder of datas
+
+    :param      folder:  The folder
+    :type       folder:  str
+    :param      seed:    The seed of the values
+    :type       seed:    int
+    """
+    rng = default_rng(seed)
+    for country, runs in RUNS.items():
+        for run in runs:
+            os.makedirs(os.path.join(folder, country, str(run)))
+            for condition in CONDITIONS:
+                with open(os.path.join(folder, country, str(run), f"{condition} test.yml"),
+                          "w", encoding="utf-8") as file:
+                    file.write(_experiment(rng))
+
+
+@fixture(scope="session")
+def datas(tmp_path_factory) -> str:
+    """
+    The synthetic folder of datas, shared by the tests
+    """
+    folder = str(tmp_path_factory.mktemp("datas"))
+    write_datas(folder)
+    return folder
+
+
+def normalise(data) -> Dict[Any, Any]:
+    """
+    Convert a Data in dictionaries of lists of floats,
+    to compare the values whatever the type of the cells
+
+    :param      data:  The data
+    :type       data:  Data
+
+    :returns:   The values of the non empty cells
+    :rtype:     dict
+    """
+    if isinstance(data, dict):
+        return {key: normalise(value) for key, value in dict.items(data)}
+    assert isinstance(data, DataFrame)
+    return {(index, column): [float(value) for value in data.at[index, column]]
+            for index in data.index for column in data.columns
+            if hasattr(data.at[index, column], "__len__") and len(data.at[index, column])}
+
+
+def every_metric(results) -> List[Any]:
+    """
+    Gets the experiments and the values of every metric for every depending,
+    to compare the results whatever their storage
+
+    :param      results:  The results
+    :type       results:  Results
+
+    :returns:   The experiments and the normalised values
+    :rtype:     list
+    """
+    ret = []
+    for depending in DEPENDINGS.values():
+        for country_dependent in [False, True]:
+            ret.append(results.get_experiment(depending, country_dependent))
+            for metric, conf in CONFIG["metrics"].items():
+                for website_dependent in [False,
+                                          CONFIG["tables"][conf["table"]]["website_dependent"]]:
+                    data, _ = results.get_metric(metric, depending, country_dependent,
+                                                 website_dependent)
+                    ret.append((metric, normalise(data)))
+    return ret
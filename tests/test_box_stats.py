@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 19:05:37
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 19:05:37
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests of the boxplot statistics computed by Data
+"""
+from matplotlib.cbook import boxplot_stats
+from numpy.random import default_rng
+from pytest import approx
+
+from src.datas import Data
+from src.datas.plot import WHIS
+
+
+def test_box_stats_matches_matplotlib():
+    rng = default_rng(0)
+    cells = {"rtt": {"native": rng.lognormal(8, 1, 500).tolist(),
+                     "masquerade": rng.integers(0, 50, 37).tolist()},
+             "loss": {"native": [3.0],
+                      "masquerade": rng.normal(0, 1, 2).tolist()}}
+    stats = Data(cells).transpose().box_stats()
+    for condition, proxies in cells.items():
+        for proxy, values in proxies.items():
+            expected = boxplot_stats(values, whis=WHIS)[0]
+            cell = stats.loc[condition, proxy]
+            for key in ["med", "q1", "q3", "whislo", "whishi"]:
+                assert cell[key] == approx(expected[key])
+            # The extremes bound the axis as all the fliers of seaborn do
+            assert cell["fliers"] == approx([value for value in (min(values), max(values))
+                                             if value in expected["fliers"]])
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 19:58:41
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 19:58:41
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests of the listing of the experiments
+"""
+import os
+
+from conftest import write_datas
+
+from src.binary import convert
+from src.experiments import experiment_files
+
+
+def _read(run: str):
+    return {name: is_binary for name, is_binary, _ in experiment_files(run)}
+
+
+def test_binary_versions_are_read_unless_the_yaml_is_newer(tmp_path):
+    write_datas(str(tmp_path))
+    run = str(tmp_path / "de" / "1")
+    assert not any(_read(run).values())
+
+    convert(str(tmp_path))
+    read = _read(run)
+    assert len(read) == len(os.listdir(run)) // 2
+    assert all(read.values())
+
+    edited = sorted(name for name in os.listdir(run) if name.endswith(".yml"))[0]
+    date = os.path.getmtime(os.path.join(run, edited[:-4] + ".bin")) + 10
+    os.utime(os.path.join(run, edited), (date, date))
+    read = _read(run)
+    assert edited in read and not read[edited]
+    assert sum(read.values()) == len(read) - 1
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 20:41:37
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 20:41:37
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests of the columnar export of the results
+"""
+from conftest import every_metric
+from numpy import ndarray
+
+from src.config import CONFIG
+from src.results import Results
+
+
+# pylint: disable=W0212
+
+
+def test_export_round_trip(datas, tmp_path):
+    results = Results(folder=datas, database=str(tmp_path / "results"))
+    results.export(str(tmp_path / "export"))
+    exported = Results.from_export(str(tmp_path / "export"))
+    assert every_metric(exported) == every_metric(results)
+
+
+def test_export_values_are_views(datas, tmp_path):
+    Results(folder=datas, database=str(tmp_path / "results")).export(str(tmp_path / "export"))
+    storage = Results.from_export(str(tmp_path / "export"))._storage
+    ids = [experiment[0] for experiment in storage.experiment_rows()]
+    for table, conf in CONFIG["tables"].items():
+        websites = storage.websites(table) if conf["website_dependent"] else [None]
+        for column in conf["columns"]:
+            for proxy in storage.proxies(table):
+                for website in websites:
+                    values = storage.values(table, column, ids, proxy, website)
+                    # Every value is kept, so they are read in place from the file
+                    assert isinstance(values, ndarray) and not values.flags.owndata
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 19:21:08
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 19:21:08
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests of the time taken to import the package
+"""
+import subprocess
+import sys
+
+from conftest import ROOT
+
+
+HEAVY = ["pandas", "scipy", "matplotlib", "fastplot"]
+
+
+def test_import_does_not_load_the_heavy_dependencies():
+    res = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                          "import src; from src import Results"],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    # The lines are "import time: self | cumulative | module"
+    imported = {line.rsplit("|", 1)[1].strip().split(".")[0]
+                for line in res.stderr.splitlines() if line.startswith("import time:")}
+    assert "src" in imported
+    assert not imported & set(HEAVY)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 19:48:20
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 19:48:20
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests of the memory budget of the results
+"""
+from conftest import normalise
+
+from src.config import CONFIG
+from src.results import DEPENDINGS
+from src.results import Results
+
+
+# pylint: disable=W0212
+
+
+def test_budget_streams_the_same_values(datas, tmp_path, monkeypatch):
+    exact = Results(folder=datas, database=str(tmp_path / "tmp"))
+    # Any metric goes over a budget of 1 MB
+    budget = Results(database=str(tmp_path / "tmp"), ingest=False, memory_budget=1)
+    streamed = []
+    get_streamed_data = budget._get_streamed_data
+
+    def spy(experiments, metric, *args):
+        streamed.append(metric)
+        return get_streamed_data(experiments, metric, *args)
+
+    monkeypatch.setattr(budget, "_get_streamed_data", spy)
+    for depending in DEPENDINGS.values():
+        for metric in CONFIG["metrics"]:
+            for website_dependent in [False, True]:
+                expected, conditions = exact.get_metric(metric, depending,
+                                                        website_dependent=website_dependent)
+                data, budget_conditions = budget.get_metric(metric, depending,
+                                                            website_dependent=website_dependent)
+                assert normalise(data) == normalise(expected)
+                assert budget_conditions == conditions
+    assert set(streamed) == set(CONFIG["metrics"])
+
+
+def test_large_budget_keeps_the_lists(datas, tmp_path):
+    results = Results(folder=datas, database=str(tmp_path / "tmp"), memory_budget=2**20)
+    assert not results._over_budget(results.get_experiment("rtt")[0], "plt")
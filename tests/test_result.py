@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 19:14:52
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 19:14:52
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests of the ECDFs of the results
+"""
+import numpy as np
+
+from src.types import Result
+
+
+def test_ecdf_keeps_every_point_by_default():
+    values = np.sort(np.random.default_rng(0).normal(size=3000))
+    x, y = Result.ecdf(values)
+    assert np.array_equal(x, values)
+    assert np.array_equal(y, np.arange(1, 3001) / 3000)
+
+
+def test_ecdf_downsampled_keeps_both_ends():
+    values = np.sort(np.random.default_rng(0).normal(size=3000))
+    x, y = Result.ecdf(values, 100)
+    assert len(x) <= 100
+    assert (x[0], y[0]) == (values[0], 1 / 3000)
+    assert (x[-1], y[-1]) == (values[-1], 1)
+    assert np.all(np.diff(y) > 0)
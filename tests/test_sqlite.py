@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 20:17:05
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 20:17:05
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests of the SQLite storage, its packed layout and the migration of the old databases
+"""
+from sqlite3 import connect
+
+from conftest import every_metric
+from numpy import array_equal
+from numpy import ndarray
+
+from src.config import CONFIG
+from src.results import Results
+from src.storage import PACKED
+from src.storage import SQLiteStorage
+
+
+# pylint: disable=W0212
+
+
+def _downgrade(database: str):
+    # The proxies, the websites and the countries back to text, as before the lookup tables
+    connection = connect(database)
+    connection.execute("""CREATE TABLE old_experiments(
+                          id INTEGER PRIMARY KEY NOT NULL,
+                          country char(2) NOT NULL,
+                          run INTEGER NOT NULL,
+                          condition INTEGER NOT NULL,
+                          date REAL NOT NULL,
+                          FOREIGN KEY(condition) REFERENCES conditions(id))""")
+    connection.execute("""INSERT INTO old_experiments
+                          SELECT experiments.id, countries.name, run, condition, date
+                          FROM experiments JOIN countries ON countries.id = experiments.country
+                          ORDER BY experiments.rowid""")
+    for table, conf in CONFIG["tables"].items():
+        columns = [f"{name} {typ}" for name, typ in conf["columns"].items()]
+        names = [f"{table}.{name}" for name in conf["columns"]]
+        join = ""
+        if conf["website_dependent"]:
+            columns.append("website TEXT NOT NULL")
+            names.append("websites.name")
+            join = f"JOIN websites ON websites.id = {table}.website"
+        connection.execute(f"""CREATE TABLE old_{table}(
+                               experimentid INTEGER,
+                               proxy TEXT NOT NULL,
+                               {",".join(columns)},
+                               FOREIGN KEY(experimentid) REFERENCES experiments(id))""")
+        connection.execute(f"""INSERT INTO old_{table}
+                               SELECT experimentid, proxies.name, {", ".join(names)}
+                               FROM {table} JOIN proxies ON proxies.id = {table}.proxy {join}
+                               ORDER BY {table}.rowid""")
+    for table in ["experiments", *CONFIG["tables"]]:
+        connection.execute(f"DROP TABLE {table}")
+        connection.execute(f"ALTER TABLE old_{table} RENAME TO {table}")
+    for lookup in ["proxies", "websites", "countries"]:
+        connection.execute(f"DROP TABLE {lookup}")
+    connection.commit()
+    connection.close()
+
+
+def test_packed_layout_round_trip(datas, tmp_path):
+    rows = Results(folder=datas, database=str(tmp_path / "rows"))._storage
+    packed = Results(folder=datas, database=str(tmp_path / "packed"), packed=True)._storage
+    assert isinstance(packed, SQLiteStorage)
+    ids = [experiment[0] for experiment in rows.experiment_rows()]
+    assert [experiment[0] for experiment in packed.experiment_rows()] == ids
+    for table, conf in CONFIG["tables"].items():
+        assert packed.proxies(table) == rows.proxies(table)
+        websites = rows.websites(table) if conf["website_dependent"] else [None]
+        for column, typ in conf["columns"].items():
+            for proxy in rows.proxies(table):
+                for website in websites:
+                    values = packed.values(table, column, ids, proxy, website)
+                    # The BLOBs are read as they are, not converted in Python objects
+                    assert isinstance(values, ndarray)
+                    assert values.dtype == PACKED[typ]
+                    assert array_equal(values, rows.values(table, column, ids, proxy, website))
+            for expected, value in zip(rows.lines(table, column), packed.lines(table, column)):
+                assert array_equal(value, expected)
+
+
+def test_packed_layout_is_kept(datas, tmp_path):
+    Results(folder=datas, database=str(tmp_path / "packed"), packed=True)
+    # Reopened without the option, it stays packed
+    results = Results(database=str(tmp_path / "packed"), ingest=False)
+    assert results._storage._packed
+
+
+def test_migration_of_the_text_columns(datas, tmp_path):
+    expected = every_metric(Results(folder=datas, database=str(tmp_path / "new")))
+    Results(folder=datas, database=str(tmp_path / "old"))
+    _downgrade(str(tmp_path / "old.db"))
+
+    migrated = Results(database=str(tmp_path / "old"), ingest=False)
+    types = {line[1]: line[2] for line in connect(str(tmp_path / "old.db")).execute(
+        "PRAGMA table_info(browsertime)")}
+    assert types["proxy"] == "INTEGER" and types["website"] == "INTEGER"
+    assert every_metric(migrated) == expected
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# @Author: Ultraxime
+# @Date:   2026-10-19 20:58:12
+# @Last Modified by:   Ultraxime
+# @Last Modified time: 2026-10-19 20:58:12
+#
+# This file is part of Masquerade Data Analysis.
+#
+# Masquerade Data Analysis is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later version.
+#
+# Masquerade Data Analysis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Masquerade Data Analysis. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests that every storage gives the same results
+"""
+from conftest import every_metric
+from pytest import mark
+
+from src.results import Results
+from src.storage import ExportStorage
+from src.storage import MemoryStorage
+from src.storage import SQLiteStorage
+
+
+# pylint: disable=W0212
+
+
+def _exported(datas: str, path: str) -> Results:
+    Results(folder=datas, database=path).export(f"{path}_export")
+    return Results.from_export(f"{path}_export")
+
+
+STORAGES = {
+    "sqlite": lambda datas, path: Results(folder=datas, database=path),
+    "packed": lambda datas, path: Results(folder=datas, database=path, packed=True),
+    "memory": lambda datas, path: Results(folder=datas, database=path, storage="memory"),
+    "in_memory": lambda datas, path: Results(folder=datas, database=path, in_memory=True),
+    "export": _exported,
+}
+
+TYPES = {"sqlite": SQLiteStorage, "packed": SQLiteStorage, "memory": MemoryStorage,
+         "in_memory": SQLiteStorage, "export": ExportStorage}
+
+
+@mark.parametrize("storage", list(STORAGES))
+def test_storages_agree(datas, tmp_path, storage):
+    expected = every_metric(Results(folder=datas, database=str(tmp_path / "expected")))
+    results = STORAGES[storage](datas, str(tmp_path / storage))
+    assert isinstance(results._storage, TYPES[storage])
+    assert every_metric(results) == expected